@@ -0,0 +1,78 @@
+# APLICACION MULTIPAGINA DE HOMICIDIOS COLOMBIA
+# REUNE LOS DASHBOARDS NUMERADOS COMO PAGINAS DE UN SOLO SERVIDOR DASH
+# TODAS LAS PAGINAS COMPARTEN EL MISMO DATASET Y EL MISMO CUBO DE CONTEOS (datos_homicidios)
+# LOS DATOS SE CARGAN EN LA PRIMERA VISITA, NO AL ARRANCAR
+
+import dash
+from dash import dcc, html
+from datos_homicidios import iniciar_actualizacion
+from metricas_dashboard import instrumentar
+from serializacion_dashboard import optimizar_respuestas
+from paginas import (
+    anio_departamento,
+    anio_departamento_mapa,
+    ia_anio_departamento_mapa,
+    dia_departamento,
+    ia_dia_departamento_mapa,
+    ia_departamento_meses,
+    ia_departamento_meses_calendario
+)
+
+# Dash registra los callback al arrancar, por eso los modulos de las paginas se importan aqui
+# Cada pagina solo lee el dataset y entrena sus modelos cuando alguien la visita
+paginas = [
+    anio_departamento,
+    anio_departamento_mapa,
+    ia_anio_departamento_mapa,
+    dia_departamento,
+    ia_dia_departamento_mapa,
+    ia_departamento_meses,
+    ia_departamento_meses_calendario
+]
+
+# Sin suppress_callback_exceptions Dash arma el layout de todas las paginas al arrancar para validarlas,
+# y eso cargaria los datos y entrenaria los modelos antes de la primera visita
+app = dash.Dash(__name__, use_pages=True, pages_folder="", suppress_callback_exceptions=True)
+
+# Tiempos por callback y etapa, tamaños de respuesta y aciertos de cache en /metrics
+instrumentar(app)
+# JSON con orjson y respuestas comprimidas con brotli o gzip
+optimizar_respuestas(app)
+
+# Servidor Flask que usa gunicorn:  gunicorn app:server  (ver gunicorn.conf.py)
+server = app.server
+
+for orden, pagina in enumerate(paginas):
+    dash.register_page(
+        pagina.__name__,
+        path=pagina.RUTA,
+        name=pagina.NOMBRE,
+        order=orden,
+        layout=pagina.layout
+    )
+
+# La primera pagina tambien se muestra en la raiz
+dash.register_page("inicio", path="/", name="Inicio", order=len(paginas), layout=anio_departamento.layout)
+
+estilo_enlace = {"color": "red", "marginRight": "20px", "fontWeight": "bold"}
+
+app.layout = html.Div(
+    style={"backgroundColor": "black", "minHeight": "100vh"},
+    children=[
+        html.Div(
+            style={"padding": "10px 20px", "borderBottom": "1px solid red"},
+            children=[
+                dcc.Link(p["name"], href=p["relative_path"], style=estilo_enlace)
+                for p in dash.page_registry.values() if p["path"] != "/"
+            ]
+        ),
+        dash.page_container
+    ]
+)
+
+# Se ejecuta el servidor con todas las paginas y la actualizacion de los datos en segundo plano
+if __name__ == "__main__":
+    if ia_dia_departamento_mapa.CALENTAR_PRONOSTICOS:
+        ia_dia_departamento_mapa.arrancar_calentamiento()
+    iniciar_actualizacion()
+    app.run(debug=True)
@@ -0,0 +1,21 @@
+// DROPDOWNS EN CASCADA AÑO -> MES -> DIA RESUELTOS EN EL NAVEGADOR
+// EL ARBOL {año: {mes: [dias]}} LLEGA UNA SOLA VEZ EN UN dcc.Store Y
+// CAMBIAR UN DROPDOWN YA NO HACE NINGUNA PETICION AL SERVIDOR
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    homicidios: {
+        // Meses del año que tienen registros, el primero queda seleccionado
+        meses_del_anio: function(anio, arbol) {
+            var meses = Object.keys((arbol || {})[anio] || {}).map(Number);
+            var opciones = meses.map(function(m) { return {label: m, value: m}; });
+            return [opciones, meses.length ? meses[0] : null];
+        },
+
+        // Dias del mes que tienen registros, el primero queda seleccionado
+        dias_del_mes: function(anio, mes, arbol) {
+            var dias = ((arbol || {})[anio] || {})[mes] || [];
+            var opciones = dias.map(function(d) { return {label: d, value: d}; });
+            return [opciones, dias.length ? dias[0] : null];
+        }
+    }
+});
@@ -0,0 +1,371 @@
+# MODULO DE BACKTESTING DE LOS PRONOSTICOS DE HOMICIDIOS
+# SE REPITEN LOS PRONOSTICOS DESDE VARIOS AÑOS PASADOS (ORIGEN MOVIL): SE ENTRENA CON LOS AÑOS ANTERIORES
+# AL ORIGEN, SE PRONOSTICA EL AÑO DEL ORIGEN Y SE COMPARA CON LO QUE PASO, PARA CADA DEPARTAMENTO
+# SE EVALUAN LAS TRES GRANULARIDADES DE LOS DASHBOARDS: ANUAL (00_02), DIARIA (01_01) Y MENSUAL POR DIA (02_00 Y 02_01)
+# TODO SALE DEL CUBO DE CONTEOS (NO SE FILTRAN LAS FILAS) Y CADA MES SE EVALUA EN UN PROCESO DEL POOL
+# EL MODELO ESTACIONAL (series_homicidios) SE AJUSTA UNA VEZ POR ORIGEN CON LAS SERIES DIARIAS Y CADA MES RECIBE SU REBANADA
+# EL RESULTADO (MAE Y MAPE POR MODELO Y EL MEJOR MODELO DE CADA SERIE) QUEDA EN datos/backtesting.json
+# Y LOS DASHBOARDS LO LEEN PARA PRONOSTICAR CADA SERIE CON SU MEJOR MODELO
+# SE EJECUTA ASI (POR EJEMPLO CADA NOCHE CON cron):  python backtesting_homicidios.py
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from snapshot_homicidios import CARPETA_DATOS
+from pronostico_homicidios import MODELOS_SERIE, predecir_modelo
+from series_homicidios import pronostico_origenes
+
+RUTA_BACKTESTING = os.path.join(CARPETA_DATOS, "backtesting.json")
+ANIOS_PRUEBA = int(os.environ.get("ANIOS_BACKTESTING", "3"))
+# Se entrena un bosque por (origen, mes, departamento), asi que el bosque es casi todo el costo del backtesting
+# Por defecto (0) tiene los mismos arboles que el bosque del dashboard (ARBOLES_BOSQUE), asi se mide el modelo que se muestra
+# Con menos arboles es mas rapido; antes de usarlo se revisa con --comparar-arboles que no cambie el mejor modelo
+ARBOLES_BACKTESTING = int(os.environ.get("ARBOLES_BACKTESTING", "0"))
+
+# El primer modelo de cada granularidad es el que usaban los dashboards; gana los empates
+MODELOS = {
+    "anual": MODELOS_SERIE + ("estacional",),
+    "diaria": MODELOS_SERIE + ("estacional",),
+    "mensual": ("random_forest",) + MODELOS_SERIE + ("estacional",)
+}
+
+
+# Un año esta cerrado si tiene registros en diciembre; solo el ultimo año del dataset puede estar a medias
+def anios_cerrados(cubo):
+    anios = list(cubo["anios"])
+    if anios and cubo["conteos"][-1, 11].sum() == 0:
+        anios = anios[:-1]
+    return anios
+
+
+# Posiciones de los años que sirven de origen: años cerrados con al menos 2 años anteriores para entrenar
+def origenes_backtesting(cubo, anios_prueba=ANIOS_PRUEBA):
+    cerrados = set(anios_cerrados(cubo))
+    posibles = [i for i, anio in enumerate(cubo["anios"]) if anio in cerrados and i >= 2]
+    return posibles[-anios_prueba:] if anios_prueba > 0 else []
+
+
+# Acumulados de una evaluacion: error absoluto por (modelo, serie) y, para el MAPE,
+# el error porcentual solo en los puntos donde hubo homicidios
+def acumulados_vacios(n_modelos, n_series):
+    return {
+        "error": np.zeros((n_modelos, n_series)),
+        "puntos": np.zeros(n_series),
+        "error_porcentual": np.zeros(n_modelos),
+        "puntos_porcentual": np.zeros(n_modelos)
+    }
+
+
+def acumular(acumulados, i_modelo, series, prediccion, real):
+    error = np.abs(prediccion - real)
+    np.add.at(acumulados["error"][i_modelo], series, error)
+    con_homicidios = real > 0
+    acumulados["error_porcentual"][i_modelo] += (error[con_homicidios] / real[con_homicidios]).sum()
+    acumulados["puntos_porcentual"][i_modelo] += con_homicidios.sum()
+
+
+# Evalua los modelos de serie sobre una matriz series x años
+# La tendencia anual se trunca y decide con los años con registros; la diaria redondea y decide con el total
+# estacional es la matriz origenes x series con el pronostico del modelo estacional
+def evaluar_series(anios, conteos, origenes, granularidad, estacional):
+    modelos = MODELOS[granularidad]
+    n_series = conteos.shape[0]
+    acumulados = acumulados_vacios(len(modelos), n_series)
+    series = np.arange(n_series)
+
+    for i_origen, k in enumerate(origenes):
+        entrenamiento, real = conteos[:, :k], conteos[:, k].astype(float)
+        registros = None if granularidad == "anual" else entrenamiento.sum(axis=1)
+        acumulados["puntos"] += 1
+        for i_modelo, modelo in enumerate(modelos):
+            if modelo == "estacional":
+                prediccion = estacional[i_origen]
+            else:
+                prediccion = predecir_modelo(modelo, anios[:k], entrenamiento, anios[k], registros)
+            prediccion = np.trunc(prediccion) if granularidad == "anual" else np.rint(prediccion)
+            acumular(acumulados, i_modelo, series, np.maximum(prediccion, 0), real)
+    return acumulados
+
+
+# Granularidad diaria de un mes: cada (dia, departamento) es una serie; se ejecuta en un proceso del pool
+# estacional_mes es el arreglo (origen, dia, departamento) del modelo estacional
+def evaluar_mes_diario(anios, conteos_mes, origenes, estacional_mes):
+    n_anios, n_dias, n_departamentos = conteos_mes.shape
+    estacional = estacional_mes.reshape(len(origenes), -1)
+    return evaluar_series(np.asarray(anios), conteos_mes.reshape(n_anios, -1).T, origenes, "diaria", estacional)
+
+
+# Granularidad mensual de un mes: cada departamento es una serie y se pronostican los dias con historia,
+# igual que modelos_homicidios. El bosque se entrena con un solo nucleo porque el pool ya usa todos
+# arboles=0 son los arboles del bosque del dashboard
+def evaluar_mes_mensual(anios, conteos_mes, origenes, estacional_mes, arboles=0):
+    import pandas as pd
+    from modelos_homicidios import ARBOLES_BOSQUE, nuevo_bosque, predecir_dias
+
+    arboles = arboles or ARBOLES_BOSQUE
+
+    anios = np.asarray(anios)
+    modelos = MODELOS["mensual"]
+    n_departamentos = conteos_mes.shape[2]
+    acumulados = acumulados_vacios(len(modelos), n_departamentos)
+
+    for i_origen, k in enumerate(origenes):
+        for j in range(n_departamentos):
+            entrenamiento = conteos_mes[:k, :, j]
+            i_anio, i_dia = np.nonzero(entrenamiento)
+            if len(i_anio) == 0:
+                continue
+
+            X = pd.DataFrame({"anio": anios[i_anio], "dia": i_dia + 1})
+            bosque = nuevo_bosque(n_jobs=1, arboles=arboles).fit(X, entrenamiento[i_anio, i_dia])
+            dias_mes, y_pred = predecir_dias(bosque, X, anios[k])
+            indices = np.array(dias_mes) - 1
+            real = conteos_mes[k, indices, j].astype(float)
+            serie = np.full(len(indices), j)
+            acumulados["puntos"][j] += len(indices)
+            acumular(acumulados, 0, serie, y_pred.astype(float), real)
+
+            historia = entrenamiento[:, indices].T
+            for i_modelo, modelo in enumerate(modelos[1:], start=1):
+                if modelo == "estacional":
+                    prediccion = estacional_mes[i_origen, indices, j]
+                else:
+                    prediccion = predecir_modelo(modelo, anios[:k], historia, anios[k], historia.sum(axis=1))
+                acumular(acumulados, i_modelo, serie, np.maximum(np.rint(prediccion), 0), real)
+    return acumulados
+
+
+# MAE y MAPE de cada modelo y el indice del mejor modelo de cada serie (menor error absoluto)
+# Las series sin puntos quedan con el primer modelo
+def resumir(acumulados, granularidad):
+    modelos = MODELOS[granularidad]
+    puntos = acumulados["puntos"].sum()
+    metricas = {}
+    for i_modelo, modelo in enumerate(modelos):
+        puntos_porcentual = acumulados["puntos_porcentual"][i_modelo]
+        metricas[modelo] = {
+            "mae": float(acumulados["error"][i_modelo].sum() / puntos) if puntos else None,
+            "mape": float(acumulados["error_porcentual"][i_modelo] / puntos_porcentual * 100) if puntos_porcentual else None
+        }
+    return metricas, acumulados["error"].argmin(axis=0)
+
+
+# Junta los acumulados de los meses; las series quedan en orden de mes
+def sumar(partes):
+    return {
+        "error": np.concatenate([parte["error"] for parte in partes], axis=1),
+        "puntos": np.concatenate([parte["puntos"] for parte in partes]),
+        "error_porcentual": sum(parte["error_porcentual"] for parte in partes),
+        "puntos_porcentual": sum(parte["puntos_porcentual"] for parte in partes)
+    }
+
+
+# Se evaluan las tres granularidades; la anual es una sola matriz pequeña y los meses van al pool
+def ejecutar_backtesting(cubo, version, anios_prueba=ANIOS_PRUEBA, procesos=None, arboles=ARBOLES_BACKTESTING):
+    inicio = time.perf_counter()
+    anios = list(cubo["anios"])
+    departamentos = list(cubo["departamentos"])
+    origenes = origenes_backtesting(cubo, anios_prueba)
+    if not origenes:
+        raise ValueError("No hay años suficientes para el backtesting (se necesitan al menos 3 años cerrados)")
+
+    # Pronostico estacional de cada origen: por dia (origen, mes, dia, departamento) y total del año (origen, departamento)
+    estacional, estacional_anual = pronostico_origenes(cubo, origenes)
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        # Cada proceso recibe solo la rebanada del cubo de su mes
+        meses = [np.ascontiguousarray(cubo["conteos"][:, mes - 1]) for mes in range(1, 13)]
+        estacional_meses = [np.ascontiguousarray(estacional[:, mes - 1]) for mes in range(1, 13)]
+        tareas_diarias = [
+            ejecutor.submit(evaluar_mes_diario, anios, conteos_mes, origenes, estacional_mes)
+            for conteos_mes, estacional_mes in zip(meses, estacional_meses)
+        ]
+        tareas_mensuales = [
+            ejecutor.submit(evaluar_mes_mensual, anios, conteos_mes, origenes, estacional_mes, arboles)
+            for conteos_mes, estacional_mes in zip(meses, estacional_meses)
+        ]
+
+        anual = evaluar_series(np.array(anios), cubo["conteos"].sum(axis=(1, 2)).T, origenes, "anual", estacional_anual)
+        diaria = sumar([tarea.result() for tarea in tareas_diarias])
+        mensual = sumar([tarea.result() for tarea in tareas_mensuales])
+
+    granularidades = {}
+    for granularidad, acumulados, forma in (
+        ("anual", anual, (len(departamentos),)),
+        ("diaria", diaria, (12, 31, len(departamentos))),
+        ("mensual", mensual, (12, len(departamentos)))
+    ):
+        metricas, mejor = resumir(acumulados, granularidad)
+        granularidades[granularidad] = {
+            "modelos": list(MODELOS[granularidad]),
+            "metricas": metricas,
+            "mejor": mejor.reshape(forma).tolist()
+        }
+
+    return {
+        "version": version,
+        "id": time.strftime("%Y%m%d%H%M%S"),
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "origenes": [anios[k] for k in origenes],
+        "ultimo_anio_cerrado": anios_cerrados(cubo)[-1],
+        "departamentos": departamentos,
+        "segundos": round(time.perf_counter() - inicio, 1),
+        "granularidades": granularidades
+    }
+
+
+# Revision antes de bajar ARBOLES_BACKTESTING: se evalua la granularidad mensual con arboles y con los del dashboard
+# y se cuenta en cuantas series (mes, departamento) cambia el mejor modelo
+def comparar_arboles(cubo, arboles, anios_prueba=ANIOS_PRUEBA, procesos=None):
+    from modelos_homicidios import ARBOLES_BOSQUE
+
+    anios = list(cubo["anios"])
+    origenes = origenes_backtesting(cubo, anios_prueba)
+    if not origenes:
+        raise ValueError("No hay años suficientes para el backtesting (se necesitan al menos 3 años cerrados)")
+    estacional, _ = pronostico_origenes(cubo, origenes)
+    meses = [np.ascontiguousarray(cubo["conteos"][:, mes - 1]) for mes in range(1, 13)]
+    estacional_meses = [np.ascontiguousarray(estacional[:, mes - 1]) for mes in range(1, 13)]
+
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for cantidad in (arboles, ARBOLES_BOSQUE):
+            inicio = time.perf_counter()
+            tareas = [
+                ejecutor.submit(evaluar_mes_mensual, anios, conteos_mes, origenes, estacional_mes, cantidad)
+                for conteos_mes, estacional_mes in zip(meses, estacional_meses)
+            ]
+            metricas, mejor = resumir(sumar([tarea.result() for tarea in tareas]), "mensual")
+            resultados[cantidad] = {
+                "random_forest": metricas["random_forest"],
+                "mejor": mejor,
+                "segundos": round(time.perf_counter() - inicio, 1)
+            }
+
+    cambios = int((resultados[arboles]["mejor"] != resultados[ARBOLES_BOSQUE]["mejor"]).sum())
+    for cantidad, resultado in resultados.items():
+        metricas = resultado["random_forest"]
+        mae = "-" if metricas["mae"] is None else f"{metricas['mae']:.3f}"
+        mape = "-" if metricas["mape"] is None else f"{metricas['mape']:.1f}%"
+        print(f"(+) random_forest con {cantidad} arboles: MAE {mae}  MAPE {mape}  {resultado['segundos']} s")
+    print(f"(+) Series mensuales con otro mejor modelo: {cambios} de {len(resultados[arboles]['mejor'])}")
+    return resultados, cambios
+
+
+# Se escribe aparte y se renombra, asi un dashboard nunca lee un archivo a medio escribir
+def guardar_backtesting(resultados, ruta=RUTA_BACKTESTING):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+# LECTURA DESDE LOS DASHBOARDS
+# El archivo se vuelve a leer solo si cambio en el disco, asi el backtesting de la noche se toma sin reiniciar
+resultados_backtesting = None
+marca_backtesting = None
+
+
+def cargar_backtesting(ruta=RUTA_BACKTESTING):
+    global resultados_backtesting, marca_backtesting
+    try:
+        marca = os.stat(ruta).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if marca != marca_backtesting:
+        with open(ruta, encoding="utf-8") as archivo:
+            resultados_backtesting = json.load(archivo)
+        marca_backtesting = marca
+    return resultados_backtesting
+
+
+# Identifica los resultados en las llaves de las caches y en los nombres de archivo de los pronosticos
+def id_backtesting(resultados):
+    return resultados["id"] if resultados else "sin_backtesting"
+
+
+def ultimo_anio_cerrado(resultados):
+    return resultados["ultimo_anio_cerrado"] if resultados else None
+
+
+# Modelo elegido para cada serie, con el eje de departamentos en el orden pedido
+# anual: (departamento,)  diaria: (mes, dia, departamento)  mensual: (mes, departamento)
+# Sin resultados, o para un departamento que no estaba en el backtesting, queda el modelo de siempre
+def modelos_elegidos(resultados, granularidad, departamentos):
+    por_defecto = MODELOS[granularidad][0]
+    forma = {"anual": (), "diaria": (12, 31), "mensual": (12,)}[granularidad] + (len(departamentos),)
+    elegidos = np.full(forma, por_defecto, dtype=object)
+    if not resultados or granularidad not in resultados["granularidades"]:
+        return elegidos
+
+    info = resultados["granularidades"][granularidad]
+    nombres = np.array(info["modelos"], dtype=object)
+    mejor = np.asarray(info["mejor"])
+    posiciones = {d: i for i, d in enumerate(resultados["departamentos"])}
+    for j, departamento in enumerate(departamentos):
+        if departamento in posiciones:
+            elegidos[..., j] = nombres[mejor[..., posiciones[departamento]]]
+    return elegidos
+
+
+# Diccionario {departamento: modelo} para pronostico_anual
+def modelos_anuales(resultados):
+    if not resultados:
+        return {}
+    info = resultados["granularidades"]["anual"]
+    return {d: info["modelos"][i] for d, i in zip(resultados["departamentos"], info["mejor"])}
+
+
+def modelo_mensual(resultados, mes, departamento):
+    return str(modelos_elegidos(resultados, "mensual", [departamento])[mes - 1, 0])
+
+
+# Texto corto con el MAE y el MAPE de cada modelo para mostrar en las paginas
+def resumen_backtesting(resultados, granularidad):
+    if not resultados:
+        return "Backtesting: sin resultados (python backtesting_homicidios.py)"
+    partes = []
+    for modelo, metricas in resultados["granularidades"][granularidad]["metricas"].items():
+        mae = "-" if metricas["mae"] is None else f"{metricas['mae']:.2f}"
+        mape = "-" if metricas["mape"] is None else f"{metricas['mape']:.1f}%"
+        partes.append(f"{modelo} MAE {mae} MAPE {mape}")
+    origenes = resultados["origenes"]
+    return f"Backtesting {origenes[0]}-{origenes[-1]} ({resultados['fecha']}): " + "; ".join(partes)
+
+
+def imprimir_resultados(resultados):
+    print(f"(+) Backtesting de la version {resultados['version']}, origenes {resultados['origenes']}, {resultados['segundos']} s")
+    for granularidad, info in resultados["granularidades"].items():
+        elegidos = np.bincount(np.ravel(info["mejor"]), minlength=len(info["modelos"]))
+        print(f"(+) {granularidad}")
+        for i_modelo, modelo in enumerate(info["modelos"]):
+            metricas = info["metricas"][modelo]
+            mae = "-" if metricas["mae"] is None else f"{metricas['mae']:.3f}"
+            mape = "-" if metricas["mape"] is None else f"{metricas['mape']:.1f}%"
+            print(f"    {modelo:<14} MAE {mae:>9}  MAPE {mape:>8}  mejor en {elegidos[i_modelo]} series")
+
+
+# Se evalua la version actual de los datos (copia local o archivos compartidos) y se guarda el resultado
+if __name__ == "__main__":
+    from datos_homicidios import cargar_datos
+
+    parser = argparse.ArgumentParser(description="Backtesting de los pronosticos de homicidios")
+    parser.add_argument("--anios-prueba", type=int, default=ANIOS_PRUEBA, help="Cantidad de años usados como origen")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto todos los nucleos)")
+    parser.add_argument("--salida", default=RUTA_BACKTESTING)
+    parser.add_argument("--arboles", type=int, default=ARBOLES_BACKTESTING, help="Arboles del random forest (0: los del dashboard)")
+    parser.add_argument("--comparar-arboles", type=int, default=0, help="Solo compara este numero de arboles con los del dashboard")
+    argumentos = parser.parse_args()
+
+    datos = cargar_datos()
+    if argumentos.comparar_arboles:
+        comparar_arboles(datos["cubo"], argumentos.comparar_arboles, argumentos.anios_prueba, argumentos.procesos)
+    else:
+        resultados = ejecutar_backtesting(datos["cubo"], datos["version"], argumentos.anios_prueba, argumentos.procesos, argumentos.arboles)
+        guardar_backtesting(resultados, argumentos.salida)
+        imprimir_resultados(resultados)
+        print(f"(+) Resultados guardados en {argumentos.salida}")
@@ -0,0 +1,460 @@
+# BENCHMARK DE LOS DASHBOARDS DE HOMICIDIOS SIN CONEXION A DATOS.GOV.CO
+# SE GENERA UN DATASET SINTETICO CON LAS COLUMNAS DE m8fd-ahd9, SE SIRVE DESDE UN SERVIDOR HTTP LOCAL
+# QUE RESPONDE COMO LA API DE SOCRATA ($select, $where, $group, $limit, $offset) Y SE MIDEN
+# LA INGESTA, EL ARRANQUE EN FRIO Y CADA CALLBACK (p50, p95, p99), Y LOS BYTES Y MILISEGUNDOS DE CONVERTIR
+# CADA RESPUESTA A JSON CON Y SIN serializacion_dashboard. EL RESULTADO SE GUARDA EN JSON
+# PARA COMPARAR ENTRE COMMITS
+#
+# python benchmark_homicidios.py --filas 100000 1000000 --repeticiones 30 --salida benchmark.json
+
+import os
+import re
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import numpy as np
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CARPETA_PROYECTO = os.path.dirname(os.path.abspath(__file__))
+
+# Participacion aproximada de cada departamento en los homicidios del pais
+pesos_departamentos = {
+    "ANTIOQUIA": 18, "VALLE DEL CAUCA": 17, "BOGOTA D.C.": 10, "CAUCA": 5, "NORTE DE SANTANDER": 5,
+    "ATLANTICO": 4, "NARIÑO": 3, "BOLIVAR": 3, "CORDOBA": 3, "MAGDALENA": 3, "META": 3, "CESAR": 2,
+    "CUNDINAMARCA": 2, "PUTUMAYO": 2, "TOLIMA": 2, "RISARALDA": 2, "HUILA": 2, "CAQUETA": 2,
+    "CHOCO": 2, "LA GUAJIRA": 2, "SANTANDER": 2, "CALDAS": 1, "QUINDIO": 1, "ARAUCA": 1, "SUCRE": 1,
+    "CASANARE": 1, "BOYACA": 1, "GUAVIARE": 0.5, "AMAZONAS": 0.2, "VICHADA": 0.2, "GUAINIA": 0.1,
+    "VAUPES": 0.1, "SAN ANDRES Y PROVIDENCIA": 0.1
+}
+
+# Escrituras alternativas que aparecen en la fuente y que la ingesta debe unificar
+variantes_departamentos = {
+    "BOGOTA D.C.": ["BOGOTÁ D.C.", "Bogotá, D.C.", "BOGOTA"],
+    "VALLE DEL CAUCA": ["VALLE", "Valle del Cauca"],
+    "NARIÑO": ["NARINO", "Nariño"],
+    "LA GUAJIRA": ["GUAJIRA"],
+    "SAN ANDRES Y PROVIDENCIA": ["SAN ANDRÉS", "ARCHIPIÉLAGO DE SAN ANDRÉS, PROVIDENCIA Y SANTA CATALINA"]
+}
+PROPORCION_VARIANTES = 0.05
+
+armas_medios = {"ARMA DE FUEGO": 0.70, "ARMA BLANCA / CORTOPUNZANTE": 0.20, "CONTUNDENTES": 0.06,
+                "SIN EMPLEO DE ARMAS": 0.02, "NO REPORTADO": 0.02}
+generos = {"MASCULINO": 0.90, "FEMENINO": 0.09, "NO REPORTA": 0.01}
+grupos_etarios = {"ADULTOS": 0.80, "ADOLESCENTES": 0.10, "MENORES": 0.05, "NO REPORTA": 0.05}
+ANIO_INICIAL = 2010
+ANIO_FINAL = 2024
+MUNICIPIOS_POR_DEPARTAMENTO = 30
+
+
+def elegir(generador, opciones, filas):
+    nombres = list(opciones)
+    pesos = np.array([opciones[n] for n in nombres], dtype=float)
+    return pd.Categorical.from_codes(generador.choice(len(nombres), filas, p=pesos / pesos.sum()), nombres)
+
+
+# Dataset sintetico con las columnas y el formato (todo texto) que devuelve la api, ordenado por fecha como :id
+def generar_homicidios(filas, semilla=42):
+    generador = np.random.default_rng(semilla)
+
+    departamentos = np.asarray(elegir(generador, pesos_departamentos, filas)).astype(object)
+    for oficial, variantes in variantes_departamentos.items():
+        posiciones = np.flatnonzero((departamentos == oficial) & (generador.random(filas) < PROPORCION_VARIANTES))
+        departamentos[posiciones] = generador.choice(variantes, len(posiciones))
+
+    # Los homicidios bajan poco a poco con los años y los ultimos meses del año tienen algo mas de casos
+    anios = np.arange(ANIO_INICIAL, ANIO_FINAL + 1)
+    pesos_anios = np.linspace(1.2, 0.9, len(anios))
+    inicio_anio = np.array([np.datetime64(f"{a}-01-01") for a in anios])
+    dias_anio = np.array([366 if a % 4 == 0 else 365 for a in anios])
+    i_anio = generador.choice(len(anios), filas, p=pesos_anios / pesos_anios.sum())
+    dia = np.minimum((generador.beta(1.05, 1, filas) * dias_anio[i_anio]).astype(int), dias_anio[i_anio] - 1)
+    fechas = np.sort(inicio_anio[i_anio] + dia.astype("timedelta64[D]"))
+
+    municipio = generador.integers(1, MUNICIPIOS_POR_DEPARTAMENTO + 1, filas)
+    df = pd.DataFrame({
+        "departamento": departamentos,
+        "municipio": pd.Categorical([f"MUNICIPIO {m:02d}" for m in range(MUNICIPIOS_POR_DEPARTAMENTO + 1)])[municipio],
+        "codigo_dane": (generador.integers(5, 99, filas) * 1000000 + municipio * 1000).astype(str),
+        "armas_medios": elegir(generador, armas_medios, filas),
+        "fecha_hecho": np.datetime_as_string(fechas.astype("datetime64[ms]"), unit="ms"),
+        "genero": elegir(generador, generos, filas),
+        "grupo_etario": elegir(generador, grupos_etarios, filas),
+        "cantidad": "1"
+    })
+    df["departamento"] = df["departamento"].astype("category")
+    return df
+
+
+# Solo se entiende la forma de $where que usa snapshot_homicidios:  fecha_hecho >= 'AAAA-MM-DDTHH:MM:SS'
+# Las fechas vienen ordenadas, asi que el filtro es una busqueda binaria
+def filtrar_where(df, fechas, where):
+    if not where:
+        return df
+    encontrado = re.fullmatch(r"\s*fecha_hecho\s*>=\s*'([^']+)'\s*", where)
+    if encontrado is None:
+        raise ValueError(f"$where no soportado en el benchmark: {where}")
+    return df.iloc[np.searchsorted(fechas, encontrado.group(1), side="left"):]
+
+
+# Respuesta de la api para los parametros de una peticion (lista de registros con valores de texto)
+def responder_soda(df, fechas, params):
+    df = filtrar_where(df, fechas, params.get("$where"))
+    seleccion = params.get("$select", "")
+
+    if seleccion.replace(" ", "") == "count(*)":
+        return [{"count": str(len(df))}]
+
+    if "$group" in params:
+        totales = df.groupby([df["departamento"], df["fecha_hecho"].str[:4]], observed=True).size()
+        return [
+            {"departamento": d, "anio": a, "cantidad": str(c)}
+            for (d, a), c in totales.items()
+        ][:int(params.get("$limit", len(totales)))]
+
+    offset = int(params.get("$offset", 0))
+    limite = int(params.get("$limit", 1000))
+    return df.iloc[offset: offset + limite]
+
+
+# Servidor HTTP local que reemplaza a www.datos.gov.co
+def iniciar_servidor(df):
+    fechas = df["fecha_hecho"].to_numpy()
+
+    class ManejadorSoda(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            try:
+                respuesta = responder_soda(df, fechas, params)
+            except ValueError as error:
+                self.send_error(400, str(error))
+                return
+            # Como socrata, el mismo recurso responde en CSV si se pide con extension .csv
+            if urlparse(self.path).path.endswith(".csv"):
+                cuerpo, tipo = pd.DataFrame(respuesta).to_csv(index=False).encode(), "text/csv"
+            elif isinstance(respuesta, pd.DataFrame):
+                cuerpo, tipo = respuesta.to_json(orient="records").encode(), "application/json"
+            else:
+                cuerpo, tipo = json.dumps(respuesta).encode(), "application/json"
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ManejadorSoda)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/resource/m8fd-ahd9.json"
+
+
+def percentiles(tiempos):
+    tiempos = np.asarray(tiempos) * 1000
+    p50, p95, p99 = np.percentile(tiempos, [50, 95, 99])
+    return {
+        "n": len(tiempos),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "media_ms": round(float(tiempos.mean()), 3),
+        "max_ms": round(float(tiempos.max()), 3)
+    }
+
+
+# Entorno de los procesos del benchmark: copia local y modelos en una carpeta temporal, api local y sin hilos extra
+def entorno_benchmark(url, carpeta):
+    return dict(os.environ, URL_HOMICIDIOS=url, CARPETA_DATOS=carpeta, MINUTOS_ACTUALIZACION="0",
+                CALENTAR_PRONOSTICOS="0", DATOS_COMPARTIDOS="0", SOLO_TOTALES="0")
+
+
+# Cuerpos de /_dash-update-component para cada callback de servidor con valores de los dropdown y de la tabla
+def peticiones_callback(dependencias, valores):
+    tabla = {"page_current": 0, "page_size": 10, "sort_by": [], "filter_query": ""}
+    peticiones = []
+    for dep in dependencias:
+        if dep.get("clientside_function") or "-" not in dep["output"]:
+            continue
+
+        def entrada(i):
+            llave = i["id"].split("-", 1)[1]
+            return {**i, "value": valores.get(llave) if i["property"] == "value" else tabla.get(i["property"])}
+
+        entradas = [entrada(i) for i in dep["inputs"]]
+        salidas = [{"id": o.split(".")[0], "property": o.split(".")[-1]} for o in dep["output"].strip(".").split("...")]
+        peticiones.append((dep["output"], {
+            "output": dep["output"],
+            "outputs": salidas[0] if len(salidas) == 1 else salidas,
+            "inputs": entradas,
+            "state": [entrada(s) for s in dep.get("state", [])],
+            "changedPropIds": [f"{entradas[0]['id']}.{entradas[0]['property']}"]
+        }))
+    return peticiones
+
+
+# Los callback en segundo plano (background) responden primero con la tarea; se consulta hasta tener el resultado
+def responder_callback(cliente, cuerpo, espera=0.02):
+    respuesta = cliente.post("/_dash-update-component", json=cuerpo)
+    tarea = respuesta.get_json(silent=True) if respuesta.status_code == 200 else None
+    if not tarea or "cacheKey" not in tarea:
+        return respuesta
+
+    consulta = {"cacheKey": tarea["cacheKey"], "job": tarea["job"]}
+    while True:
+        respuesta = cliente.post("/_dash-update-component", json=cuerpo, query_string=consulta)
+        if respuesta.status_code != 200 or "response" in respuesta.get_json():
+            return respuesta
+        time.sleep(espera)
+
+
+# Nombre legible del callback (modulo.funcion) a partir de su salida
+def nombre_callback(app, salida):
+    funcion = inspect.unwrap(app.callback_map[salida]["callback"])
+    return f"{funcion.__module__.split('.')[-1]}.{funcion.__name__}"
+
+
+def valores_aleatorios(df, generador):
+    fila = df.iloc[int(generador.integers(len(df)))]
+    return {
+        "select-anio": int(fila["anio"]),
+        "select-mes": int(fila["mes"]),
+        "select-dia": int(fila["dia"]),
+        "select-departamento": str(fila["departamento"])
+    }
+
+
+# Se ejecuta en un proceso nuevo: importar la app y responder el primer callback de una pagina con datos
+def medir_arranque():
+    inicio = time.perf_counter()
+    import app
+    importado = time.perf_counter()
+
+    cliente = app.server.test_client()
+    dependencias = cliente.get("/_dash-dependencies").get_json()
+    from datos_homicidios import obtener_datos
+    # Los valores se fijan sin leer los datos para no adelantar la carga
+    valores = {"select-anio": ANIO_FINAL, "select-mes": 1, "select-dia": 1}
+    cuerpo = next(c for s, c in peticiones_callback(dependencias, valores) if s.startswith("..h0100-grafica-barras"))
+    respuesta = cliente.post("/_dash-update-component", json=cuerpo)
+    fin = time.perf_counter()
+
+    print(json.dumps({
+        "importar_s": importado - inicio,
+        "primer_callback_s": fin - importado,
+        "total_s": fin - inicio,
+        "estado": respuesta.status_code,
+        "registros": len(obtener_datos()["df"])
+    }))
+
+
+def arranque_en_frio(url, carpeta, repeticiones):
+    tiempos, detalles = [], []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        proceso = subprocess.run(
+            [sys.executable, "-c", "import benchmark_homicidios; benchmark_homicidios.medir_arranque()"],
+            cwd=CARPETA_PROYECTO, env=entorno_benchmark(url, carpeta), capture_output=True, text=True, check=True
+        )
+        tiempos.append(time.perf_counter() - inicio)
+        detalles.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+    return {
+        **percentiles(tiempos),
+        "importar_ms": percentiles([d["importar_s"] for d in detalles]),
+        "primer_callback_ms": percentiles([d["primer_callback_s"] for d in detalles]),
+        "estados": sorted({d["estado"] for d in detalles})
+    }
+
+
+# Los modulos de datos guardan el dataset en variables globales; entre escenarios se vacian
+def reiniciar_datos():
+    import datos_homicidios
+    import modelos_homicidios
+    import series_homicidios
+    datos_homicidios.datos = None
+    datos_homicidios.totales = None
+    modelos_homicidios.modelos_en_memoria.clear()
+    series_homicidios.capa_actual = None
+    for funcion in datos_homicidios.suscriptores:
+        funcion()
+
+
+def medir_callbacks(df, repeticiones, semilla=7):
+    import app
+    reiniciar_datos()
+    cliente = app.server.test_client()
+    dependencias = cliente.get("/_dash-dependencies").get_json()
+    generador = np.random.default_rng(semilla)
+
+    resultados = {}
+    for salida, _ in peticiones_callback(dependencias, {}):
+        nombre = nombre_callback(app.app, salida)
+        tiempos, estados = [], set()
+        for i in range(repeticiones + 1):
+            _, cuerpo = next(p for p in peticiones_callback(dependencias, valores_aleatorios(df, generador)) if p[0] == salida)
+            inicio = time.perf_counter()
+            respuesta = responder_callback(cliente, cuerpo)
+            duracion = time.perf_counter() - inicio
+            estados.add(respuesta.status_code)
+            # La primera llamada incluye cargar datos o entrenar modelos y se reporta aparte
+            if i == 0:
+                primera = duracion
+            else:
+                tiempos.append(duracion)
+        resultados[nombre] = {**percentiles(tiempos), "primera_llamada_ms": round(primera * 1000, 3), "estados": sorted(estados)}
+        print(f"(+) {nombre}: p50 {resultados[nombre]['p50_ms']} ms, p99 {resultados[nombre]['p99_ms']} ms")
+    return resultados
+
+
+# Cuerpo del callback de dash.pages que arma el layout de una pagina al navegar
+def peticion_pagina(ruta):
+    return {
+        "output": ".._pages_content.children..._pages_store.data..",
+        "outputs": [{"id": "_pages_content", "property": "children"}, {"id": "_pages_store", "property": "data"}],
+        "inputs": [
+            {"id": "_pages_location", "property": "pathname", "value": ruta},
+            {"id": "_pages_location", "property": "search", "value": ""}
+        ],
+        "state": [],
+        "changedPropIds": ["_pages_location.pathname"]
+    }
+
+
+# Se guarda lo que cada callback le entrega a Dash para convertir a JSON y se compara el camino de plotly
+# con json_rapido y con la compresion gzip y brotli (bytes y milisegundos)
+def medir_serializacion(df, repeticiones, semilla=11):
+    import app
+    from serializacion_dashboard import capturar_respuestas, comparar_serializacion
+    cliente = app.server.test_client()
+    dependencias = cliente.get("/_dash-dependencies").get_json()
+    generador = np.random.default_rng(semilla)
+
+    peticiones = [(f"pagina {p.RUTA}", peticion_pagina(p.RUTA)) for p in app.paginas]
+    peticiones += [
+        (nombre_callback(app.app, salida), cuerpo)
+        for salida, cuerpo in peticiones_callback(dependencias, valores_aleatorios(df, generador))
+    ]
+
+    resultados = {}
+    for nombre, cuerpo in peticiones:
+        with capturar_respuestas() as respuestas:
+            responder_callback(cliente, cuerpo)
+        # La ultima respuesta es la del resultado (las anteriores son las consultas de una tarea en segundo plano)
+        resultados[nombre] = comparar_serializacion(respuestas[-1], repeticiones)
+        r = resultados[nombre]
+        print(f"(+) {nombre}: {r['bytes_plotly']} -> {r['bytes_brotli']} bytes, {r['ms_plotly']} -> {r['ms_rapido']} ms")
+    return resultados
+
+
+# Descomposicion de las series diarias: ajustar desde cero contra sumar solo los ultimos dias
+# (como cuando el actualizador trae un delta) y pronosticar un rango de fechas con la capa ya armada
+def medir_series(repeticiones, dias_delta=7):
+    from datos_homicidios import obtener_datos
+    from series_homicidios import serie_diaria, nombres_series, actualizar_descomposicion, preparar_capa, pronostico_rango
+    cubo = obtener_datos()["cubo"]
+    fechas, matriz = serie_diaria(cubo)
+    series = nombres_series(cubo)
+    anterior = actualizar_descomposicion(None, fechas[:-dias_delta], matriz[:-dias_delta], series)
+    capa = preparar_capa(actualizar_descomposicion(anterior, fechas, matriz, series))
+
+    tiempos = {"desde_cero": [], "incremental": [], "pronostico_rango": []}
+    for _ in range(repeticiones):
+        for nombre, funcion in (
+            ("desde_cero", lambda: preparar_capa(actualizar_descomposicion(None, fechas, matriz, series))),
+            ("incremental", lambda: preparar_capa(actualizar_descomposicion(anterior, fechas, matriz, series))),
+            ("pronostico_rango", lambda: pronostico_rango(capa, series[0], "2026-01-01", "2026-12-31"))
+        ):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos[nombre].append(time.perf_counter() - inicio)
+
+    resultados = {"dias": len(fechas), "series": len(series), "dias_delta": dias_delta}
+    resultados.update({nombre: percentiles(valores) for nombre, valores in tiempos.items()})
+    print(f"(+) Series diarias: desde cero {resultados['desde_cero']['p50_ms']} ms, "
+          f"incremental {resultados['incremental']['p50_ms']} ms, rango {resultados['pronostico_rango']['p50_ms']} ms")
+    return resultados
+
+
+def medir_ingesta(repeticiones):
+    from ingesta_homicidios import cargar_homicidios
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        df = cargar_homicidios()
+        tiempos.append(time.perf_counter() - inicio)
+    return df, percentiles(tiempos)
+
+
+def version_codigo():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CARPETA_PROYECTO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+# Un escenario por cantidad de filas: generar, servir, ingerir, guardar la copia local y medir
+def escenario(filas, args, carpeta):
+    print(f"(+) Escenario de {filas} registros")
+    inicio = time.perf_counter()
+    df_api = generar_homicidios(filas, args.semilla)
+    generacion = time.perf_counter() - inicio
+
+    servidor, url = iniciar_servidor(df_api)
+    try:
+        import ingesta_homicidios
+        ingesta_homicidios.URL = url
+        df, ingesta = medir_ingesta(args.repeticiones_ingesta)
+
+        from snapshot_homicidios import guardar_snapshot, RUTA_SNAPSHOT
+        guardar_snapshot(df, RUTA_SNAPSHOT)
+
+        return {
+            "filas": filas,
+            "generacion_s": round(generacion, 3),
+            "ingesta": ingesta,
+            "arranque_en_frio": arranque_en_frio(url, carpeta, args.repeticiones_arranque),
+            "callbacks": medir_callbacks(df, args.repeticiones),
+            "serializacion": medir_serializacion(df, args.repeticiones),
+            "series": medir_series(args.repeticiones)
+        }
+    finally:
+        servidor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sin conexion de los dashboards de homicidios")
+    parser.add_argument("--filas", type=int, nargs="+", default=[100000], help="registros sinteticos (p. ej. 100000 1000000 10000000)")
+    parser.add_argument("--repeticiones", type=int, default=30, help="llamadas medidas por callback")
+    parser.add_argument("--repeticiones-ingesta", type=int, default=3)
+    parser.add_argument("--repeticiones-arranque", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_homicidios.json")
+    args = parser.parse_args()
+
+    # La copia local, los modelos y los perfiles del benchmark nunca tocan la carpeta datos/ real
+    with tempfile.TemporaryDirectory(prefix="benchmark_homicidios_") as carpeta:
+        os.environ.update(entorno_benchmark("", carpeta))
+        resultados = {
+            "commit": version_codigo(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "maquina": platform.platform(),
+            "escenarios": [escenario(filas, args, carpeta) for filas in args.filas]
+        }
+
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"(+) Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# MODULO DEL CALENDARIO DE HOMICIDIOS
+# LOS COLORES DE TODO EL MES SE CALCULAN EN UNA SOLA OPERACION DE NUMPY
+# Y EL CALENDARIO SE ENVIA COMO UN SOLO HEATMAP DE PLOTLY EN VEZ DE UNA TABLA HTML
+# EL ESTILO DEL HEATMAP VA EN EL LAYOUT Y CADA CAMBIO DE FILTRO ES UN dash.Patch CON LOS DATOS DEL MES
+
+import calendar
+import numpy as np
+import plotly.graph_objects as go
+from dash import Patch
+
+dias_semana = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+
+# Escala de azul (menos homicidios) a rojo (mas homicidios), igual a la del calendario anterior
+escala_calendario = [[0, "rgb(0,0,255)"], [1, "rgb(255,0,0)"]]
+
+
+# Se arma la matriz semanas x 7 con el valor normalizado de cada dia y su texto
+# Las celdas que no son dias del mes quedan en NaN y no se pintan
+def matriz_calendario(anio, mes, conteo_dias):
+    primer_dia, num_dias = calendar.monthrange(anio, mes)
+    conteos = np.asarray(conteo_dias[:num_dias])
+    semanas = (primer_dia + num_dias + 6) // 7
+
+    minimo, maximo = conteos.min(), conteos.max()
+    rango = maximo - minimo
+    normalizado = (conteos - minimo) / rango if rango else np.zeros(num_dias)
+
+    celdas = primer_dia + np.arange(num_dias)
+    z = np.full(semanas * 7, np.nan)
+    z[celdas] = normalizado
+
+    dias = np.arange(1, num_dias + 1).astype(str)
+    texto = np.full(semanas * 7, "", dtype=object)
+    texto[celdas] = np.char.add(np.char.add(dias, "<br>"), conteos.astype(str))
+
+    return z.reshape(semanas, 7), texto.reshape(semanas, 7)
+
+
+# Heatmap sin datos con todo el estilo; va una sola vez en el layout de la pagina
+def calendario_base():
+    fig = go.Figure(go.Heatmap(
+        z=[],
+        x=dias_semana,
+        y=[],
+        text=[],
+        texttemplate="%{text}",
+        textfont={"color": "white"},
+        hoverinfo="text",
+        colorscale=escala_calendario,
+        zmin=0,
+        zmax=1,
+        showscale=False,
+        xgap=2,
+        ygap=2
+    ))
+    fig.update_layout(
+        template="plotly_dark",
+        xaxis={"side": "top"},
+        yaxis={"autorange": "reversed"},
+        plot_bgcolor="black",
+        paper_bgcolor="black",
+        height=120 + 80 * 5
+    )
+    return fig
+
+
+# Al cambiar el mes solo se envian la matriz, los textos, las semanas y el alto
+# z se deja como arreglo de numpy para que los NaN lleguen como null
+def parche_calendario(anio, mes, conteo_dias):
+    z, texto = matriz_calendario(anio, mes, conteo_dias)
+
+    parche = Patch()
+    parche["data"][0]["z"] = z
+    parche["data"][0]["text"] = texto.tolist()
+    parche["data"][0]["y"] = [f"Semana {i + 1}" for i in range(z.shape[0])]
+    parche["layout"]["height"] = 120 + 80 * z.shape[0]
+    return parche
@@ -0,0 +1,162 @@
+# MODULO DE DATOS COMPARTIDOS ENTRE VARIOS PROCESOS (WORKERS DE GUNICORN)
+# UN PASO DE PREPARACION ESCRIBE CADA COLUMNA DEL DATASET LIMPIO EN UN .npy (LAS category COMO SUS CODIGOS ENTEROS),
+# EL CUBO DE CONTEOS Y LOS INDICES DE LAS TABLAS. CADA WORKER LOS ABRE CON memory map DE SOLO LECTURA Y ARMA
+# EL DataFrame SIN COPIAR LOS ARREGLOS: EL SISTEMA OPERATIVO GUARDA UNA SOLA COPIA PARA TODOS LOS WORKERS
+# Y EN CADA WORKER SOLO QUEDAN PRIVADAS LAS LISTAS DE CATEGORIAS Y LAS LLAVES DE LOS INDICES
+# SE EJECUTA ASI PARA PREPARAR LOS ARCHIVOS Y MANTENERLOS AL DIA:  python compartido_homicidios.py
+
+import os
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+from snapshot_homicidios import CARPETA_DATOS, cargar_snapshot, version_snapshot
+from cubo_homicidios import construir_cubo, armar_cubo
+from tabla_homicidios import construir_indice
+
+CARPETA_COMPARTIDA = os.path.join(CARPETA_DATOS, "compartido")
+
+# Indices que usan las paginas (datos_homicidios.indice_tabla); se calculan al preparar los datos
+INDICES_COMPARTIDOS = ["anio", ["anio", "mes", "dia"], ["anio", "mes", "departamento"]]
+
+
+def ruta_actual(carpeta=CARPETA_COMPARTIDA):
+    return os.path.join(carpeta, "actual.json")
+
+
+# Version que los workers deben usar
+def version_compartida(carpeta=CARPETA_COMPARTIDA):
+    with open(ruta_actual(carpeta), encoding="utf-8") as archivo:
+        return json.load(archivo)["version"]
+
+
+def nombre_indice(columnas):
+    return "indice_" + ("_".join(columnas) if isinstance(columnas, list) else columnas)
+
+
+# Cada columna va en su propio .npy; de las category se guardan los codigos y las categorias van al json
+# Las columnas de texto que no son category tambien se guardan asi, porque un .npy de objetos no se puede mapear
+def escribir_columnas(df, destino):
+    columnas = []
+    for i, columna in enumerate(df.columns):
+        serie = df[columna]
+        archivo = f"columna_{i}.npy"
+        if not isinstance(serie.dtype, pd.CategoricalDtype) and serie.dtype.kind not in "biufM":
+            serie = serie.astype("category")
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(destino, archivo), serie.cat.codes.to_numpy())
+            columnas.append({"nombre": columna, "archivo": archivo, "categorias": serie.cat.categories.tolist()})
+        else:
+            np.save(os.path.join(destino, archivo), serie.to_numpy())
+            columnas.append({"nombre": columna, "archivo": archivo})
+    return columnas
+
+
+# Las posiciones de cada grupo quedan seguidas en un solo arreglo; el json guarda la llave y donde empieza cada grupo
+def escribir_indice(df, columnas, destino):
+    indice = construir_indice(df, columnas)
+    llaves = list(indice)
+    posiciones = np.concatenate([indice[llave] for llave in llaves]) if llaves else np.array([], dtype=np.int64)
+    np.save(os.path.join(destino, nombre_indice(columnas) + ".npy"), posiciones)
+    return {
+        "columnas": columnas,
+        "llaves": [[v.item() if hasattr(v, "item") else v for v in llave] if isinstance(llave, tuple)
+                   else (llave.item() if hasattr(llave, "item") else llave) for llave in llaves],
+        "limites": np.cumsum([0] + [len(indice[llave]) for llave in llaves]).tolist()
+    }
+
+
+# Cada version se escribe en su propia carpeta y al final se cambia el puntero actual.json
+# con un solo os.replace, asi un worker nunca abre archivos a medio escribir
+def escribir_compartido(df, carpeta=CARPETA_COMPARTIDA):
+    cubo = construir_cubo(df)
+    version = version_snapshot(df)
+    destino = os.path.join(carpeta, version)
+    os.makedirs(destino, exist_ok=True)
+
+    df = df.reset_index(drop=True)
+    np.save(os.path.join(destino, "conteos.npy"), cubo["conteos"])
+    meta = {
+        "anios": cubo["anios"],
+        "departamentos": [str(d) for d in cubo["departamentos"]],
+        "columnas": escribir_columnas(df, destino),
+        "indices": [escribir_indice(df, columnas, destino) for columnas in INDICES_COMPARTIDOS]
+    }
+    with open(os.path.join(destino, "datos.json"), "w", encoding="utf-8") as archivo:
+        json.dump(meta, archivo, ensure_ascii=False)
+
+    anterior = version_compartida(carpeta) if os.path.exists(ruta_actual(carpeta)) else None
+    temporal = ruta_actual(carpeta) + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"version": version}, archivo)
+    os.replace(temporal, ruta_actual(carpeta))
+
+    # Se conserva la version anterior porque algun worker todavia puede estar abriendola
+    for nombre in os.listdir(carpeta):
+        if nombre not in (version, anterior) and os.path.isdir(os.path.join(carpeta, nombre)):
+            shutil.rmtree(os.path.join(carpeta, nombre), ignore_errors=True)
+
+    print(f"(+) Datos compartidos escritos: {len(df)} registros, version {version}")
+    return version
+
+
+# Paso de preparacion: lee la copia local, trae el delta de la api y reescribe solo si cambio la version
+# (o si la carpeta de esa version es del formato anterior, sin datos.json)
+def preparar_compartido(carpeta=CARPETA_COMPARTIDA):
+    df = cargar_snapshot()
+    if (
+        os.path.exists(ruta_actual(carpeta))
+        and version_compartida(carpeta) == version_snapshot(df)
+        and os.path.exists(os.path.join(carpeta, version_snapshot(df), "datos.json"))
+    ):
+        print(f"(+) Los datos compartidos ya estan en la version {version_snapshot(df)}")
+        return version_snapshot(df)
+    return escribir_compartido(df, carpeta)
+
+
+def abrir_columna(origen, columna):
+    valores = np.load(os.path.join(origen, columna["archivo"]), mmap_mode="r")
+    if "categorias" in columna:
+        return pd.Categorical.from_codes(valores, categories=pd.Index(columna["categorias"]))
+    return valores
+
+
+# Cada grupo del indice es una vista del arreglo mapeado, no una copia
+def abrir_indice(origen, info):
+    posiciones = np.load(os.path.join(origen, nombre_indice(info["columnas"]) + ".npy"), mmap_mode="r")
+    limites = info["limites"]
+    return {
+        tuple(llave) if isinstance(llave, list) else llave: posiciones[limites[i]: limites[i + 1]]
+        for i, llave in enumerate(info["llaves"])
+    }
+
+
+# Lo usa cada worker: el DataFrame, el cubo y los indices quedan apuntando a los archivos mapeados (solo lectura)
+# copy=False evita que pandas junte las columnas en bloques nuevos, que serian memoria privada del worker
+def abrir_compartido(carpeta=CARPETA_COMPARTIDA):
+    origen = os.path.join(carpeta, version_compartida(carpeta))
+    with open(os.path.join(origen, "datos.json"), encoding="utf-8") as archivo:
+        meta = json.load(archivo)
+
+    df = pd.DataFrame({c["nombre"]: abrir_columna(origen, c) for c in meta["columnas"]}, copy=False)
+    conteos = np.load(os.path.join(origen, "conteos.npy"), mmap_mode="r")
+    indices = {
+        tuple(info["columnas"]) if isinstance(info["columnas"], list) else info["columnas"]: abrir_indice(origen, info)
+        for info in meta["indices"]
+    }
+
+    print(f"(+) Datos compartidos abiertos: {len(df)} registros, version {version_snapshot(df)}")
+    return df, armar_cubo(conteos, meta["anios"], meta["departamentos"]), indices
+
+
+# Se ejecuta la preparacion y se repite cada MINUTOS_ACTUALIZACION para que los workers tomen la nueva version
+if __name__ == "__main__":
+    from datos_homicidios import MINUTOS_ACTUALIZACION
+    preparar_compartido()
+    while MINUTOS_ACTUALIZACION > 0:
+        time.sleep(MINUTOS_ACTUALIZACION * 60)
+        try:
+            preparar_compartido()
+        except Exception as error:
+            print(f"(-) No se pudieron preparar los datos compartidos, se mantiene la version actual: {error}")
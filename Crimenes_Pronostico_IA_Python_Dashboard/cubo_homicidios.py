@@ -0,0 +1,100 @@
+# MODULO DEL CUBO DE CONTEOS DE HOMICIDIOS
+# SE CONSTRUYE UNA SOLA VEZ UN ARREGLO NUMPY CON LA CANTIDAD DE HOMICIDIOS
+# POR (AÑO, MES, DIA, DEPARTAMENTO) PARA QUE LOS CALLBACK NO RECORRAN TODAS LAS FILAS
+
+import numpy as np
+import pandas as pd
+
+
+# Se crea el cubo de conteos a partir del DataFrame limpio
+def construir_cubo(df):
+    anios = sorted(int(a) for a in df["anio"].unique())
+    departamentos = sorted(df["departamento"].unique())
+
+    i_anio = np.searchsorted(np.array(anios), df["anio"].to_numpy())
+    i_mes = df["mes"].to_numpy() - 1
+    i_dia = df["dia"].to_numpy() - 1
+    i_departamento = pd.Categorical(df["departamento"], categories=departamentos).codes
+
+    forma = (len(anios), 12, 31, len(departamentos))
+    posiciones = np.ravel_multi_index((i_anio, i_mes, i_dia, i_departamento), forma)
+    conteos = np.bincount(posiciones, minlength=int(np.prod(forma))).reshape(forma).astype(np.int32)
+    return armar_cubo(conteos, anios, departamentos)
+
+
+# El cubo tambien se puede armar con un arreglo ya calculado (por ejemplo mapeado desde un archivo .npy)
+def armar_cubo(conteos, anios, departamentos):
+    return {
+        "conteos": conteos,
+        "anios": anios,
+        "departamentos": departamentos,
+        "pos_anio": {a: i for i, a in enumerate(anios)},
+        "pos_departamento": {d: i for i, d in enumerate(departamentos)}
+    }
+
+
+# Meses del año que tienen al menos un registro
+def meses_con_datos(cubo, anio):
+    if anio not in cubo["pos_anio"]:
+        return []
+    por_mes = cubo["conteos"][cubo["pos_anio"][anio]].sum(axis=(1, 2))
+    return [int(m) + 1 for m in np.flatnonzero(por_mes)]
+
+
+# Dias del mes que tienen al menos un registro
+def dias_con_datos(cubo, anio, mes):
+    if anio not in cubo["pos_anio"] or mes is None:
+        return []
+    por_dia = cubo["conteos"][cubo["pos_anio"][anio], mes - 1].sum(axis=1)
+    return [int(d) + 1 for d in np.flatnonzero(por_dia)]
+
+
+# Arbol {año: {mes: [dias]}} con las fechas que tienen registros
+# Las llaves son texto porque el arbol se envia al navegador como JSON
+def arbol_fechas(cubo):
+    hay_datos = cubo["conteos"].sum(axis=3) > 0
+    arbol = {}
+    for i_anio, i_mes, i_dia in zip(*np.nonzero(hay_datos)):
+        meses = arbol.setdefault(str(cubo["anios"][i_anio]), {})
+        meses.setdefault(str(i_mes + 1), []).append(int(i_dia) + 1)
+    return arbol
+
+
+# Conteo por departamento para un año, y opcionalmente un mes y un dia
+# Devuelve solo los departamentos con homicidios, igual que un groupby().size()
+def conteo_por_departamento(cubo, anio, mes=None, dia=None, nombre="cantidad"):
+    if anio not in cubo["pos_anio"]:
+        return pd.DataFrame({"departamento": [], nombre: []})
+
+    bloque = cubo["conteos"][cubo["pos_anio"][anio]]
+    if mes is not None:
+        bloque = bloque[mes - 1]
+        bloque = bloque[dia - 1] if dia is not None else bloque.sum(axis=0)
+    else:
+        bloque = bloque.sum(axis=(0, 1))
+
+    indices = np.flatnonzero(bloque)
+    return pd.DataFrame({
+        "departamento": [cubo["departamentos"][i] for i in indices],
+        nombre: bloque[indices]
+    })
+
+
+# Conteo de todos los dias del mes para un departamento (incluye los dias en cero)
+def conteo_dias_mes(cubo, anio, mes, departamento):
+    if anio not in cubo["pos_anio"] or departamento not in cubo["pos_departamento"]:
+        return np.zeros(31, dtype=np.int32)
+    return cubo["conteos"][cubo["pos_anio"][anio], mes - 1, :, cubo["pos_departamento"][departamento]]
+
+
+# Conteo por dia para un departamento, solo los dias con homicidios
+def conteo_por_dia(cubo, anio, mes, departamento, nombre="cantidad"):
+    por_dia = conteo_dias_mes(cubo, anio, mes, departamento)
+    indices = np.flatnonzero(por_dia)
+    return pd.DataFrame({"dia": indices + 1, nombre: por_dia[indices]})
+
+
+# Matriz departamentos x años con los homicidios de un mismo mes y dia en cada año
+# Es la entrada de los modelos de pronostico
+def serie_por_anio(cubo, mes, dia):
+    return cubo["conteos"][:, mes - 1, dia - 1, :].T
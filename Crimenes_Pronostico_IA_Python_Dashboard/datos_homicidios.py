@@ -0,0 +1,192 @@
+# MODULO DE DATOS COMPARTIDOS POR TODAS LAS PAGINAS DE HOMICIDIOS
+# EL DATASET, EL CUBO DE CONTEOS Y LOS INDICES SE CARGAN UNA SOLA VEZ POR PROCESO
+# Y SOLO CUANDO UNA PAGINA LOS PIDE POR PRIMERA VEZ. LAS PAGINAS SOLO LOS LEEN
+# UN HILO EN SEGUNDO PLANO PUEDE TRAER LOS REGISTROS NUEVOS Y CAMBIAR LA VERSION SIN REINICIAR
+# CON DATOS_COMPARTIDOS=1 (VARIOS WORKERS) SE MAPEAN LOS ARCHIVOS DE compartido_homicidios EN VEZ DE LEER EL SNAPSHOT
+
+import os
+import time
+import threading
+from snapshot_homicidios import cargar_snapshot, cargar_totales, refrescar_snapshot, version_snapshot
+from compartido_homicidios import abrir_compartido, version_compartida
+from cubo_homicidios import construir_cubo, arbol_fechas
+from ingesta_homicidios import totales_anuales
+from tabla_homicidios import construir_indice, filas_indice
+
+DATOS_COMPARTIDOS = os.environ.get("DATOS_COMPARTIDOS", "0") == "1"
+datos = None
+candado_datos = threading.Lock()
+
+
+# Se arma el paquete de datos de solo lectura que comparten las paginas
+# indices trae los indices de las tablas ya calculados (los mapeados de compartido_homicidios)
+def preparar_datos(df, cubo=None, indices=None):
+    if cubo is None:
+        cubo = construir_cubo(df)
+    return {
+        "df": df,
+        "cubo": cubo,
+        "version": version_snapshot(df),
+        "anios": cubo["anios"],
+        "departamentos": cubo["departamentos"],
+        "arbol_fechas": arbol_fechas(cubo),
+        "indices": dict(indices or {})
+    }
+
+
+# Los workers mapean el dataset y el cubo ya preparados; un proceso solo lee la copia local
+def cargar_datos():
+    if DATOS_COMPARTIDOS:
+        return preparar_datos(*abrir_compartido())
+    return preparar_datos(cargar_snapshot())
+
+
+# Devuelve los datos compartidos; la primera llamada los carga
+# Cada callback debe llamarla una sola vez y usar ese mismo paquete hasta terminar,
+# asi una actualizacion a mitad de la peticion no mezcla dos versiones
+def obtener_datos():
+    global datos
+    if datos is None:
+        with candado_datos:
+            if datos is None:
+                datos = cargar_datos()
+    return datos
+
+
+# Indice de filas para las tablas paginadas; cada combinacion de columnas se construye una vez
+def indice_tabla(datos, columnas):
+    llave = tuple(columnas) if isinstance(columnas, list) else columnas
+    if llave not in datos["indices"]:
+        datos["indices"][llave] = construir_indice(datos["df"], columnas)
+    return datos["indices"][llave]
+
+
+# TOTALES PARA LAS PAGINAS ANUALES (00_00, 00_01, 00_02)
+# Modo opcional: con SOLO_TOTALES=1 esas paginas no descargan el dataset completo,
+# solo los totales por departamento y año agrupados en la api
+SOLO_TOTALES = os.environ.get("SOLO_TOTALES", "0") == "1"
+totales = None
+candado_totales = threading.Lock()
+
+
+def preparar_totales(df_totales, version):
+    return {
+        "totales": df_totales,
+        "version": version,
+        "anios": sorted(int(a) for a in df_totales["anio"].unique()),
+        "indice": construir_indice(df_totales, "anio")
+    }
+
+
+def descargar_totales():
+    df_totales = cargar_totales()
+    return preparar_totales(df_totales, f"totales-{len(df_totales)}-{df_totales['cantidad'].sum()}")
+
+
+# Devuelve los totales; sin SOLO_TOTALES se agregan desde el dataset compartido
+def obtener_totales():
+    global totales
+    if totales is None:
+        with candado_totales:
+            if totales is None:
+                if SOLO_TOTALES:
+                    totales = descargar_totales()
+                else:
+                    datos = obtener_datos()
+                    totales = preparar_totales(totales_anuales(datos["df"]), datos["version"])
+    return totales
+
+
+# Cantidad de homicidios por departamento en un año
+def conteo_anual(anio):
+    datos_totales = obtener_totales()
+    return filas_indice(datos_totales["totales"], datos_totales["indice"], anio)[["departamento", "cantidad"]]
+
+
+# Filas de la tabla de las paginas anuales
+# En modo SOLO_TOTALES los registros no se descargan y la tabla muestra los totales del año
+def tabla_anual(anio):
+    if SOLO_TOTALES:
+        datos_totales = obtener_totales()
+        return filas_indice(datos_totales["totales"], datos_totales["indice"], anio)
+    datos = obtener_datos()
+    return filas_indice(datos["df"], indice_tabla(datos, "anio"), anio)
+
+
+# ACTUALIZACION EN SEGUNDO PLANO
+# Cada cierto tiempo se trae el delta de la api, se arman el cubo y los indices fuera de las peticiones
+# y al final se cambia la referencia global en una sola asignacion
+# Con DATOS_COMPARTIDOS los workers no llaman a la api: solo revisan si el preparador escribio otra version
+MINUTOS_ACTUALIZACION = float(os.environ.get("MINUTOS_ACTUALIZACION", "30"))
+suscriptores = []
+
+
+# Las paginas registran aqui lo que deben limpiar cuando cambia la version (caches, calentamiento)
+def al_actualizar_datos(funcion):
+    suscriptores.append(funcion)
+    return funcion
+
+
+def version_actual():
+    if datos is not None:
+        return datos["version"]
+    if totales is not None:
+        return totales["version"]
+    return "sin cargar"
+
+
+# Se actualiza solo lo que ya esta en memoria; devuelve True si cambio la version
+def actualizar_datos():
+    global datos, totales
+    cambio = False
+
+    actuales = datos
+    if actuales is not None:
+        if DATOS_COMPARTIDOS:
+            nuevos = cargar_datos() if version_compartida() != actuales["version"] else None
+        else:
+            df_nuevo = refrescar_snapshot(actuales["df"])
+            nuevos = preparar_datos(df_nuevo) if version_snapshot(df_nuevo) != actuales["version"] else None
+
+        if nuevos is not None:
+            # Los indices que ya usaban las paginas se construyen antes del cambio
+            for llave in actuales["indices"]:
+                indice_tabla(nuevos, list(llave) if isinstance(llave, tuple) else llave)
+            nuevos_totales = None if SOLO_TOTALES else preparar_totales(totales_anuales(nuevos["df"]), nuevos["version"])
+
+            with candado_datos:
+                datos = nuevos
+                if nuevos_totales is not None:
+                    totales = nuevos_totales
+            cambio = True
+
+    if SOLO_TOTALES and totales is not None:
+        nuevos_totales = descargar_totales()
+        if nuevos_totales["version"] != totales["version"]:
+            with candado_totales:
+                totales = nuevos_totales
+            cambio = True
+
+    if cambio:
+        print(f"(+) Datos actualizados a la version {version_actual()}")
+        for funcion in suscriptores:
+            funcion()
+    return cambio
+
+
+def ciclo_actualizacion(minutos):
+    while True:
+        time.sleep(minutos * 60)
+        try:
+            actualizar_datos()
+        except Exception as error:
+            print(f"(-) No se pudieron actualizar los datos, se siguen usando los actuales: {error}")
+
+
+# Lo llaman los scripts que inician el servidor; con MINUTOS_ACTUALIZACION=0 no se actualiza
+def iniciar_actualizacion(minutos=MINUTOS_ACTUALIZACION):
+    if minutos <= 0:
+        return None
+    hilo = threading.Thread(target=ciclo_actualizacion, args=(minutos,), daemon=True)
+    hilo.start()
+    return hilo
@@ -0,0 +1,102 @@
+# MODULO DE REFERENCIA DE DEPARTAMENTOS DE COLOMBIA
+# UNA SOLA TABLA CON EL NOMBRE OFICIAL Y LA UBICACION DE CADA DEPARTAMENTO
+# SE USA PARA UNIFICAR LA ESCRITURA DE LOS NOMBRES AL CARGAR LOS DATOS
+# Y PARA UBICAR LOS CONTEOS EN LOS MAPAS CON UN SOLO merge
+
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# Nombre oficial, longitud y latitud del centro de cada departamento
+departamentos_colombia = [
+    ("AMAZONAS", -69.9333, -1.4433),
+    ("ANTIOQUIA", -75.5636, 6.2518),
+    ("ARAUCA", -70.7333, 7.0833),
+    ("ATLANTICO", -75.5247, 10.4230),
+    ("BOGOTA D.C.", -74.0721, 4.7110),
+    ("BOLIVAR", -75.5000, 10.4000),
+    ("BOYACA", -73.3500, 5.5500),
+    ("CALDAS", -75.5138, 5.0703),
+    ("CAQUETA", -75.6667, 1.5833),
+    ("CASANARE", -71.7333, 5.3667),
+    ("CAUCA", -76.0000, 2.5000),
+    ("CESAR", -73.2500, 10.9833),
+    ("CHOCO", -76.6413, 5.6936),
+    ("CORDOBA", -75.8800, 8.7700),
+    ("CUNDINAMARCA", -74.0758, 4.5981),
+    ("GUAINIA", -69.7500, 2.5667),
+    ("GUAVIARE", -72.6333, 2.5667),
+    ("HUILA", -75.2800, 2.9300),
+    ("LA GUAJIRA", -72.9000, 11.5400),
+    ("MAGDALENA", -74.2500, 10.5000),
+    ("META", -73.6140, 4.1560),
+    ("NARIÑO", -77.2719, 1.2141),
+    ("NORTE DE SANTANDER", -72.4967, 7.8891),
+    ("PUTUMAYO", -76.5417, 0.1521),
+    ("QUINDIO", -75.7688, 4.5617),
+    ("RISARALDA", -75.6946, 4.8517),
+    ("SAN ANDRES Y PROVIDENCIA", -81.7000, 12.5847),
+    ("SANTANDER", -73.1198, 7.1254),
+    ("SUCRE", -75.3977, 9.3070),
+    ("TOLIMA", -75.2322, 4.4359),
+    ("VALLE DEL CAUCA", -76.5225, 3.4372),
+    ("VAUPES", -70.2500, 1.5833),
+    ("VICHADA", -69.1000, 4.6000),
+]
+
+
+# Clave de comparacion: mayusculas, sin tildes ni Ñ, sin puntos, comas ni guiones bajos
+def clave_departamento(nombre):
+    texto = unicodedata.normalize("NFKD", str(nombre).upper())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r"[^A-Z0-9 ]", " ", texto.replace(".", ""))
+    return " ".join(texto.split())
+
+
+# Otras formas en que aparecen los departamentos en las fuentes de datos
+alias_departamentos = {
+    "BOGOTA": "BOGOTA D.C.",
+    "BOGOTA D C": "BOGOTA D.C.",
+    "BOGOTA DISTRITO CAPITAL": "BOGOTA D.C.",
+    "SANTAFE DE BOGOTA": "BOGOTA D.C.",
+    "SANTAFE DE BOGOTA DC": "BOGOTA D.C.",
+    "GUAJIRA": "LA GUAJIRA",
+    "VALLE": "VALLE DEL CAUCA",
+    "NORTE SANTANDER": "NORTE DE SANTANDER",
+    "SAN ANDRES": "SAN ANDRES Y PROVIDENCIA",
+    "SAN ANDRES PROVIDENCIA Y SANTA CATALINA": "SAN ANDRES Y PROVIDENCIA",
+    "ARCHIPIELAGO DE SAN ANDRES PROVIDENCIA Y SANTA CATALINA": "SAN ANDRES Y PROVIDENCIA",
+}
+
+# Tabla de referencia indexada por el nombre oficial
+referencia_departamentos = pd.DataFrame(
+    departamentos_colombia, columns=["departamento", "lon", "lat"]
+).set_index("departamento")
+
+nombres_por_clave = {clave_departamento(d): d for d in referencia_departamentos.index}
+nombres_por_clave.update({clave_departamento(a): d for a, d in alias_departamentos.items()})
+
+
+# Nombre oficial de un departamento; si no se reconoce se deja en mayusculas para no perder la fila
+def nombre_departamento(nombre):
+    return nombres_por_clave.get(clave_departamento(nombre), str(nombre).strip().upper())
+
+
+# Se unifican los nombres de toda la columna revisando cada categoria una sola vez
+# Varias escrituras pueden dar el mismo nombre, por eso se traducen los codigos enteros
+# en vez de usar map (que arma un arreglo de textos del tamaño de la columna)
+def normalizar_departamentos(serie):
+    serie = serie.astype("category")
+    oficiales = [nombre_departamento(c) for c in serie.cat.categories]
+    categorias = sorted(set(oficiales))
+    posicion = {d: i for i, d in enumerate(categorias)}
+    traduccion = np.array([posicion[d] for d in oficiales] + [-1], dtype=np.int64)
+    codigos = traduccion[serie.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codigos, categorias), index=serie.index, name=serie.name)
+
+
+# Se agregan lon y lat a un conteo por departamento con un solo join sobre la tabla de referencia
+# Los departamentos sin ubicacion no se pueden dibujar y quedan fuera del mapa
+def ubicar_departamentos(conteo, columna="departamento"):
+    return conteo.join(referencia_departamentos, on=columna, how="inner").reset_index(drop=True)
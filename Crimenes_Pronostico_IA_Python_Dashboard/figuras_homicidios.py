@@ -0,0 +1,93 @@
+# MODULO DE FIGURAS DE LOS DASHBOARDS DE HOMICIDIOS
+# CADA GRAFICA SE ARMA UNA SOLA VEZ CON SU LAYOUT Y SU TRAZA BASE (SIN DATOS) Y VA EN EL LAYOUT DE LA PAGINA
+# AL CAMBIAR UN FILTRO EL CALLBACK SOLO ENVIA LOS ARREGLOS QUE CAMBIAN (x, y, texto, colores, tamaños)
+# CON dash.Patch, ASI PLOTLY NO RECONSTRUYE LA FIGURA Y LA RESPUESTA PESA MUCHO MENOS
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from dash import Patch
+from departamentos_homicidios import referencia_departamentos
+
+# Cada departamento tiene siempre el mismo color, sin importar que otros departamentos salgan en el filtro
+paleta = px.colors.qualitative.Plotly
+colores_departamentos = {d: paleta[i % len(paleta)] for i, d in enumerate(referencia_departamentos.index)}
+COLOR_SIN_REFERENCIA = "gray"
+
+# Figuras base ya convertidas a diccionario, una por grafica
+figuras_base = {}
+
+
+def colores_de(departamentos):
+    return [colores_departamentos.get(d, COLOR_SIN_REFERENCIA) for d in departamentos]
+
+
+# Se construye la figura la primera vez que se pide y despues se reutiliza
+def figura_base(nombre, construir):
+    if nombre not in figuras_base:
+        figuras_base[nombre] = construir().to_dict()
+    return figuras_base[nombre]
+
+
+# Barras con una sola traza; los colores van por barra en marker.color
+def barras_base(texto_dentro=False, color_texto=None, **layout):
+    traza = go.Bar(x=[], y=[], marker={"color": []})
+    if texto_dentro:
+        traza.update(text=[], textposition="inside")
+    if color_texto is not None:
+        traza.update(textfont_color=color_texto)
+    figura = go.Figure(traza)
+    figura.update_layout(showlegend=False, **layout)
+    return figura
+
+
+# Mapa de puntos (Scattermapbox o Scattergeo) con una sola traza
+def mapa_base(tipo_traza, traza=None, **layout):
+    figura = go.Figure(tipo_traza(lon=[], lat=[], text=[], **(traza or {})))
+    figura.update_layout(**layout)
+    return figura
+
+
+# Los arreglos de numeros se envian como numpy (orjson los escribe sin pasar por listas de Python);
+# el texto y los colores se pasan a lista
+def lista(valores):
+    valores = np.asarray(valores)
+    if valores.dtype.kind in "biuf":
+        return np.ascontiguousarray(valores)
+    return valores.tolist()
+
+
+# Cambios de una grafica de barras: solo los arreglos y, si cambia, el titulo
+def parche_barras(x, y, colores, texto=None, titulo=None):
+    parche = Patch()
+    parche["data"][0]["x"] = lista(x)
+    parche["data"][0]["y"] = lista(y)
+    parche["data"][0]["marker"]["color"] = lista(colores)
+    if texto is not None:
+        parche["data"][0]["text"] = lista(texto)
+    if titulo is not None:
+        parche["layout"]["title"]["text"] = titulo
+    return parche
+
+
+# Barras por departamento a partir de un conteo con columnas departamento y cantidad
+def parche_barras_departamentos(conteo, columna="cantidad", texto=False, titulo=None):
+    departamentos = conteo["departamento"].astype(str)
+    return parche_barras(
+        departamentos,
+        conteo[columna],
+        colores_de(departamentos),
+        conteo[columna] if texto else None,
+        titulo
+    )
+
+
+def parche_mapa(lon, lat, texto, tamanos, titulo=None):
+    parche = Patch()
+    parche["data"][0]["lon"] = lista(lon)
+    parche["data"][0]["lat"] = lista(lat)
+    parche["data"][0]["text"] = lista(texto)
+    parche["data"][0]["marker"]["size"] = lista(tamanos)
+    if titulo is not None:
+        parche["layout"]["title"]["text"] = titulo
+    return parche
@@ -0,0 +1,23 @@
+# CONFIGURACION DE GUNICORN PARA LA APLICACION MULTIPAGINA DE HOMICIDIOS
+# SE EJECUTA DESDE ESTA CARPETA CON:  gunicorn app:server
+# EL PROCESO PRINCIPAL PREPARA LOS DATOS UNA VEZ Y CADA WORKER LOS MAPEA EN SOLO LECTURA (compartido_homicidios)
+
+import os
+
+# Los workers heredan esta variable y no descargan ni limpian el dataset por su cuenta
+os.environ.setdefault("DATOS_COMPARTIDOS", "1")
+
+bind = os.environ.get("DIRECCION", "0.0.0.0:8050")
+workers = int(os.environ.get("WORKERS", "4"))
+
+
+# Antes de crear los workers se escriben los archivos compartidos si no estan en la ultima version
+def on_starting(server):
+    from compartido_homicidios import preparar_compartido
+    preparar_compartido()
+
+
+# Cada worker revisa cada MINUTOS_ACTUALIZACION si el preparador escribio una version nueva
+def post_worker_init(worker):
+    from datos_homicidios import iniciar_actualizacion
+    iniciar_actualizacion()
@@ -0,0 +1,208 @@
+# MODULO COMPARTIDO DE INGESTA DE HOMICIDIOS DESDE DATOS.GOV.CO
+# SE DESCARGA EL DATASET POR PAGINAS ($offset / $order) EN VEZ DE UNA SOLA PETICION
+# CADA PAGINA SE PIDE EN CSV Y SE LEE POR BLOQUES MIENTRAS LLEGA, DIRECTO A COLUMNAS TIPADAS
+# (category Y datetime), SIN ARMAR LA LISTA DE DICCIONARIOS DE response.json()
+# ASI LA MEMORIA MAXIMA QUEDA CERCA DEL TAMAÑO DEL DataFrame FINAL
+
+import os
+import requests
+import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from departamentos_homicidios import normalizar_departamentos
+
+# Se guardan las variables relacionadas a la api
+# URL_HOMICIDIOS permite apuntar a otro servidor, por ejemplo el de benchmark_homicidios
+URL = os.environ.get("URL_HOMICIDIOS", "https://www.datos.gov.co/resource/m8fd-ahd9.json")
+TAMANO_PAGINA = 50000
+# Filas que el lector de CSV convierte de una vez; solo ese bloque existe como texto en memoria
+TAMANO_BLOQUE = 10000
+HILOS_DESCARGA = 4
+TIEMPO_ESPERA = 120
+
+posibles_fechas = ["fecha_hecho", "fecha", "fecha_del_hecho"]
+
+# Esquema de tipos del DataFrame compacto
+# Año, mes y dia caben en enteros pequeños y los textos con pocos valores distintos
+# (departamento, municipio, armas_medios, genero...) se guardan como category
+tipos_fecha = {"anio": "int16", "mes": "int8", "dia": "int8"}
+PROPORCION_CATEGORIA = 0.5
+
+
+# Se cuenta cuantos registros hay en la api para saber cuantas paginas pedir
+def contar_registros(where=None, sesion=None):
+    params = {"$select": "count(*)"}
+    if where:
+        params["$where"] = where
+
+    cliente = sesion or requests
+    response = cliente.get(URL, params=params, timeout=TIEMPO_ESPERA)
+    response.raise_for_status()
+    respuesta = response.json()
+    return int(next(iter(respuesta[0].values()))) if respuesta else 0
+
+
+# La misma consulta de socrata tambien se puede pedir en CSV cambiando la extension del recurso
+def url_csv():
+    return URL[:-len(".json")] + ".csv" if URL.endswith(".json") else URL
+
+
+# Las columnas de texto se leen directo como category (cada fila guarda solo un codigo)
+# y la fecha como texto para convertirla a datetime en cada bloque
+tipos_csv = defaultdict(lambda: "category", {c: "str" for c in posibles_fechas})
+
+
+# Cada bloque del CSV queda con la fecha ya tipada
+def tipar_pagina(df):
+    if df.empty:
+        return df
+
+    col_fecha = next((c for c in posibles_fechas if c in df.columns), None)
+    if col_fecha is None:
+        raise Exception("(-) No se encontró columna de fecha en el dataset")
+
+    df = df.rename(columns={col_fecha: "fecha_hecho"})
+    df["fecha_hecho"] = pd.to_datetime(df["fecha_hecho"], errors="coerce")
+    # Las mayusculas y tildes del departamento se unifican despues, una vez por categoria (normalizar_departamentos)
+    return df
+
+
+# Los bloques y las paginas traen categorias distintas; se igualan antes de unirlos
+# para que concat no convierta las columnas category otra vez en texto
+def unir_paginas(paginas):
+    paginas = [p for p in paginas if not p.empty]
+    if not paginas:
+        return pd.DataFrame()
+
+    columnas = list(dict.fromkeys(c for p in paginas for c in p.columns))
+    for columna in columnas:
+        series = [p[columna] for p in paginas if columna in p.columns]
+        if all(isinstance(s.dtype, pd.CategoricalDtype) for s in series):
+            tipo = pd.CategoricalDtype(sorted(set().union(*(s.cat.categories for s in series))))
+            for p in paginas:
+                if columna in p.columns:
+                    p[columna] = p[columna].astype(tipo)
+    return pd.concat(paginas, ignore_index=True)
+
+
+# Se descarga una sola pagina ordenada por el id interno de socrata
+# La respuesta se lee mientras llega (stream) en bloques de TAMANO_BLOQUE filas
+def descargar_pagina(offset, limite, where=None, sesion=None):
+    params = {"$limit": limite, "$offset": offset, "$order": ":id"}
+    if where:
+        params["$where"] = where
+
+    cliente = sesion or requests
+    with cliente.get(url_csv(), params=params, timeout=TIEMPO_ESPERA, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        try:
+            bloques = [
+                tipar_pagina(bloque)
+                for bloque in pd.read_csv(response.raw, dtype=tipos_csv, chunksize=TAMANO_BLOQUE)
+            ]
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame()
+    return unir_paginas(bloques)
+
+
+# Se agregan las columnas de año, mes y dia y se eliminan registros invalidos
+def limpiar_homicidios(df):
+    if "fecha_hecho" not in df.columns:
+        raise Exception("(-) No se encontraron columnas en la informacion")
+
+    df["anio"] = df["fecha_hecho"].dt.year
+    df["mes"] = df["fecha_hecho"].dt.month
+    df["dia"] = df["fecha_hecho"].dt.day
+
+    df = df.dropna(subset=["anio", "mes", "dia", "departamento"])
+    return compactar_homicidios(df.reset_index(drop=True))
+
+
+def memoria_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+# Se aplica el esquema de tipos y se informa cuanta memoria usa el DataFrame antes y despues
+# Con category cada fila guarda solo un codigo entero y los filtros == comparan codigos, no textos
+def compactar_homicidios(df):
+    antes = memoria_mb(df)
+
+    df = df.astype({c: t for c, t in tipos_fecha.items() if c in df.columns})
+    for columna in df.columns:
+        serie = df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+            if serie.nunique() <= PROPORCION_CATEGORIA * len(serie):
+                df[columna] = serie.astype("category")
+
+    # Una sola escritura por departamento (BOGOTA D.C., NARIÑO...) para que coincida con la tabla de referencia
+    if "departamento" in df.columns:
+        df["departamento"] = normalizar_departamentos(df["departamento"])
+
+    print(f"(+) Memoria del DataFrame: {antes:.1f} MB -> {memoria_mb(df):.1f} MB")
+    return df
+
+
+# TOTALES POR DEPARTAMENTO Y AÑO
+# Las paginas anuales solo muestran conteos, asi que la api puede agruparlos ($group)
+# y la respuesta pesa kilobytes en vez de traer todos los registros
+
+# Totales de un DataFrame ya limpio, agrupados en local
+def totales_anuales(df):
+    return df.groupby(["departamento", "anio"], observed=True).size().reset_index(name="cantidad")
+
+
+# Se tipan los totales y se vuelven a sumar por si dos escrituras del mismo departamento se unificaron
+def tipar_totales(registros):
+    df = pd.DataFrame(registros, columns=["departamento", "anio", "cantidad"]).dropna()
+    df["departamento"] = normalizar_departamentos(df["departamento"].str.upper())
+    df["anio"] = pd.to_numeric(df["anio"]).astype(tipos_fecha["anio"])
+    df["cantidad"] = pd.to_numeric(df["cantidad"]).astype("int64")
+    return df.groupby(["departamento", "anio"], observed=True)["cantidad"].sum().reset_index()
+
+
+# Se piden a la api los totales ya agrupados por departamento y año
+def descargar_totales_anuales(where=None, sesion=None):
+    params = {
+        "$select": "departamento, date_extract_y(fecha_hecho) AS anio, count(*) AS cantidad",
+        "$group": "departamento, date_extract_y(fecha_hecho)",
+        "$limit": TAMANO_PAGINA
+    }
+    if where:
+        params["$where"] = where
+
+    cliente = sesion or requests
+    response = cliente.get(URL, params=params, timeout=TIEMPO_ESPERA)
+    response.raise_for_status()
+    return tipar_totales(response.json())
+
+
+# Funcion principal: descarga todas las paginas (en paralelo si hilos > 1)
+def cargar_homicidios(limite=None, where=None, tamano_pagina=TAMANO_PAGINA, hilos=HILOS_DESCARGA):
+    with requests.Session() as sesion:
+        total = contar_registros(where, sesion)
+        if limite is not None:
+            total = min(total, limite)
+
+        offsets = list(range(0, total, tamano_pagina))
+        print(f"(+) Descargando {total} registros en {len(offsets)} paginas")
+
+        def bajar(offset):
+            return descargar_pagina(offset, min(tamano_pagina, total - offset), where, sesion)
+
+        if hilos > 1 and len(offsets) > 1:
+            with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+                paginas = list(ejecutor.map(bajar, offsets))
+        else:
+            paginas = [bajar(o) for o in offsets]
+
+    df = unir_paginas(paginas)
+    del paginas
+    if df.empty:
+        df = pd.DataFrame({
+            "fecha_hecho": pd.Series(dtype="datetime64[ns]"),
+            "departamento": pd.Series(dtype=object)
+        })
+    return limpiar_homicidios(df)
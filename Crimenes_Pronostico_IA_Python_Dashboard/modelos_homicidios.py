@@ -0,0 +1,162 @@
+# MODULO DE REGISTRO DE MODELOS RANDOM FOREST PARA EL PRONOSTICO MENSUAL
+# CADA MODELO DEPENDE SOLO DE (MES, DEPARTAMENTO, VERSION DE LOS DATOS)
+# SE ENTRENA UNA SOLA VEZ CON TODOS LOS NUCLEOS Y SE GUARDA EN DISCO CON JOBLIB
+# AL GUARDAR EL MODELO DE UNA VERSION NUEVA SE BORRAN LOS ARCHIVOS DE LAS VERSIONES ANTERIORES
+# SI EL BACKTESTING ELIGIO UN MODELO SIMPLE O EL ESTACIONAL PARA (MES, DEPARTAMENTO) NO SE ENTRENA EL BOSQUE
+
+import os
+import re
+import threading
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from snapshot_homicidios import CARPETA_DATOS
+from metricas_dashboard import etapa, contar_cache
+from pronostico_homicidios import predecir_modelos
+
+CARPETA_MODELOS = os.path.join(CARPETA_DATOS, "modelos")
+ANIO_PRONOSTICO = 2026
+ARBOLES_POR_PASO = 10
+ARBOLES_BOSQUE = 100
+
+# Modelos ya entrenados en memoria y un candado por llave para no entrenar dos veces lo mismo
+modelos_en_memoria = {}
+candados = {}
+candado_registro = threading.Lock()
+
+
+# Se arma el dataset de entrenamiento: una fila por (año, dia) con su cantidad de homicidios
+def datos_entrenamiento(cubo, mes, departamento):
+    if departamento not in cubo["pos_departamento"]:
+        return pd.DataFrame({"anio": [], "dia": []}), np.array([])
+
+    conteos = cubo["conteos"][:, mes - 1, :, cubo["pos_departamento"][departamento]]
+    i_anio, i_dia = np.nonzero(conteos)
+    X = pd.DataFrame({"anio": np.array(cubo["anios"])[i_anio], "dia": i_dia + 1})
+    y = conteos[i_anio, i_dia]
+    return X, y
+
+
+# Mismos parametros en el dashboard y en el backtesting
+def nuevo_bosque(n_jobs=-1, arboles=ARBOLES_BOSQUE):
+    return RandomForestRegressor(n_estimators=arboles, random_state=42, n_jobs=n_jobs)
+
+
+# Con progreso el bosque se entrena por partes con warm_start y se avisa cuantos arboles van
+# sklearn avanza la semilla igual que en un solo fit, asi el modelo final es el mismo
+def ajustar_bosque(modelo, X, y, progreso=None):
+    if progreso is None:
+        return modelo.fit(X, y)
+
+    total = modelo.n_estimators
+    modelo.set_params(warm_start=True)
+    for arboles in list(range(ARBOLES_POR_PASO, total, ARBOLES_POR_PASO)) + [total]:
+        modelo.set_params(n_estimators=arboles)
+        modelo.fit(X, y)
+        progreso(arboles, total)
+    modelo.set_params(warm_start=False)
+    return modelo
+
+
+# Pronostico de los dias del mes que tienen historia en X
+def predecir_dias(modelo, X, anio_objetivo=ANIO_PRONOSTICO):
+    dias_mes = sorted(X["dia"].unique())
+    X_pred = pd.DataFrame({"anio": anio_objetivo, "dia": dias_mes})
+    return dias_mes, np.round(modelo.predict(X_pred)).astype(int)
+
+
+def ruta_modelo(mes, departamento, version):
+    nombre = re.sub(r"\W+", "_", departamento).strip("_")
+    return os.path.join(CARPETA_MODELOS, f"rf_{version}_{mes:02d}_{nombre}.joblib")
+
+
+# Cada actualizacion de los datos trae una version nueva y con ella archivos nuevos de modelos
+# Al guardar el modelo de una version se borran los del mismo (mes, departamento) de las otras versiones,
+# asi la carpeta no crece con cada actualizacion (la version no tiene "_", el resto del nombre es igual)
+def borrar_versiones_viejas(mes, departamento, version):
+    actual = os.path.basename(ruta_modelo(mes, departamento, version))
+    sufijo = actual[len(f"rf_{version}"):]
+    for archivo in os.listdir(CARPETA_MODELOS):
+        otra_version = archivo[len("rf_"): -len(sufijo)]
+        if archivo != actual and archivo.startswith("rf_") and archivo.endswith(sufijo) and "_" not in otra_version:
+            try:
+                os.remove(os.path.join(CARPETA_MODELOS, archivo))
+            except FileNotFoundError:
+                # Otro worker ya lo borro
+                pass
+
+
+# Se busca el modelo en memoria, luego en disco y solo si no existe se entrena
+# progreso(arboles, total) se llama mientras se entrena (lo usan los callback en segundo plano)
+def obtener_modelo(cubo, mes, departamento, version, progreso=None):
+    llave = (mes, departamento, version)
+    if llave in modelos_en_memoria:
+        contar_cache("modelos", True)
+        return modelos_en_memoria[llave]
+    contar_cache("modelos", False)
+
+    with candado_registro:
+        candado = candados.setdefault(llave, threading.Lock())
+
+    with candado:
+        if llave in modelos_en_memoria:
+            return modelos_en_memoria[llave]
+
+        ruta = ruta_modelo(mes, departamento, version)
+        if os.path.exists(ruta):
+            modelo = joblib.load(ruta)
+        else:
+            X, y = datos_entrenamiento(cubo, mes, departamento)
+            if X.empty:
+                modelo = None
+            else:
+                modelo = nuevo_bosque()
+                with etapa("ajustar_modelo"):
+                    ajustar_bosque(modelo, X, y, progreso)
+                os.makedirs(CARPETA_MODELOS, exist_ok=True)
+                # Se escribe aparte y se renombra, asi otro worker nunca carga un modelo a medio guardar
+                ruta_temporal = f"{ruta}.{os.getpid()}.tmp"
+                joblib.dump(modelo, ruta_temporal)
+                os.replace(ruta_temporal, ruta)
+                borrar_versiones_viejas(mes, departamento, version)
+
+        # En memoria solo quedan los modelos (y los candados) de la version actual de los datos
+        for vieja in [k for k in list(modelos_en_memoria) if k[2] != version]:
+            modelos_en_memoria.pop(vieja, None)
+        with candado_registro:
+            for vieja in [k for k in list(candados) if k[2] != version]:
+                candados.pop(vieja, None)
+        modelos_en_memoria[llave] = modelo
+        return modelo
+
+
+# Pronostico de cada dia del mes que tiene historia para el departamento
+# modelo es "random_forest", uno de los modelos de serie de pronostico_homicidios o "estacional"
+def pronostico_mensual(cubo, mes, departamento, version, anio_objetivo=ANIO_PRONOSTICO, modelo="random_forest", ultimo_anio=None, progreso=None, estacional=None):
+    if modelo != "random_forest":
+        return pronostico_mensual_serie(cubo, mes, departamento, modelo, anio_objetivo, ultimo_anio, estacional)
+
+    bosque = obtener_modelo(cubo, mes, departamento, version, progreso)
+    if bosque is None:
+        return pd.DataFrame({"Día": [], "Pronóstico": []})
+
+    X, _ = datos_entrenamiento(cubo, mes, departamento)
+    dias_mes, y_pred = predecir_dias(bosque, X, anio_objetivo)
+    return pd.DataFrame({"Día": dias_mes, "Pronóstico": y_pred})
+
+
+# Los mismos dias, pero cada uno con su serie de años y un modelo simple
+# estacional trae el pronostico de los 31 dias del mes segun las series diarias (modelo estacional)
+def pronostico_mensual_serie(cubo, mes, departamento, modelo, anio_objetivo=ANIO_PRONOSTICO, ultimo_anio=None, estacional=None):
+    X, _ = datos_entrenamiento(cubo, mes, departamento)
+    if X.empty:
+        return pd.DataFrame({"Día": [], "Pronóstico": []})
+
+    dias_mes = sorted(X["dia"].unique())
+    indices = np.array(dias_mes) - 1
+    serie = cubo["conteos"][:, mes - 1, indices, cubo["pos_departamento"][departamento]].T
+    modelos = np.full(len(dias_mes), modelo, dtype=object)
+    estacional = None if estacional is None else np.asarray(estacional)[indices]
+    prediccion = predecir_modelos(modelos, cubo["anios"], serie, anio_objetivo, serie.sum(axis=1), ultimo_anio, estacional)
+    return pd.DataFrame({"Día": dias_mes, "Pronóstico": np.maximum(np.rint(prediccion), 0).astype(int)})
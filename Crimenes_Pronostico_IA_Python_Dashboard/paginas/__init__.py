@@ -0,0 +1,4 @@
+# PAGINAS DEL DASHBOARD DE HOMICIDIOS
+# CADA MODULO ES UNO DE LOS DASHBOARDS NUMERADOS, CON SU layout Y SUS CALLBACK
+# LOS CALLBACK SE REGISTRAN CON dash.callback PARA QUE SIRVAN EN LA APP MULTIPAGINA
+# Y TAMBIEN EN EL SCRIPT NUMERADO QUE LA EJECUTA SOLA
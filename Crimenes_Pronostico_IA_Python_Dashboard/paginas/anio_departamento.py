@@ -0,0 +1,136 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR DEPARTAMENTO AÑO
+# PAGINA DEL SCRIPT 00_00
+
+from dash import dcc, html, dash_table, ctx, callback
+from dash.dependencies import Input, Output
+from datetime import datetime
+from datos_homicidios import obtener_totales, conteo_anual, tabla_anual
+from tabla_homicidios import columnas_tabla, pagina_tabla
+from metricas_dashboard import medir_callback, cronometro
+from figuras_homicidios import figura_base, barras_base, parche_barras_departamentos
+
+NOMBRE = "Homicidios por año y departamento"
+RUTA = "/anio-departamento"
+
+# Layout fijo de la grafica; los callback solo cambian las barras y el titulo
+def figura_barras():
+    return barras_base(
+        title="Homicidios por departamento",
+        xaxis_title="Departamento",
+        yaxis_title="Cantidad de homicidios",
+        template="plotly_dark",
+        xaxis_tickangle=-45,
+        font_color="red",
+        plot_bgcolor="black",
+        paper_bgcolor="black"
+    )
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos_totales = obtener_totales()
+    anios_disponibles = datos_totales["anios"]
+
+    return html.Div(
+        style={"width": "95%", "margin": "auto", "backgroundColor": "black", "color": "red", "minHeight": "100vh", "padding": "20px"},
+        children=[
+            html.H1(
+                "Homicidios en Colombia (filtrado por año de fecha_hecho)",
+                style={"textAlign": "center"}
+            ),
+            html.H4(
+                f"Fecha de hoy: {datetime.now().strftime('%d-%m-%Y')}",
+                style={"textAlign": "center", "color": "red"}
+            ),
+            html.P(f"Version de los datos: {datos_totales['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            html.Label("Seleccione el año (fecha_hecho):", style={"color": "red"}),
+            dcc.Dropdown(
+                id="h0000-select-anio",
+                options=[{"label": str(a), "value": a} for a in anios_disponibles],
+                value=anios_disponibles[0],
+                clearable=False,
+                style={"color": "black"}  # Dropdown con letras negras
+            ),
+
+            html.Hr(style={"borderColor": "red"}),
+
+            html.H3("Tabla de homicidios del año seleccionado", style={"color": "red"}),
+            dash_table.DataTable(
+                id="h0000-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(tabla_anual(anios_disponibles[0])),
+                style_table={"overflowX": "auto"},
+                style_header={
+                    "backgroundColor": "red",
+                    "color": "black",
+                    "fontWeight": "bold",
+                    "textAlign": "center"
+                },
+                style_cell={
+                    "textAlign": "left",
+                    "fontFamily": "Arial",
+                    "fontSize": "12px",
+                    "backgroundColor": "gray",  # Fondo gris para datos
+                    "color": "black"            # Letras negras
+                }
+            ),
+
+            html.Hr(style={"borderColor": "red"}),
+
+            html.H3("Homicidios por departamento", style={"color": "red"}),
+            dcc.Graph(id="h0000-grafica-barras", figure=figura_base("h0000-grafica-barras", figura_barras))
+        ]
+    )
+
+# Callback de la tabla: solo se envia al navegador la pagina que se esta viendo
+@callback(
+    Output("h0000-tabla-homicidios", "data"),
+    Output("h0000-tabla-homicidios", "page_count"),
+    Output("h0000-tabla-homicidios", "page_current"),
+    Input("h0000-select-anio", "value"),
+    Input("h0000-tabla-homicidios", "page_current"),
+    Input("h0000-tabla-homicidios", "page_size"),
+    Input("h0000-tabla-homicidios", "sort_by"),
+    Input("h0000-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, pagina, tamano_pagina, orden, filtro):
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id == "h0000-select-anio":
+        pagina = 0
+    df_f = tabla_anual(anio)
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+# Con las siguientes lineas de codigo se crea los callback de respuesta
+@callback(
+    Output("h0000-grafica-barras", "figure"),
+    Input("h0000-select-anio", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio_seleccionado):
+    marcar = cronometro()
+    # Con este fragmento de codigo se crea la grafica con los totales del año
+    conteo_departamento = (
+        conteo_anual(anio_seleccionado)
+        .rename(columns={"cantidad": "cantidad_homicidios"})
+        .sort_values("cantidad_homicidios", ascending=False)
+    )
+    marcar("agregar")
+
+    # Cada barra con el color fijo de su departamento; solo viajan los arreglos y el titulo
+    fig = parche_barras_departamentos(
+        conteo_departamento,
+        "cantidad_homicidios",
+        titulo=f"Homicidios por departamento en {anio_seleccionado}"
+    )
+    marcar("figuras")
+
+    return fig
@@ -0,0 +1,182 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR DEPARTAMENTO AÑO
+# TAMBIEN HAY UN MAPA QUE MUESTRAN LOS DATOS POR AÑO
+# PAGINA DEL SCRIPT 00_01
+
+from dash import dcc, html, dash_table, ctx, callback
+from dash.dependencies import Input, Output
+import plotly.graph_objects as go
+from datetime import datetime
+from tabla_homicidios import columnas_tabla, pagina_tabla
+from datos_homicidios import obtener_totales, conteo_anual, tabla_anual
+from departamentos_homicidios import ubicar_departamentos
+from metricas_dashboard import medir_callback, cronometro
+from figuras_homicidios import figura_base, barras_base, mapa_base, parche_barras_departamentos, parche_mapa
+
+NOMBRE = "Mapa de homicidios por año"
+RUTA = "/anio-departamento-mapa"
+
+# Layout fijo de las dos graficas; los callback solo cambian los datos y el titulo
+def figura_barras():
+    return barras_base(
+        title="Homicidios por departamento",
+        xaxis_title="Departamento",
+        yaxis_title="Cantidad de homicidios",
+        template="plotly_dark",
+        xaxis_tickangle=-45,
+        font_color="red",
+        plot_bgcolor="black",
+        paper_bgcolor="black"
+    )
+
+def figura_mapa():
+    return mapa_base(
+        go.Scattergeo,
+        dict(
+            mode="markers+text",
+            textposition="bottom center",
+            marker=dict(size=[], color="red", line=dict(width=0.5, color="darkred")),
+            hoverinfo="text"
+        ),
+        geo=dict(
+            scope="south america",
+            showcountries=True,
+            countrycolor="white",
+            showland=True,
+            landcolor="rgb(243, 243, 243)",
+            showlakes=True,
+            lakecolor="lightblue",
+            projection_scale=6,
+            center=dict(lat=4.5, lon=-74),
+            bgcolor="black"
+        ),
+        template="plotly_dark",
+        font_color="red",
+        title="Homicidios por departamento",
+        height=800
+    )
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos_totales = obtener_totales()
+    anios_disponibles = datos_totales["anios"]
+
+    return html.Div(
+        style={"width": "95%", "margin": "auto", "backgroundColor": "black", "color": "red", "minHeight": "100vh", "padding": "20px"},
+        children=[
+            html.H1(
+                "Homicidios en Colombia (filtrado por año de fecha_hecho)",
+                style={"textAlign": "center"}
+            ),
+            html.H4(
+                f"Fecha de hoy: {datetime.now().strftime('%d-%m-%Y')}",
+                style={"textAlign": "center", "color": "red"}
+            ),
+            html.P(f"Version de los datos: {datos_totales['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            html.Label("Seleccione el año (fecha_hecho):", style={"color": "red"}),
+            dcc.Dropdown(
+                id="h0001-select-anio",
+                options=[{"label": str(a), "value": a} for a in anios_disponibles],
+                value=anios_disponibles[0],
+                clearable=False,
+                style={"color": "black"}
+            ),
+
+            html.Hr(style={"borderColor": "red"}),
+
+            html.H3("Tabla de homicidios del año seleccionado", style={"color": "red"}),
+            dash_table.DataTable(
+                id="h0001-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(tabla_anual(anios_disponibles[0])),
+                style_table={"overflowX": "auto"},
+                style_header={
+                    "backgroundColor": "red",
+                    "color": "black",
+                    "fontWeight": "bold",
+                    "textAlign": "center"
+                },
+                style_cell={
+                    "textAlign": "left",
+                    "fontFamily": "Arial",
+                    "fontSize": "12px",
+                    "backgroundColor": "gray",
+                    "color": "black"
+                }
+            ),
+
+            html.Hr(style={"borderColor": "red"}),
+
+            html.H3("Homicidios por departamento", style={"color": "red"}),
+            dcc.Graph(id="h0001-grafica-barras", figure=figura_base("h0001-grafica-barras", figura_barras)),
+
+            html.Hr(style={"borderColor": "red"}),
+
+            html.H3("Mapa de homicidios por departamento", style={"color": "red"}),
+            dcc.Graph(id="h0001-mapa-colombia", figure=figura_base("h0001-mapa-colombia", figura_mapa), style={"height": "800px"})
+        ]
+    )
+
+# Callback de la tabla: solo se envia al navegador la pagina que se esta viendo
+@callback(
+    Output("h0001-tabla-homicidios", "data"),
+    Output("h0001-tabla-homicidios", "page_count"),
+    Output("h0001-tabla-homicidios", "page_current"),
+    Input("h0001-select-anio", "value"),
+    Input("h0001-tabla-homicidios", "page_current"),
+    Input("h0001-tabla-homicidios", "page_size"),
+    Input("h0001-tabla-homicidios", "sort_by"),
+    Input("h0001-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, pagina, tamano_pagina, orden, filtro):
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id == "h0001-select-anio":
+        pagina = 0
+    df_f = tabla_anual(anio)
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+# Con el siguiente codigo se crea el dashboard
+@callback(
+    [
+        Output("h0001-grafica-barras", "figure"),
+        Output("h0001-mapa-colombia", "figure")
+    ],
+    Input("h0001-select-anio", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio_seleccionado):
+    marcar = cronometro()
+    # Procedemos a crear la grafica de barras con los totales del año
+    conteo_departamento = (
+        conteo_anual(anio_seleccionado)
+        .rename(columns={"cantidad": "cantidad_homicidios"})
+        .sort_values("cantidad_homicidios", ascending=False)
+    )
+    marcar("agregar")
+
+    titulo = f"Homicidios por departamento en {anio_seleccionado}"
+    fig_barras = parche_barras_departamentos(conteo_departamento, "cantidad_homicidios", titulo=titulo)
+
+    # El mapa colombiano indica donde hubo mas homicidios
+    total_homicidios = conteo_departamento["cantidad_homicidios"].sum()
+    puntos = ubicar_departamentos(conteo_departamento)
+    porcentaje = puntos["cantidad_homicidios"] / total_homicidios * 100
+    fig_mapa = parche_mapa(
+        puntos["lon"],
+        puntos["lat"],
+        puntos["departamento"].astype(str) + "<br>" + puntos["cantidad_homicidios"].astype(str),
+        porcentaje * 5 + 5,  # escala visual
+        titulo
+    )
+    marcar("figuras")
+
+    return fig_barras, fig_mapa
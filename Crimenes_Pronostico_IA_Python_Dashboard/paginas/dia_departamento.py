@@ -0,0 +1,187 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# CON INTELIGENCIA ARTIFICIAL, MACHINE LEARNING Y REGRESION LINEAL
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR DIA, MES, AÑO Y DEPARTAMENTO
+# TAMBIEN HAY UN MAPA QUE MUESTRAN LOS DATOS POR DIA
+# PAGINA DEL SCRIPT 01_00
+
+from dash import dcc, html, dash_table, ctx, callback, clientside_callback, ClientsideFunction
+from dash.dependencies import Input, Output, State
+import plotly.graph_objects as go
+from datetime import datetime
+from cubo_homicidios import conteo_por_departamento
+from tabla_homicidios import filas_indice, columnas_tabla, pagina_tabla
+from datos_homicidios import obtener_datos, indice_tabla
+from departamentos_homicidios import ubicar_departamentos
+from metricas_dashboard import medir_callback, cronometro
+from figuras_homicidios import figura_base, barras_base, mapa_base, parche_barras_departamentos, parche_mapa
+
+NOMBRE = "Homicidios por día"
+RUTA = "/dia-departamento"
+
+# Layout fijo de las dos graficas; los callback solo cambian los datos
+def figura_barras():
+    return barras_base(
+        title="Homicidios por Departamento",
+        template="plotly_dark",
+        xaxis_tickangle=-45
+    )
+
+def figura_mapa():
+    return mapa_base(
+        go.Scattermapbox,
+        dict(mode="markers+text", marker=dict(size=[], color="red")),
+        mapbox_style="open-street-map",
+        mapbox_zoom=4.5,
+        mapbox_center={"lat": 4.5, "lon": -74},
+        template="plotly_dark"
+    )
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos = obtener_datos()
+    df = datos["df"]
+    anios_disponibles = datos["anios"]
+    fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+    return html.Div(
+        style={
+            "width": "95%",
+            "margin": "auto",
+            "backgroundColor": "black",
+            "color": "red",
+            "padding": "15px"
+        },
+        children=[
+            html.H1("Homicidios en Colombia (Filtros por Fecha)", style={"textAlign": "center"}),
+            html.H4(f"Fecha y hora actual: {fecha_actual}", style={"textAlign": "center"}),
+            html.P(f"Version de los datos: {datos['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            html.Label("Seleccione el año:"),
+            dcc.Dropdown(
+                id="h0100-select-anio",
+                options=[{"label": str(a), "value": a} for a in anios_disponibles],
+                value=anios_disponibles[0],
+                clearable=False
+            ),
+
+            html.Label("Seleccione el mes:"),
+            dcc.Dropdown(id="h0100-select-mes", clearable=False),
+
+            html.Label("Seleccione el día:"),
+            dcc.Dropdown(id="h0100-select-dia", clearable=False),
+
+            # Fechas con registros para los dropdown en cascada, se envian una sola vez
+            dcc.Store(id="h0100-arbol-fechas", data=datos["arbol_fechas"]),
+
+            html.Hr(),
+
+            html.H3("Tabla de homicidios filtrada"),
+            dash_table.DataTable(
+                id="h0100-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(df),
+                style_table={"overflowX": "auto"},
+                style_header={
+                    "backgroundColor": "red",
+                    "color": "black",   # 👈 CAMBIO APLICADO
+                    "fontWeight": "bold"
+                },
+                style_cell={
+                    "backgroundColor": "lightgray",
+                    "color": "black",
+                    "textAlign": "left",
+                    "fontFamily": "Arial",
+                    "fontSize": "12px"
+                }
+            ),
+
+            html.Hr(),
+
+            html.H3("Homicidios por departamento"),
+            dcc.Graph(id="h0100-grafica-barras", figure=figura_base("h0100-grafica-barras", figura_barras)),
+
+            html.Hr(),
+
+            html.H3("Mapa de homicidios por departamento"),
+            dcc.Graph(id="h0100-mapa-colombia", figure=figura_base("h0100-mapa-colombia", figura_mapa))
+        ]
+    )
+
+# Luego se crean los callback
+# Los dropdown de mes y dia se llenan en el navegador con el arbol de fechas del dcc.Store
+# (funciones en assets/fechas_homicidios.js), asi cambiar un filtro no ocupa al servidor
+clientside_callback(
+    ClientsideFunction(namespace="homicidios", function_name="meses_del_anio"),
+    Output("h0100-select-mes", "options"),
+    Output("h0100-select-mes", "value"),
+    Input("h0100-select-anio", "value"),
+    State("h0100-arbol-fechas", "data")
+)
+
+clientside_callback(
+    ClientsideFunction(namespace="homicidios", function_name="dias_del_mes"),
+    Output("h0100-select-dia", "options"),
+    Output("h0100-select-dia", "value"),
+    Input("h0100-select-anio", "value"),
+    Input("h0100-select-mes", "value"),
+    State("h0100-arbol-fechas", "data")
+)
+
+# Callback de la tabla: solo se envia al navegador la pagina que se esta viendo
+@callback(
+    Output("h0100-tabla-homicidios", "data"),
+    Output("h0100-tabla-homicidios", "page_count"),
+    Output("h0100-tabla-homicidios", "page_current"),
+    Input("h0100-select-anio", "value"),
+    Input("h0100-select-mes", "value"),
+    Input("h0100-select-dia", "value"),
+    Input("h0100-tabla-homicidios", "page_current"),
+    Input("h0100-tabla-homicidios", "page_size"),
+    Input("h0100-tabla-homicidios", "sort_by"),
+    Input("h0100-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, mes, dia, pagina, tamano_pagina, orden, filtro):
+    datos = obtener_datos()
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id in ("h0100-select-anio", "h0100-select-mes", "h0100-select-dia"):
+        pagina = 0
+    df_f = filas_indice(datos["df"], indice_tabla(datos, ["anio", "mes", "dia"]), (anio, mes, dia))
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+@callback(
+    Output("h0100-grafica-barras", "figure"),
+    Output("h0100-mapa-colombia", "figure"),
+    Input("h0100-select-anio", "value"),
+    Input("h0100-select-mes", "value"),
+    Input("h0100-select-dia", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio, mes, dia):
+    marcar = cronometro()
+    datos = obtener_datos()
+    conteo = conteo_por_departamento(datos["cubo"], anio, mes, dia)
+    marcar("agregar")
+
+    fig_barras = parche_barras_departamentos(conteo)
+
+    # Ubicacion, texto y tamaño de todos los puntos en una sola operacion
+    max_val = conteo["cantidad"].max() if not conteo.empty else 1
+    puntos = ubicar_departamentos(conteo)
+
+    fig_mapa = parche_mapa(
+        puntos["lon"],
+        puntos["lat"],
+        puntos["departamento"].astype(str) + "<br>" + puntos["cantidad"].astype(str),
+        8 + puntos["cantidad"] / max_val * 32
+    )
+    marcar("figuras")
+
+    return fig_barras, fig_mapa
@@ -0,0 +1,205 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# CON INTELIGENCIA ARTIFICIAL, MACHINE LEARNING Y REGRESION LINEAL
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR AÑO, MES Y DEPARTAMENTO
+# TAMBIEN HAY UN MAPA QUE MUESTRAN LOS DATOS POR AÑO
+# PAGINA DEL SCRIPT 00_02
+
+from dash import dcc, html, dash_table, ctx, callback
+from dash.dependencies import Input, Output
+import plotly.graph_objects as go
+from datetime import datetime
+from functools import lru_cache
+from pronostico_homicidios import pronostico_anual, ANIO_PRONOSTICO
+from tabla_homicidios import columnas_tabla, pagina_tabla
+from datos_homicidios import obtener_totales, conteo_anual, tabla_anual, al_actualizar_datos, SOLO_TOTALES
+from series_homicidios import obtener_capa, totales_anio
+from departamentos_homicidios import ubicar_departamentos
+from backtesting_homicidios import cargar_backtesting, id_backtesting, modelos_anuales, ultimo_anio_cerrado, resumen_backtesting
+from metricas_dashboard import medir_callback, cronometro, registrar_cache
+from serializacion_dashboard import registros
+from figuras_homicidios import figura_base, barras_base, mapa_base, parche_barras_departamentos, parche_mapa
+
+NOMBRE = "Pronostico anual con IA"
+RUTA = "/ia-anio-departamento-mapa"
+
+# Se calcula pronostico 2026 con regresion lineal para todos los departamentos a la vez
+# con el motor de tendencias compartido, e intervalo de confianza del 95%
+# Si hay backtesting, cada departamento usa el modelo que mejor acerto en los años pasados
+# El modelo estacional suma el pronostico diario del año; con SOLO_TOTALES no hay series diarias
+# Se guarda por version de los datos y del backtesting para no recalcularlo en cada visita
+@lru_cache(maxsize=1)
+def calcular_predicciones_2026(version, backtesting):
+    resultados = cargar_backtesting()
+    predicciones = pronostico_anual(
+        obtener_totales()["totales"],
+        ANIO_PRONOSTICO,
+        modelos=modelos_anuales(resultados),
+        ultimo_anio=ultimo_anio_cerrado(resultados),
+        estacional=None if SOLO_TOTALES else totales_anio(obtener_capa(), ANIO_PRONOSTICO)
+    )
+    return predicciones.rename(columns={"pronostico": "homicidios_estimados_2026"}).sort_values(
+        "homicidios_estimados_2026", ascending=False
+    )
+
+# Con datos nuevos el pronostico anterior ya no sirve
+al_actualizar_datos(calcular_predicciones_2026.cache_clear)
+registrar_cache("predicciones_2026", calcular_predicciones_2026)
+
+# Layout fijo de las dos graficas; los callback solo cambian los datos y el titulo
+def figura_barras():
+    return barras_base(
+        texto_dentro=True,
+        title="Homicidios por departamento",
+        template="plotly_dark",
+        font=dict(color="red"),
+        plot_bgcolor="black",
+        paper_bgcolor="black"
+    )
+
+def figura_mapa():
+    return mapa_base(
+        go.Scattermapbox,
+        dict(mode="markers+text", marker=dict(size=[], color="red")),
+        title="Mapa de homicidios por departamento",
+        mapbox_style="open-street-map",
+        mapbox_zoom=4.5,
+        mapbox_center={"lat": 4.5, "lon": -74},
+        paper_bgcolor="black",
+        font=dict(color="red")
+    )
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos_totales = obtener_totales()
+    anios_disponibles = datos_totales["anios"]
+    resultados = cargar_backtesting()
+    df_predicciones = calcular_predicciones_2026(datos_totales["version"], id_backtesting(resultados))
+    fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+    return html.Div(
+        style={
+            "backgroundColor": "black",
+            "color": "red",
+            "minHeight": "100vh",
+            "padding": "20px"
+        },
+        children=[
+            html.H1("Homicidios en Colombia", style={"textAlign": "center"}),
+            html.H4(f"Fecha y hora actual: {fecha_actual}", style={"textAlign": "center"}),
+            html.P(f"Version de los datos: {datos_totales['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            dcc.Dropdown(
+                id="h0002-select-anio",
+                options=[{"label": str(a), "value": a} for a in anios_disponibles],
+                value=anios_disponibles[0],
+                style={"color": "black"}
+            ),
+
+            html.H3("Registros detallados del año seleccionado"),
+            dash_table.DataTable(
+                id="h0002-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(tabla_anual(anios_disponibles[0])),
+                style_header={
+                    "backgroundColor": "red",
+                    "color": "black",
+                    "fontWeight": "bold"
+                },
+                style_data={
+                    "backgroundColor": "gray",
+                    "color": "black"
+                },
+                style_cell={
+                    "border": "1px solid black"
+                }
+            ),
+
+            html.H3("Total de homicidios por departamento"),
+            dcc.Graph(id="h0002-grafica-barras", figure=figura_base("h0002-grafica-barras", figura_barras)),
+
+            html.H3("Distribución geográfica de homicidios por departamento"),
+            dcc.Graph(id="h0002-mapa-colombia", figure=figura_base("h0002-mapa-colombia", figura_mapa), style={"height": "700px"}),
+
+            html.H2("Pronóstico total de homicidios por departamento para 2026"),
+            dash_table.DataTable(
+                data=registros(df_predicciones),
+                columns=[
+                    {"name": "Departamento", "id": "departamento"},
+                    {"name": "Homicidios estimados 2026", "id": "homicidios_estimados_2026"},
+                    {"name": "Límite inferior (95%)", "id": "limite_inferior"},
+                    {"name": "Límite superior (95%)", "id": "limite_superior"},
+                    {"name": "Modelo", "id": "modelo"}
+                ],
+                page_action="none",
+                style_table={"height": "600px", "overflowY": "auto"},
+                style_header={
+                    "backgroundColor": "red",
+                    "color": "black",
+                    "fontWeight": "bold"
+                },
+                style_data={
+                    "backgroundColor": "gray",
+                    "color": "black"
+                },
+                style_cell={
+                    "border": "1px solid black"
+                }
+            ),
+            html.P(resumen_backtesting(resultados, "anual"), style={"fontSize": "12px"})
+        ]
+    )
+
+# Callback de la tabla: solo se envia al navegador la pagina que se esta viendo
+@callback(
+    Output("h0002-tabla-homicidios", "data"),
+    Output("h0002-tabla-homicidios", "page_count"),
+    Output("h0002-tabla-homicidios", "page_current"),
+    Input("h0002-select-anio", "value"),
+    Input("h0002-tabla-homicidios", "page_current"),
+    Input("h0002-tabla-homicidios", "page_size"),
+    Input("h0002-tabla-homicidios", "sort_by"),
+    Input("h0002-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, pagina, tamano_pagina, orden, filtro):
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id == "h0002-select-anio":
+        pagina = 0
+    df_f = tabla_anual(anio)
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+# Se crean los callback
+@callback(
+    [
+        Output("h0002-grafica-barras", "figure"),
+        Output("h0002-mapa-colombia", "figure")
+    ],
+    Input("h0002-select-anio", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio):
+    marcar = cronometro()
+    conteo = conteo_anual(anio)
+    marcar("agregar")
+
+    fig_barras = parche_barras_departamentos(conteo, texto=True, titulo=f"Homicidios por departamento en {anio}")
+
+    max_val = conteo["cantidad"].max() if not conteo.empty else 1
+    puntos = ubicar_departamentos(conteo)
+
+    fig_mapa = parche_mapa(
+        puntos["lon"],
+        puntos["lat"],
+        puntos["departamento"].astype(str) + ": " + puntos["cantidad"].astype(str),
+        10 + puntos["cantidad"] / max_val * 30
+    )
+    marcar("figuras")
+
+    return fig_barras, fig_mapa
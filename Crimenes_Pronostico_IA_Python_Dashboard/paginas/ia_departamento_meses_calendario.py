@@ -0,0 +1,215 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# CON INTELIGENCIA ARTIFICIAL, MACHINE LEARNING Y REGRESION LINEAL
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR AÑO, MES Y DEPARTAMENTO
+# TAMBIEN HAY UN CALENDARIO CON LA INFORMACION DE LOS DATOS
+# PAGINA DEL SCRIPT 02_01
+
+import pandas as pd
+from dash import dcc, html, dash_table, ctx, callback
+from dash.dependencies import Input, Output
+from datetime import datetime
+from cubo_homicidios import meses_con_datos, conteo_por_dia, conteo_dias_mes
+from tabla_homicidios import filas_indice, columnas_tabla, pagina_tabla
+from calendario_homicidios import calendario_base, parche_calendario
+from datos_homicidios import obtener_datos, indice_tabla
+from backtesting_homicidios import cargar_backtesting, resumen_backtesting
+from tareas_homicidios import administrador_tareas, pronostico_mensual_en_tarea
+from metricas_dashboard import medir_callback, cronometro
+from figuras_homicidios import figura_base, barras_base, parche_barras, paleta
+
+NOMBRE = "Calendario mensual con IA"
+RUTA = "/ia-departamento-meses-calendario"
+
+# Layout fijo de la grafica de dias; el callback solo cambia los datos y el titulo
+def figura_barras():
+    return barras_base(
+        texto_dentro=True,
+        title="Homicidios por día",
+        xaxis_title="Día",
+        yaxis_title="Cantidad",
+        template="plotly_dark"
+    )
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos = obtener_datos()
+    df = datos["df"]
+    anios_disponibles = datos["anios"]
+    departamentos_disponibles = datos["departamentos"]
+    fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+    return html.Div(
+        style={
+            "width": "95%",
+            "margin": "auto",
+            "backgroundColor": "black",
+            "color": "red",
+            "padding": "15px"
+        },
+        children=[
+            html.H1("Homicidios en Colombia (Filtros por Fecha y Departamento)", style={"textAlign": "center"}),
+            html.H4(f"Fecha y hora actual: {fecha_actual}", style={"textAlign": "center"}),
+            html.P(f"Version de los datos: {datos['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            html.Label("Seleccione el año:"),
+            dcc.Dropdown(
+                id="h0201-select-anio",
+                options=[{"label": str(a), "value": a} for a in anios_disponibles],
+                value=anios_disponibles[0],
+                clearable=False
+            ),
+            html.Label("Seleccione el mes:"),
+            dcc.Dropdown(id="h0201-select-mes", clearable=False),
+            html.Label("Seleccione el departamento:"),
+            dcc.Dropdown(
+                id="h0201-select-departamento",
+                options=[{"label": d, "value": d} for d in departamentos_disponibles],
+                value=departamentos_disponibles[0],
+                clearable=False
+            ),
+
+            html.Hr(),
+            html.H3("Tabla de homicidios filtrada"),
+            dash_table.DataTable(
+                id="h0201-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(df),
+                style_table={"overflowX": "auto"},
+                style_header={"backgroundColor": "red", "color": "black"},
+                style_cell={"backgroundColor": "lightgray", "color": "black", "textAlign": "left"}
+            ),
+
+            html.Hr(),
+            html.H3("Homicidios por día"),
+            dcc.Graph(id="h0201-grafica-barras", figure=figura_base("h0201-grafica-barras", figura_barras)),
+
+            html.Hr(),
+            html.H3("Calendario de homicidios"),
+            dcc.Graph(id="h0201-calendario", figure=figura_base("h0201-calendario", calendario_base)),
+
+            html.Hr(),
+            html.H3("Pronóstico de homicidios para 2026"),
+            html.Div(id="h0201-tabla-pronosticos"),
+            html.Div(
+                id="h0201-avance-pronostico",
+                style={"display": "none"},
+                children=[
+                    html.Progress(id="h0201-barra-pronostico", value="0", max="1", style={"width": "100%"}),
+                    html.P(id="h0201-estado-pronostico", style={"fontSize": "12px"})
+                ]
+            ),
+            html.P(id="h0201-modelo-pronostico", style={"fontSize": "12px"}),
+            html.P(resumen_backtesting(cargar_backtesting(), "mensual"), style={"fontSize": "12px"})
+        ]
+    )
+
+# Posteriormente creamos los callback con los select
+@callback(
+    Output("h0201-select-mes", "options"),
+    Output("h0201-select-mes", "value"),
+    Input("h0201-select-anio", "value")
+)
+@medir_callback
+def actualizar_meses(anio):
+    datos = obtener_datos()
+    meses = meses_con_datos(datos["cubo"], anio)
+    return [{"label": m, "value": m} for m in meses], meses[0]
+
+# La tabla se pagina en el servidor: solo se envia la pagina que se esta viendo
+@callback(
+    Output("h0201-tabla-homicidios", "data"),
+    Output("h0201-tabla-homicidios", "page_count"),
+    Output("h0201-tabla-homicidios", "page_current"),
+    Input("h0201-select-anio", "value"),
+    Input("h0201-select-mes", "value"),
+    Input("h0201-select-departamento", "value"),
+    Input("h0201-tabla-homicidios", "page_current"),
+    Input("h0201-tabla-homicidios", "page_size"),
+    Input("h0201-tabla-homicidios", "sort_by"),
+    Input("h0201-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, mes, departamento, pagina, tamano_pagina, orden, filtro):
+    datos = obtener_datos()
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id in ("h0201-select-anio", "h0201-select-mes", "h0201-select-departamento"):
+        pagina = 0
+    df_f = filas_indice(datos["df"], indice_tabla(datos, ["anio", "mes", "departamento"]), (anio, mes, departamento))
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+@callback(
+    Output("h0201-grafica-barras", "figure"),
+    Output("h0201-calendario", "figure"),
+    Input("h0201-select-anio", "value"),
+    Input("h0201-select-mes", "value"),
+    Input("h0201-select-departamento", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio, mes, departamento):
+    marcar = cronometro()
+    datos = obtener_datos()
+    # La grafica de barras se crea con el siguiente codigo
+    conteo_dias = conteo_por_dia(datos["cubo"], anio, mes, departamento)
+    marcar("agregar")
+    fig_barras = parche_barras(
+        conteo_dias["dia"],
+        conteo_dias["cantidad"],
+        [paleta[i % len(paleta)] for i in range(len(conteo_dias))],
+        conteo_dias["cantidad"],
+        f"Homicidios en {departamento} - {mes}/{anio}"
+    )
+
+    # El calendario es un heatmap; los colores de todo el mes se calculan de una vez con numpy
+    fig_calendario = parche_calendario(anio, mes, conteo_dias_mes(datos["cubo"], anio, mes, departamento))
+    marcar("figuras")
+
+    return fig_barras, fig_calendario
+
+# El pronostico corre en segundo plano (tareas_homicidios): la grafica se muestra de inmediato
+# y la tabla llega cuando termina el modelo, con una barra de progreso mientras tanto
+# Solo depende del mes y el departamento; si cambia la seleccion Dash termina la tarea anterior
+@callback(
+    Output("h0201-tabla-pronosticos", "children"),
+    Output("h0201-modelo-pronostico", "children"),
+    Input("h0201-select-mes", "value"),
+    Input("h0201-select-departamento", "value"),
+    background=True,
+    manager=administrador_tareas,
+    running=[(Output("h0201-avance-pronostico", "style"), {"display": "block"}, {"display": "none"})],
+    progress=[
+        Output("h0201-barra-pronostico", "value"),
+        Output("h0201-barra-pronostico", "max"),
+        Output("h0201-estado-pronostico", "children")
+    ]
+)
+def actualizar_pronostico(set_progress, mes, departamento):
+    # Los siguientes codigos son para lograr el pronostico de la ultima tabla
+    # El modelo Random Forest sale del registro de modelos por (mes, departamento, version)
+    # Si hay backtesting se usa el modelo que mejor acerto para este mes y departamento
+    filas, modelo = pronostico_mensual_en_tarea(
+        lambda valor, maximo, texto: set_progress((str(valor), str(maximo), texto)), mes, departamento
+    )
+    df_forecast = pd.DataFrame(filas, columns=["Día", "Pronóstico"])
+    if df_forecast.empty:
+        tabla_forecast = html.Div("No hay datos históricos")
+    else:
+        dias_mes_hist = df_forecast["Día"]
+        y_pred = df_forecast["Pronóstico"]
+        # Tabla pronóstico
+        tabla_forecast = html.Table([
+            html.Thead(html.Tr([html.Th("Día"), html.Th("Pronóstico")], style={"backgroundColor":"red","color":"black"})),
+            html.Tbody([
+                html.Tr([html.Td(dia, style={"backgroundColor":"lightgray","color":"black"}),
+                         html.Td(pred, style={"backgroundColor":"lightgray","color":"black"})])
+                for dia, pred in zip(dias_mes_hist, y_pred)
+            ])
+        ], style={"width":"100%", "border":"1px solid white", "borderCollapse":"collapse"})
+
+    return tabla_forecast, f"Modelo del pronóstico: {modelo}"
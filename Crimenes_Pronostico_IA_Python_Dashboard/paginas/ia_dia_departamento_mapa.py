@@ -0,0 +1,277 @@
+# DASHBOARD DE HOMICIDIOS COLOMBIA POR DEPARTAMENTO
+# CON INTELIGENCIA ARTIFICIAL, MACHINE LEARNING Y REGRESION LINEAL
+# TAMBIEN HAY GRAFICAS DEL DASHBOARD FILTRADA POR AÑO, MES Y DEPARTAMENTO
+# TAMBIEN HAY UN MAPA QUE MUESTRAN LOS DATOS POR DIA
+# PAGINA DEL SCRIPT 01_01
+
+from dash import dcc, html, dash_table, ctx, callback, clientside_callback, ClientsideFunction
+from dash.dependencies import Input, Output, State
+import plotly.graph_objects as go
+from datetime import datetime
+from functools import lru_cache
+import os
+from snapshot_homicidios import CARPETA_DATOS
+from cubo_homicidios import conteo_por_departamento
+from pronostico_homicidios import pronostico_diario, iniciar_calentamiento, pronostico_calentado, ruta_calentamiento, ANIO_PRONOSTICO
+from tabla_homicidios import filas_indice, columnas_tabla, pagina_tabla
+from datos_homicidios import obtener_datos, indice_tabla, al_actualizar_datos
+from series_homicidios import obtener_capa, pronostico_anio
+from departamentos_homicidios import ubicar_departamentos
+from backtesting_homicidios import cargar_backtesting, id_backtesting, modelos_elegidos, ultimo_anio_cerrado, resumen_backtesting
+from metricas_dashboard import medir_callback, cronometro, contar_cache, registrar_cache
+from serializacion_dashboard import registros
+from figuras_homicidios import figura_base, barras_base, mapa_base, parche_barras_departamentos, parche_mapa
+
+NOMBRE = "Pronostico diario con IA"
+RUTA = "/ia-dia-departamento-mapa"
+
+# Layout fijo de las dos graficas; los callback solo cambian los datos
+def figura_barras():
+    return barras_base(
+        texto_dentro=True,
+        color_texto="white",
+        title="Cantidad de homicidios por departamento",
+        template="plotly_dark"
+    )
+
+def figura_mapa():
+    return mapa_base(
+        go.Scattermapbox,
+        dict(mode="markers", marker=dict(size=[], color="red")),
+        title="Distribución geográfica de homicidios en Colombia",
+        mapbox_style="open-street-map",
+        mapbox_zoom=4.5,
+        mapbox_center={"lat": 4.5, "lon": -74},
+        template="plotly_dark"
+    )
+
+# El pronostico 2026 solo depende del mes y el dia, no del año seleccionado
+# Se guarda en una cache LRU con la version de los datos y del backtesting en la llave,
+# asi una copia local nueva o un backtesting nuevo nunca reutilizan pronosticos viejos
+TAMANO_CACHE_PRONOSTICO = 128
+
+@lru_cache(maxsize=TAMANO_CACHE_PRONOSTICO)
+def pronostico_en_cache(mes, dia, version, backtesting):
+    datos = obtener_datos()
+    cubo = datos["cubo"]
+    resultados = cargar_backtesting()
+    modelos = modelos_elegidos(resultados, "diaria", cubo["departamentos"])[mes - 1, dia - 1]
+    estacional = pronostico_anio(obtener_capa(datos), ANIO_PRONOSTICO)[mes - 1, dia - 1]
+    return registros(pronostico_diario(
+        cubo, mes, dia, modelos=modelos, ultimo_anio=ultimo_anio_cerrado(resultados), estacional=estacional
+    ))
+
+registrar_cache("pronostico_diario", pronostico_en_cache)
+
+# Se vacia la cache cuando se cargan datos nuevos
+def invalidar_pronosticos():
+    pronostico_en_cache.cache_clear()
+
+# Modo opcional de arranque: con CALENTAR_PRONOSTICOS=1 se calculan en segundo plano
+# los pronosticos de todos los dias del año y se guardan en la carpeta de datos
+CALENTAR_PRONOSTICOS = os.environ.get("CALENTAR_PRONOSTICOS", "0") == "1"
+calentamiento = None
+
+# Lo llama el script que inicia el servidor, asi el calentamiento no arranca al importar la pagina
+# La tabla calentada queda marcada con la version de los datos y del backtesting con que se calculo
+def arrancar_calentamiento():
+    global calentamiento
+    datos = obtener_datos()
+    resultados = cargar_backtesting()
+    backtesting = id_backtesting(resultados)
+    estado = iniciar_calentamiento(
+        datos["cubo"],
+        ruta_calentamiento(CARPETA_DATOS, f"{datos['version']}-{backtesting}"),
+        modelos=modelos_elegidos(resultados, "diaria", datos["cubo"]["departamentos"]),
+        ultimo_anio=ultimo_anio_cerrado(resultados),
+        estacional=pronostico_anio(obtener_capa(datos), ANIO_PRONOSTICO)
+    )
+    estado["version"] = datos["version"]
+    estado["backtesting"] = backtesting
+    calentamiento = estado
+
+# Cuando el actualizador cambia la version se vacia la cache y se vuelve a calentar si estaba activo
+@al_actualizar_datos
+def reiniciar_pronosticos():
+    invalidar_pronosticos()
+    if calentamiento is not None:
+        arrancar_calentamiento()
+
+# ESTILOS TABLAS
+estilo_header = {
+    "backgroundColor": "red",
+    "color": "black",
+    "fontWeight": "bold",
+    "textAlign": "center"
+}
+
+estilo_celda = {
+    "backgroundColor": "lightgray",
+    "color": "black",
+    "textAlign": "left",
+    "fontSize": "12px"
+}
+
+# El layout se arma al visitar la pagina, asi los datos se cargan solo si se usa
+def layout(**kwargs):
+    datos = obtener_datos()
+    df = datos["df"]
+    anios_disponibles = datos["anios"]
+    fecha_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+    return html.Div(
+        style={"width": "95%", "margin": "auto", "backgroundColor": "black", "color": "red"},
+        children=[
+            html.H1("Homicidios en Colombia", style={"textAlign": "center"}),
+            html.H4(f"Fecha actual: {fecha_actual}", style={"textAlign": "center"}),
+            html.P(f"Version de los datos: {datos['version']}", style={"textAlign": "center", "fontSize": "12px"}),
+
+            html.Label("Año"),
+            dcc.Dropdown(id="h0101-select-anio",
+                         options=[{"label": a, "value": a} for a in anios_disponibles],
+                         value=anios_disponibles[0]),
+
+            html.Label("Mes"),
+            dcc.Dropdown(id="h0101-select-mes"),
+
+            html.Label("Día"),
+            dcc.Dropdown(id="h0101-select-dia"),
+
+            # Fechas con registros para los dropdown en cascada, se envian una sola vez
+            dcc.Store(id="h0101-arbol-fechas", data=datos["arbol_fechas"]),
+
+            html.H3("Registros de homicidios para la fecha seleccionada"),
+            dash_table.DataTable(
+                id="h0101-tabla-homicidios",
+                page_size=10,
+                page_current=0,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                columns=columnas_tabla(df),
+                style_header=estilo_header,
+                style_cell=estilo_celda,
+                style_table={"overflowX": "auto"}
+            ),
+
+            dcc.Graph(id="h0101-grafica-barras", figure=figura_base("h0101-grafica-barras", figura_barras)),
+            dcc.Graph(id="h0101-mapa-colombia", figure=figura_base("h0101-mapa-colombia", figura_mapa)),
+
+            html.H3(id="h0101-titulo-pronostico"),
+
+            dash_table.DataTable(
+                id="h0101-tabla-pronostico",
+                page_action="none",
+                style_header=estilo_header,
+                style_cell=estilo_celda,
+                style_table={"overflowX": "auto", "maxHeight": "600px", "overflowY": "auto"}
+            ),
+
+            html.P(id="h0101-estado-cache", style={"fontSize": "12px"}),
+            html.P(resumen_backtesting(cargar_backtesting(), "diaria"), style={"fontSize": "12px"})
+        ]
+    )
+
+# Se continua con la creacion de los callback
+# Los dropdown de mes y dia se llenan en el navegador con el arbol de fechas del dcc.Store
+# (funciones en assets/fechas_homicidios.js), asi cambiar un filtro no ocupa al servidor
+clientside_callback(
+    ClientsideFunction(namespace="homicidios", function_name="meses_del_anio"),
+    Output("h0101-select-mes", "options"),
+    Output("h0101-select-mes", "value"),
+    Input("h0101-select-anio", "value"),
+    State("h0101-arbol-fechas", "data")
+)
+
+clientside_callback(
+    ClientsideFunction(namespace="homicidios", function_name="dias_del_mes"),
+    Output("h0101-select-dia", "options"),
+    Output("h0101-select-dia", "value"),
+    Input("h0101-select-anio", "value"),
+    Input("h0101-select-mes", "value"),
+    State("h0101-arbol-fechas", "data")
+)
+
+# Callback de la tabla: solo se envia al navegador la pagina que se esta viendo
+@callback(
+    Output("h0101-tabla-homicidios", "data"),
+    Output("h0101-tabla-homicidios", "page_count"),
+    Output("h0101-tabla-homicidios", "page_current"),
+    Input("h0101-select-anio", "value"),
+    Input("h0101-select-mes", "value"),
+    Input("h0101-select-dia", "value"),
+    Input("h0101-tabla-homicidios", "page_current"),
+    Input("h0101-tabla-homicidios", "page_size"),
+    Input("h0101-tabla-homicidios", "sort_by"),
+    Input("h0101-tabla-homicidios", "filter_query")
+)
+@medir_callback
+def actualizar_tabla(anio, mes, dia, pagina, tamano_pagina, orden, filtro):
+    datos = obtener_datos()
+    # Si cambia un filtro de los dropdown se vuelve a la primera pagina
+    if ctx.triggered_id in ("h0101-select-anio", "h0101-select-mes", "h0101-select-dia"):
+        pagina = 0
+    df_f = filas_indice(datos["df"], indice_tabla(datos, ["anio", "mes", "dia"]), (anio, mes, dia))
+    return pagina_tabla(df_f, pagina, tamano_pagina, orden, filtro)
+
+# Callback main o principal
+@callback(
+    Output("h0101-grafica-barras", "figure"),
+    Output("h0101-mapa-colombia", "figure"),
+    Output("h0101-tabla-pronostico", "data"),
+    Output("h0101-tabla-pronostico", "columns"),
+    Output("h0101-titulo-pronostico", "children"),
+    Output("h0101-estado-cache", "children"),
+    Input("h0101-select-anio", "value"),
+    Input("h0101-select-mes", "value"),
+    Input("h0101-select-dia", "value")
+)
+@medir_callback
+def actualizar_dashboard(anio, mes, dia):
+    marcar = cronometro()
+    datos = obtener_datos()
+    conteo = conteo_por_departamento(datos["cubo"], anio, mes, dia)
+    marcar("agregar")
+
+    # GRÁFICA DE BARRAS CON COLORES Y VALORES DENTRO
+    fig_barras = parche_barras_departamentos(conteo, texto=True)
+
+    # MAPA
+    max_val = conteo["cantidad"].max() if not conteo.empty else 1
+    puntos = ubicar_departamentos(conteo)
+
+    fig_mapa = parche_mapa(
+        puntos["lon"],
+        puntos["lat"],
+        puntos["departamento"].astype(str) + ": " + puntos["cantidad"].astype(str),
+        10 + puntos["cantidad"] / max_val * 30
+    )
+    marcar("figuras")
+
+    # PRONÓSTICO
+    # Solo se recalcula si cambia el mes, el dia o la version de los datos
+    # Primero se busca en la tabla precalculada y si ese mes no esta listo se calcula al momento
+    backtesting = id_backtesting(cargar_backtesting())
+    estado = calentamiento if calentamiento and (calentamiento["version"], calentamiento["backtesting"]) == (datos["version"], backtesting) else None
+    pronostico_listo = pronostico_calentado(datos["cubo"], estado, mes, dia)
+    contar_cache("pronostico_calentado", pronostico_listo is not None)
+    if pronostico_listo is not None:
+        pronostico = registros(pronostico_listo)
+    else:
+        pronostico = pronostico_en_cache(mes, dia, datos["version"], backtesting)
+    marcar("pronosticar")
+    info = pronostico_en_cache.cache_info()
+    estado_cache = f"Cache de pronosticos: {info.hits} aciertos, {info.misses} fallos, {info.currsize}/{info.maxsize} entradas"
+
+    columnas_p = [
+        {"name": "Departamento", "id": "departamento"},
+        {"name": "Pronóstico de homicidios", "id": "pronostico"},
+        {"name": "Modelo", "id": "modelo"}
+    ]
+
+    titulo = f"Pronóstico de homicidios para el {dia}/{mes}/2026"
+
+    return fig_barras, fig_mapa, pronostico, columnas_p, titulo, estado_cache
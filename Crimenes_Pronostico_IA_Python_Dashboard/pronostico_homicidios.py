@@ -0,0 +1,263 @@
+# MODULO DE PRONOSTICO DE HOMICIDIOS CON REGRESION LINEAL
+# EN VEZ DE ENTRENAR UN LinearRegression POR DEPARTAMENTO, SE RESUELVEN TODAS
+# LAS REGRESIONES A LA VEZ CON MINIMOS CUADRADOS SOBRE UNA MATRIZ DEPARTAMENTOS x AÑOS
+# CADA SERIE PUEDE USAR OTRO MODELO SIMPLE SI EL BACKTESTING (backtesting_homicidios) LO ELIGIO COMO EL MEJOR
+# EL MODELO "estacional" NO SE AJUSTA AQUI: SUS VALORES LLEGAN YA CALCULADOS DESDE LAS SERIES DIARIAS (series_homicidios)
+
+import os
+import threading
+import numpy as np
+import pandas as pd
+from scipy import stats
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cubo_homicidios import serie_por_anio
+
+ANIO_PRONOSTICO = 2026
+NIVEL_CONFIANZA = 0.95
+
+
+# Se calcula pendiente e intercepto de cada fila de la matriz en una sola pasada
+# validos indica que años se usan en cada fila (si no se indica se usan todos)
+def ajustar_tendencias(anios, conteos, validos=None):
+    x = np.asarray(anios, dtype=float)
+    y = np.asarray(conteos, dtype=float)
+    w = np.ones_like(y) if validos is None else np.asarray(validos, dtype=float)
+
+    n = w.sum(axis=1)
+    n_seguro = np.where(n > 0, n, 1)
+    x_media = (w * x).sum(axis=1) / n_seguro
+    y_media = (w * y).sum(axis=1) / n_seguro
+
+    dx = (x - x_media[:, None]) * w
+    sxx = (dx * (x - x_media[:, None])).sum(axis=1)
+    sxy = (dx * (y - y_media[:, None])).sum(axis=1)
+
+    # Con un solo año la recta queda horizontal, igual que LinearRegression
+    pendiente = np.where(sxx > 0, sxy / np.where(sxx > 0, sxx, 1), 0.0)
+    intercepto = y_media - pendiente * x_media
+    return pendiente, intercepto
+
+
+# Se predice el año objetivo para todas las filas, redondeado y sin valores negativos
+def predecir_tendencias(anios, conteos, anio_objetivo=ANIO_PRONOSTICO, validos=None):
+    pendiente, intercepto = ajustar_tendencias(anios, conteos, validos)
+    prediccion = pendiente * anio_objetivo + intercepto
+    return np.maximum(np.rint(prediccion), 0).astype(int)
+
+
+# Intervalo de confianza de la recta en el año objetivo para todas las filas
+# Con menos de 3 años no se puede estimar el error de la recta y los limites quedan en NaN
+def intervalos_tendencias(anios, conteos, anio_objetivo=ANIO_PRONOSTICO, validos=None, nivel=NIVEL_CONFIANZA):
+    x = np.asarray(anios, dtype=float)
+    y = np.asarray(conteos, dtype=float)
+    w = np.ones_like(y) if validos is None else np.asarray(validos, dtype=float)
+    pendiente, intercepto = ajustar_tendencias(anios, conteos, validos)
+
+    n = w.sum(axis=1)
+    n_seguro = np.where(n > 0, n, 1)
+    x_media = (w * x).sum(axis=1) / n_seguro
+    sxx = (w * (x - x_media[:, None]) ** 2).sum(axis=1)
+
+    residuos = y - (pendiente[:, None] * x + intercepto[:, None])
+    libertad = n - 2
+    con_error = (libertad > 0) & (sxx > 0)
+    libertad_segura = np.where(con_error, libertad, 1)
+    varianza = (w * residuos ** 2).sum(axis=1) / libertad_segura
+    error = np.sqrt(varianza * (1 / n_seguro + (anio_objetivo - x_media) ** 2 / np.where(sxx > 0, sxx, 1)))
+    margen = stats.t.ppf((1 + nivel) / 2, libertad_segura) * error
+
+    centro = pendiente * anio_objetivo + intercepto
+    return np.where(con_error, centro - margen, np.nan), np.where(con_error, centro + margen, np.nan)
+
+
+# MODELOS DE SERIE
+# Ademas de la tendencia lineal hay modelos simples que en series cortas o con mucho ruido pueden acertar mas
+# Todos reciben una matriz series x años y devuelven el valor estimado de cada serie sin redondear
+MODELOS_SERIE = ("tendencia", "media", "media_3", "ultimo")
+
+
+# registros decide si una serie tiene historia suficiente para la tendencia (por defecto, los años con registros)
+def predecir_modelo(modelo, anios, conteos, anio_objetivo=ANIO_PRONOSTICO, registros=None):
+    y = np.asarray(conteos, dtype=float)
+    if modelo == "tendencia":
+        # Igual que el LinearRegression original: solo cuentan los años con registros
+        # y las series con menos de 2 registros quedan en 0
+        validos = y > 0
+        pendiente, intercepto = ajustar_tendencias(anios, y, validos)
+        minimo = validos.sum(axis=1) if registros is None else np.asarray(registros)
+        return np.where(minimo < 2, 0.0, pendiente * anio_objetivo + intercepto)
+    if modelo == "media":
+        return y.mean(axis=1)
+    if modelo == "media_3":
+        return y[:, -3:].mean(axis=1)
+    if modelo == "ultimo":
+        return y[:, -1]
+    raise ValueError(f"Modelo de serie desconocido: {modelo}")
+
+
+# Pronostico de cada serie con su propio modelo; modelos trae el nombre del modelo de cada fila
+# Los modelos simples solo usan los años cerrados (hasta ultimo_anio) para que un año a medias no los hunda
+# estacional trae el valor de cada fila segun la descomposicion de las series diarias
+def predecir_modelos(modelos, anios, conteos, anio_objetivo=ANIO_PRONOSTICO, registros=None, ultimo_anio=None, estacional=None):
+    modelos = np.asarray(modelos)
+    anios = np.asarray(anios)
+    conteos = np.asarray(conteos)
+    prediccion = np.zeros(len(modelos))
+    for modelo in np.unique(modelos):
+        filas = modelos == modelo
+        if modelo == "estacional":
+            if estacional is None:
+                raise ValueError("El modelo estacional necesita el pronostico de las series diarias (series_homicidios)")
+            prediccion[filas] = np.asarray(estacional, dtype=float).reshape(-1)[filas]
+            continue
+        columnas = np.ones(len(anios), dtype=bool)
+        if modelo != "tendencia" and ultimo_anio is not None and (anios <= ultimo_anio).any():
+            columnas = anios <= ultimo_anio
+        prediccion[filas] = predecir_modelo(
+            str(modelo),
+            anios[columnas],
+            conteos[filas][:, columnas],
+            anio_objetivo,
+            None if registros is None else np.asarray(registros)[filas]
+        )
+    return prediccion
+
+
+# Matriz departamentos x años a partir de una tabla de totales (departamento, anio, cantidad)
+def matriz_totales(totales):
+    matriz = totales.pivot_table(
+        index="departamento", columns="anio", values="cantidad", aggfunc="sum", fill_value=0, observed=True
+    )
+    return [str(d) for d in matriz.index], [int(a) for a in matriz.columns], matriz.to_numpy()
+
+
+# Pronostico anual de todos los departamentos con su intervalo de confianza
+# Igual que el LinearRegression de 00_02: solo cuentan los años con registros,
+# los departamentos con menos de 2 años quedan en 0 y la estimacion se trunca a entero
+# modelos es un diccionario {departamento: modelo}; el intervalo solo existe para la tendencia
+# estacional es un diccionario {departamento: total del año} de las series diarias; sin el (SOLO_TOTALES)
+# los departamentos que eligieron el modelo estacional usan la tendencia
+def pronostico_anual(totales, anio_objetivo=ANIO_PRONOSTICO, nivel=NIVEL_CONFIANZA, modelos=None, ultimo_anio=None, estacional=None):
+    departamentos, anios, matriz = matriz_totales(totales)
+    validos = matriz > 0
+    elegidos = np.array([(modelos or {}).get(d, "tendencia") for d in departamentos], dtype=object)
+    if estacional is None:
+        elegidos[elegidos == "estacional"] = "tendencia"
+    else:
+        estacional = np.array([estacional.get(d, 0.0) for d in departamentos])
+
+    prediccion = predecir_modelos(elegidos, anios, matriz, anio_objetivo, ultimo_anio=ultimo_anio, estacional=estacional)
+    prediccion = np.maximum(np.trunc(prediccion), 0).astype(int)
+    inferior, superior = intervalos_tendencias(anios, matriz, anio_objetivo, validos, nivel)
+    con_intervalo = elegidos == "tendencia"
+
+    return pd.DataFrame({
+        "departamento": departamentos,
+        "pronostico": prediccion,
+        "limite_inferior": np.where(con_intervalo, np.maximum(np.rint(inferior), 0), np.nan),
+        "limite_superior": np.where(con_intervalo, np.maximum(np.rint(superior), 0), np.nan),
+        "modelo": elegidos.astype(str)
+    })
+
+
+# Pronostico de un mes y dia para todos los departamentos
+# Se usan solo los años con homicidios y los departamentos con menos de 2 registros quedan en 0
+# modelos trae el modelo de cada departamento (por defecto la tendencia)
+# estacional es el pronostico de ese dia por departamento segun las series diarias
+def pronostico_diario(cubo, mes, dia, anio_objetivo=ANIO_PRONOSTICO, modelos=None, ultimo_anio=None, estacional=None):
+    serie = serie_por_anio(cubo, mes, dia)
+    if modelos is None:
+        modelos = np.full(len(cubo["departamentos"]), "tendencia", dtype=object)
+    prediccion = predecir_modelos(modelos, cubo["anios"], serie, anio_objetivo, serie.sum(axis=1), ultimo_anio, estacional)
+
+    return pd.DataFrame({
+        "departamento": cubo["departamentos"],
+        "pronostico": np.maximum(np.rint(prediccion), 0).astype(int),
+        "modelo": np.asarray(modelos).astype(str)
+    })
+
+
+# CALENTAMIENTO DE PRONOSTICOS
+# Se calculan por adelantado los pronosticos de los 366 dias del año en un pool de procesos
+# La tabla queda en un arreglo (mes, dia, departamento) y se puede guardar en disco
+
+# Pronostico de todos los dias de un mes; se ejecuta en un proceso del pool
+# modelos_mes es la matriz (dia, departamento) con el modelo de cada serie y estacional_mes la del modelo estacional
+def pronosticar_mes(anios, conteos_mes, anio_objetivo=ANIO_PRONOSTICO, modelos_mes=None, ultimo_anio=None, estacional_mes=None):
+    n_anios, n_dias, n_departamentos = conteos_mes.shape
+    serie = conteos_mes.reshape(n_anios, -1).T
+    if modelos_mes is None:
+        modelos_mes = np.full((n_dias, n_departamentos), "tendencia", dtype=object)
+    prediccion = predecir_modelos(
+        modelos_mes.reshape(-1), anios, serie, anio_objetivo, serie.sum(axis=1), ultimo_anio, estacional_mes
+    )
+    return np.maximum(np.rint(prediccion), 0).reshape(n_dias, n_departamentos).astype(np.int32)
+
+
+def ruta_calentamiento(carpeta, version):
+    return os.path.join(carpeta, f"pronosticos_{version}.npy")
+
+
+# Si ya existe el archivo de esta version se carga; si no, cada mes se calcula en un proceso
+# y se marca como listo apenas termina, asi los callback lo pueden usar de inmediato
+def calentar_pronosticos(cubo, estado, ruta=None, procesos=None, anio_objetivo=ANIO_PRONOSTICO):
+    modelos = estado["modelos"]
+    if ruta and os.path.exists(ruta):
+        estado["tabla"][:] = np.load(ruta)
+        estado["listo"][:] = True
+        print(f"(+) Pronosticos cargados desde {ruta}")
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        tareas = {
+            ejecutor.submit(
+                pronosticar_mes,
+                cubo["anios"],
+                cubo["conteos"][:, mes - 1],
+                anio_objetivo,
+                None if modelos is None else modelos[mes - 1],
+                estado["ultimo_anio"],
+                None if estado["estacional"] is None else estado["estacional"][mes - 1]
+            ): mes
+            for mes in range(1, 13)
+        }
+        for tarea in as_completed(tareas):
+            mes = tareas[tarea]
+            estado["tabla"][mes - 1] = tarea.result()
+            estado["listo"][mes - 1] = True
+
+    if ruta:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # Con varios workers cada proceso escribe su propio temporal y el ultimo os.replace gana
+        ruta_temporal = ruta[:-len(".npy")] + f".{os.getpid()}.tmp.npy"
+        np.save(ruta_temporal, estado["tabla"])
+        os.replace(ruta_temporal, ruta)
+    print("(+) Pronosticos de los 366 dias calculados")
+
+
+# Se arranca el calentamiento en un hilo para que el servidor atienda de inmediato
+# modelos es el arreglo (mes, dia, departamento) elegido por el backtesting, o None para usar la tendencia
+# estacional es el arreglo (mes, dia, departamento) de series_homicidios.pronostico_anio
+def iniciar_calentamiento(cubo, ruta=None, procesos=None, modelos=None, ultimo_anio=None, estacional=None):
+    estado = {
+        "tabla": np.zeros((12, 31, len(cubo["departamentos"])), dtype=np.int32),
+        "listo": np.zeros(12, dtype=bool),
+        "modelos": modelos,
+        "ultimo_anio": ultimo_anio,
+        "estacional": estacional
+    }
+    hilo = threading.Thread(target=calentar_pronosticos, args=(cubo, estado, ruta, procesos), daemon=True)
+    hilo.start()
+    return estado
+
+
+# Devuelve el pronostico ya calculado, o None si ese mes todavia no esta listo
+def pronostico_calentado(cubo, estado, mes, dia):
+    if estado is None or not estado["listo"][mes - 1]:
+        return None
+    modelos = estado["modelos"]
+    return pd.DataFrame({
+        "departamento": cubo["departamentos"],
+        "pronostico": estado["tabla"][mes - 1, dia - 1],
+        "modelo": "tendencia" if modelos is None else modelos[mes - 1, dia - 1].astype(str)
+    })
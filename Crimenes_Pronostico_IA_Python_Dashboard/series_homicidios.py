@@ -0,0 +1,343 @@
+# MODULO DE SERIES DIARIAS Y DESCOMPOSICION ESTACIONAL DE HOMICIDIOS
+# A PARTIR DEL CUBO SE ARMAN UNA SOLA VEZ LAS SERIES DIARIAS DEL TOTAL NACIONAL Y DE CADA DEPARTAMENTO
+# CADA SERIE SE DESCOMPONE EN TENDENCIA + COMPONENTE SEMANAL (DIA DE LA SEMANA) + COMPONENTE ANUAL (ARMONICOS DEL DIA DEL AÑO)
+# CON MINIMOS CUADRADOS PONDERADOS (LOS DIAS VIEJOS PESAN MENOS) RESUELTOS PARA TODAS LAS SERIES A LA VEZ
+# SOLO SE GUARDAN LAS SUMAS X'WX Y X'WY: CUANDO LLEGAN DIAS NUEVOS, O CAMBIAN DIAS YA VISTOS POR REGISTROS TARDIOS,
+# SE SUMA SU APORTE SIN VOLVER A AJUSTAR LA HISTORIA. LAS SUMAS QUEDAN EN datos/series PARA QUE UN REINICIO
+# TAMBIEN SEA INCREMENTAL. LOS PRONOSTICOS DE CUALQUIER (DEPARTAMENTO, RANGO DE FECHAS) SALEN DE LOS COEFICIENTES
+
+import os
+import threading
+import numpy as np
+import pandas as pd
+from snapshot_homicidios import CARPETA_DATOS
+from datos_homicidios import obtener_datos, al_actualizar_datos
+
+CARPETA_SERIES = os.path.join(CARPETA_DATOS, "series")
+RUTA_DESCOMPOSICION = os.path.join(CARPETA_SERIES, "descomposicion.npz")
+NACIONAL = "TOTAL NACIONAL"
+ARMONICOS_ANUALES = int(os.environ.get("ARMONICOS_ANUALES", "4"))
+DIAS_MEDIA_VIDA = float(os.environ.get("DIAS_MEDIA_VIDA_SERIES", "1095"))
+FACTOR_OLVIDO = 0.5 ** (1 / DIAS_MEDIA_VIDA)
+REGULARIZACION = 1e-8
+
+# Columnas de la regresion: nivel, tendencia, 6 dias de la semana (el lunes es la base) y seno/coseno de cada armonico
+COLUMNA_TENDENCIA = 1
+COLUMNAS_SEMANA = slice(2, 8)
+COLUMNAS_ANUALES = slice(8, 8 + 2 * ARMONICOS_ANUALES)
+N_COLUMNAS = 8 + 2 * ARMONICOS_ANUALES
+
+
+# Año, mes y dia de un arreglo de fechas datetime64[D]
+def partes_fecha(fechas):
+    meses = fechas.astype("datetime64[M]")
+    anio = fechas.astype("datetime64[Y]").astype(int) + 1970
+    mes = meses.astype(int) % 12 + 1
+    dia = (fechas - meses.astype("datetime64[D]")).astype(int) + 1
+    return anio, mes, dia
+
+
+def rango_fechas(desde, hasta):
+    return np.arange(np.datetime64(desde, "D"), np.datetime64(hasta, "D") + 1)
+
+
+# Matriz de la regresion para cada fecha; la tendencia se mide en años desde el inicio de las series
+def caracteristicas(fechas, inicio):
+    fechas = np.asarray(fechas, dtype="datetime64[D]")
+    X = np.zeros((len(fechas), N_COLUMNAS))
+    X[:, 0] = 1
+    X[:, COLUMNA_TENDENCIA] = (fechas - inicio).astype(int) / 365.25
+
+    # El 1970-01-01 fue jueves; 0 es lunes
+    semana = (fechas.astype(int) + 3) % 7
+    X[:, 2:8] = semana[:, None] == np.arange(1, 7)
+
+    inicio_anio = fechas.astype("datetime64[Y]")
+    dias_anio = ((inicio_anio + 1).astype("datetime64[D]") - inicio_anio.astype("datetime64[D]")).astype(int)
+    fraccion = (fechas - inicio_anio.astype("datetime64[D]")).astype(int) / dias_anio
+    for k in range(ARMONICOS_ANUALES):
+        angulo = 2 * np.pi * (k + 1) * fraccion
+        X[:, 8 + 2 * k] = np.sin(angulo)
+        X[:, 9 + 2 * k] = np.cos(angulo)
+    return X
+
+
+# Series diarias desde el 1 de enero del primer año hasta el ultimo dia con registros
+# Columnas: los departamentos del cubo y al final el total nacional; los años sin datos quedan en 0
+def serie_diaria(cubo):
+    anios = np.asarray(cubo["anios"])
+    n_departamentos = len(cubo["departamentos"])
+    if len(anios) == 0:
+        return np.array([], dtype="datetime64[D]"), np.zeros((0, n_departamentos + 1), dtype=np.int32)
+
+    fechas = rango_fechas(f"{anios[0]}-01-01", f"{anios[-1]}-12-31")
+    anio, mes, dia = partes_fecha(fechas)
+    i_anio = np.searchsorted(anios, anio)
+    presentes = anios[np.minimum(i_anio, len(anios) - 1)] == anio
+
+    matriz = np.zeros((len(fechas), n_departamentos + 1), dtype=np.int32)
+    matriz[presentes, :-1] = cubo["conteos"][i_anio[presentes], mes[presentes] - 1, dia[presentes] - 1]
+    matriz[:, -1] = matriz[:, :-1].sum(axis=1)
+
+    con_datos = np.flatnonzero(matriz[:, -1])
+    fin = con_datos[-1] + 1 if len(con_datos) else 0
+    return fechas[:fin], matriz[:fin]
+
+
+def nombres_series(cubo):
+    return [str(d) for d in cubo["departamentos"]] + [NACIONAL]
+
+
+# DESCOMPOSICION INCREMENTAL
+# El peso de cada dia es FACTOR_OLVIDO elevado a los dias que lo separan del ultimo dia sumado
+def descomposicion_vacia(inicio, series):
+    return {
+        "inicio": np.datetime64(inicio, "D"),
+        "series": list(series),
+        "serie": np.zeros((0, len(series)), dtype=np.int32),
+        "xtx": np.zeros((N_COLUMNAS, N_COLUMNAS)),
+        "xty": np.zeros((N_COLUMNAS, len(series))),
+        "parametros": [ARMONICOS_ANUALES, DIAS_MEDIA_VIDA],
+        "version": None
+    }
+
+
+# Si aparece un departamento nuevo su columna empieza en 0 (antes no tenia registros);
+# las sumas de un departamento que ya no esta se descartan
+def alinear_series(estado, series):
+    if estado["series"] == list(series):
+        return estado
+    posiciones = {s: i for i, s in enumerate(estado["series"])}
+    serie = np.zeros((len(estado["serie"]), len(series)), dtype=np.int32)
+    xty = np.zeros((N_COLUMNAS, len(series)))
+    for j, nombre in enumerate(series):
+        if nombre in posiciones:
+            serie[:, j] = estado["serie"][:, posiciones[nombre]]
+            xty[:, j] = estado["xty"][:, posiciones[nombre]]
+    return {**estado, "series": list(series), "serie": serie, "xty": xty}
+
+
+# Suma a la descomposicion los dias nuevos y las correcciones de los dias ya sumados
+# No modifica el estado recibido (lo pueden estar leyendo otras peticiones); devuelve uno nuevo
+def actualizar_descomposicion(estado, fechas, matriz, series, version=None):
+    if (
+        estado is None
+        or len(fechas) == 0
+        or estado["inicio"] != fechas[0]
+        or len(estado["serie"]) > len(fechas)
+        or list(estado["parametros"]) != [ARMONICOS_ANUALES, DIAS_MEDIA_VIDA]
+    ):
+        estado = descomposicion_vacia(fechas[0] if len(fechas) else "1970-01-01", series)
+    estado = alinear_series(estado, series)
+
+    anterior = estado["serie"]
+    n_anterior, n = len(anterior), len(fechas)
+    xtx, xty = estado["xtx"].copy(), estado["xty"].copy()
+
+    # Dias ya sumados que cambiaron (registros que llegan tarde): X'WX no cambia, a X'WY se le suma la diferencia
+    corregidos = np.flatnonzero((matriz[:n_anterior] != anterior).any(axis=1))
+    if len(corregidos):
+        X = caracteristicas(fechas[corregidos], estado["inicio"])
+        pesos = FACTOR_OLVIDO ** (n_anterior - 1 - corregidos)
+        xty += (X * pesos[:, None]).T @ (matriz[corregidos] - anterior[corregidos])
+
+    # Dias nuevos: lo acumulado pierde peso por los dias que pasaron y cada dia nuevo entra con el suyo
+    if n > n_anterior:
+        descuento = FACTOR_OLVIDO ** (n - n_anterior)
+        X = caracteristicas(fechas[n_anterior:], estado["inicio"])
+        Xw = X * (FACTOR_OLVIDO ** np.arange(n - n_anterior - 1, -1, -1))[:, None]
+        xtx = xtx * descuento + Xw.T @ X
+        xty = xty * descuento + Xw.T @ matriz[n_anterior:]
+
+    return {
+        **estado,
+        "serie": np.ascontiguousarray(matriz, dtype=np.int32),
+        "xtx": xtx,
+        "xty": xty,
+        "version": version,
+        "dias_nuevos": max(n - n_anterior, 0),
+        "dias_corregidos": len(corregidos)
+    }
+
+
+def descomposicion_cubo(estado, cubo, version=None):
+    fechas, matriz = serie_diaria(cubo)
+    return actualizar_descomposicion(estado, fechas, matriz, nombres_series(cubo), version)
+
+
+# Se escribe aparte y se renombra, asi otro worker nunca lee un archivo a medio escribir
+def guardar_descomposicion(estado, ruta=RUTA_DESCOMPOSICION):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta[:-len(".npz")] + f".{os.getpid()}.tmp.npz"
+    np.savez(
+        temporal,
+        inicio=np.array(str(estado["inicio"])),
+        series=np.array(estado["series"]),
+        serie=estado["serie"],
+        xtx=estado["xtx"],
+        xty=estado["xty"],
+        parametros=np.array(estado["parametros"], dtype=float),
+        version=np.array(str(estado["version"]))
+    )
+    os.replace(temporal, ruta)
+
+
+def cargar_descomposicion(ruta=RUTA_DESCOMPOSICION):
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with np.load(ruta, allow_pickle=False) as archivo:
+            return {
+                "inicio": np.datetime64(str(archivo["inicio"]), "D"),
+                "series": [str(s) for s in archivo["series"]],
+                "serie": archivo["serie"],
+                "xtx": archivo["xtx"],
+                "xty": archivo["xty"],
+                "parametros": [int(archivo["parametros"][0]), float(archivo["parametros"][1])],
+                "version": str(archivo["version"])
+            }
+    except (OSError, ValueError, KeyError) as error:
+        print(f"(-) No se pudo leer {ruta}, las series se descomponen desde cero: {error}")
+        return None
+
+
+# CAPA DE PRONOSTICO
+# Los coeficientes de todas las series salen de un solo sistema de ecuaciones
+def preparar_capa(estado):
+    xtx = estado["xtx"]
+    escala = max(np.trace(xtx) / N_COLUMNAS, 1.0)
+    coeficientes = np.linalg.solve(xtx + REGULARIZACION * escala * np.eye(N_COLUMNAS), estado["xty"])
+    fechas_serie = estado["inicio"] + np.arange(len(estado["serie"]))
+    return {
+        "version": estado["version"],
+        "inicio": estado["inicio"],
+        "hasta": fechas_serie[-1] if len(fechas_serie) else None,
+        "series": estado["series"],
+        "pos_serie": {s: j for j, s in enumerate(estado["series"])},
+        "coeficientes": coeficientes,
+        "estado": estado,
+        "por_anio": {}
+    }
+
+
+def columna_serie(capa, departamento=None):
+    nombre = NACIONAL if departamento is None else departamento
+    if nombre not in capa["pos_serie"]:
+        raise ValueError(f"No hay serie diaria para {nombre}")
+    return capa["pos_serie"][nombre]
+
+
+# Valor esperado de todas las series en cada fecha, sin recortar (filas: fechas, columnas: series)
+def pronostico_fechas(capa, fechas):
+    return caracteristicas(fechas, capa["inicio"]) @ capa["coeficientes"]
+
+
+# Tendencia, componente semanal y componente anual de una serie en cada fecha
+# Los efectos de la semana se centran en 0 y su promedio pasa a la tendencia
+def componentes_fechas(capa, fechas, departamento=None):
+    beta = capa["coeficientes"][:, columna_serie(capa, departamento)]
+    X = caracteristicas(fechas, capa["inicio"])
+    semana = np.concatenate([[0.0], beta[COLUMNAS_SEMANA]])
+    return {
+        "tendencia": beta[0] + semana.mean() + X[:, COLUMNA_TENDENCIA] * beta[COLUMNA_TENDENCIA],
+        "semanal": X[:, COLUMNAS_SEMANA] @ beta[COLUMNAS_SEMANA] - semana.mean(),
+        "anual": X[:, COLUMNAS_ANUALES] @ beta[COLUMNAS_ANUALES]
+    }
+
+
+# Pronostico diario de un departamento (o del total nacional con None) entre dos fechas, ambas incluidas
+def pronostico_rango(capa, departamento, desde, hasta):
+    fechas = rango_fechas(desde, hasta)
+    componentes = componentes_fechas(capa, fechas, departamento)
+    total = componentes["tendencia"] + componentes["semanal"] + componentes["anual"]
+    return pd.DataFrame({
+        "fecha": pd.to_datetime(fechas),
+        "tendencia": componentes["tendencia"],
+        "semanal": componentes["semanal"],
+        "anual": componentes["anual"],
+        "pronostico": np.maximum(total, 0)
+    })
+
+
+# Suma del pronostico de cada serie entre dos fechas
+def total_rango(capa, desde, hasta):
+    return np.maximum(pronostico_fechas(capa, rango_fechas(desde, hasta)), 0).sum(axis=0)
+
+
+# Diccionario {departamento: homicidios esperados en el año} para pronostico_anual
+def totales_anio(capa, anio):
+    totales = total_rango(capa, f"{anio}-01-01", f"{anio}-12-31")
+    return {s: float(v) for s, v in zip(capa["series"], totales) if s != NACIONAL}
+
+
+# Pronostico de cada dia del año como el cubo: arreglo (mes, dia, departamento) sin el total nacional
+# Las fechas que no existen quedan en 0, salvo el 29 de febrero de un año no bisiesto,
+# que los dashboards tambien pronostican: se estima como el promedio del 28 de febrero y el 1 de marzo
+def pronostico_anio(capa, anio):
+    if anio in capa["por_anio"]:
+        return capa["por_anio"][anio]
+    fechas = rango_fechas(f"{anio}-01-01", f"{anio}-12-31")
+    _, mes, dia = partes_fecha(fechas)
+    tabla = np.zeros((12, 31, len(capa["series"]) - 1))
+    tabla[mes - 1, dia - 1] = np.maximum(pronostico_fechas(capa, fechas)[:, :-1], 0)
+    if len(fechas) == 365:
+        tabla[1, 28] = (tabla[1, 27] + tabla[2, 0]) / 2
+    capa["por_anio"][anio] = tabla
+    return tabla
+
+
+# Para el backtesting: pronostico del año de cada origen ajustado solo con los dias anteriores a ese año
+# Se avanza de un origen al siguiente sumando los dias nuevos, sin ajustar desde cero cada vez
+# Devuelve el arreglo (origen, mes, dia, departamento) y el total del año (origen, departamento)
+def pronostico_origenes(cubo, origenes):
+    fechas, matriz = serie_diaria(cubo)
+    series = nombres_series(cubo)
+    n_departamentos = len(cubo["departamentos"])
+    tablas = np.zeros((len(origenes), 12, 31, n_departamentos))
+    totales = np.zeros((len(origenes), n_departamentos))
+    estado = None
+    for i_origen, k in enumerate(origenes):
+        anio = cubo["anios"][k]
+        corte = np.searchsorted(fechas, np.datetime64(f"{anio}-01-01"))
+        estado = actualizar_descomposicion(estado, fechas[:corte], matriz[:corte], series)
+        capa = preparar_capa(estado)
+        tablas[i_origen] = pronostico_anio(capa, anio)
+        totales[i_origen] = total_rango(capa, f"{anio}-01-01", f"{anio}-12-31")[:-1]
+    return tablas, totales
+
+
+# CAPA COMPARTIDA POR LAS PAGINAS
+# Se arma una vez por version de los datos; con una version nueva se parte de la capa anterior
+# (o de la guardada en disco al arrancar) y solo se suman los dias que cambiaron
+capa_actual = None
+candado_capa = threading.Lock()
+
+
+def obtener_capa(datos=None):
+    global capa_actual
+    datos = datos or obtener_datos()
+    capa = capa_actual
+    if capa is not None and capa["version"] == datos["version"]:
+        return capa
+
+    with candado_capa:
+        if capa_actual is None or capa_actual["version"] != datos["version"]:
+            base = capa_actual["estado"] if capa_actual is not None else cargar_descomposicion()
+            estado = descomposicion_cubo(base, datos["cubo"], datos["version"])
+            try:
+                guardar_descomposicion(estado)
+            except OSError as error:
+                print(f"(-) No se pudo guardar la descomposicion de las series: {error}")
+            capa_actual = preparar_capa(estado)
+            print(
+                f"(+) Series diarias en la version {datos['version']}: "
+                f"{estado['dias_nuevos']} dias nuevos, {estado['dias_corregidos']} dias corregidos"
+            )
+        return capa_actual
+
+
+# Cuando el actualizador trae datos nuevos la descomposicion se pone al dia fuera de las peticiones
+@al_actualizar_datos
+def actualizar_capa():
+    if capa_actual is not None:
+        obtener_capa()
@@ -0,0 +1,90 @@
+# MODULO DE COPIA LOCAL (SNAPSHOT) DEL DATASET DE HOMICIDIOS
+# LOS DATOS SE GUARDAN EN UN ARCHIVO PARQUET QUE SE LEE EN MILISEGUNDOS
+# AL ACTUALIZAR SOLO SE PIDEN A LA API LOS REGISTROS DESDE LA ULTIMA FECHA GUARDADA
+
+import os
+import pandas as pd
+from ingesta_homicidios import cargar_homicidios, compactar_homicidios, descargar_totales_anuales, totales_anuales, unir_paginas
+
+# Se indica donde se guarda la copia local de los datos (la variable CARPETA_DATOS permite cambiarla)
+CARPETA_DATOS = os.environ.get("CARPETA_DATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos"))
+RUTA_SNAPSHOT = os.path.join(CARPETA_DATOS, "homicidios.parquet")
+
+
+# La version del snapshot cambia cada vez que llegan registros nuevos
+def version_snapshot(df):
+    if df.empty:
+        return "vacio"
+    return f"{df['fecha_hecho'].max():%Y%m%d}-{len(df)}"
+
+
+def guardar_snapshot(df, ruta=RUTA_SNAPSHOT):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_temporal = ruta + ".tmp"
+    df.to_parquet(ruta_temporal, index=False)
+    os.replace(ruta_temporal, ruta)
+
+
+# Se piden solo los registros del ultimo dia guardado en adelante
+# El ultimo dia se vuelve a descargar completo porque la api puede seguir agregando filas de ese dia
+def actualizar_snapshot(df):
+    if df.empty:
+        return cargar_homicidios()
+
+    desde = df["fecha_hecho"].max().normalize()
+    nuevos = cargar_homicidios(where=f"fecha_hecho >= '{desde:%Y-%m-%dT%H:%M:%S}'")
+
+    # Sin registros del ultimo dia en adelante se sigue con el mismo DataFrame y no se reescribe la copia
+    if nuevos.empty:
+        return df
+
+    anteriores = df[df["fecha_hecho"] < desde]
+    # Un delta pequeño puede dejar como texto una columna que en la copia es category;
+    # unir_paginas junta las categorias de las dos partes sin pasar todo el dataset a texto
+    categorias = [c for c in anteriores.columns if isinstance(anteriores[c].dtype, pd.CategoricalDtype) and c in nuevos.columns]
+    return unir_paginas([anteriores, nuevos.astype({c: "category" for c in categorias})])
+
+
+# Se trae el delta desde la api y la copia local solo se reescribe si llegaron registros nuevos
+def refrescar_snapshot(df, ruta=RUTA_SNAPSHOT):
+    df_nuevo = actualizar_snapshot(df)
+    if version_snapshot(df_nuevo) != version_snapshot(df):
+        guardar_snapshot(df_nuevo, ruta)
+        print(f"(+) Copia local actualizada a la version {version_snapshot(df_nuevo)}")
+    return df_nuevo
+
+
+# Funcion principal: lee la copia local y, si se pide, trae solo el delta desde la api
+def cargar_snapshot(ruta=RUTA_SNAPSHOT, actualizar=True):
+    if not os.path.exists(ruta):
+        print("(+) No hay copia local, se descarga el dataset completo")
+        df = cargar_homicidios()
+        guardar_snapshot(df, ruta)
+        return df
+
+    # Parquet conserva los tipos compactos; las copias guardadas antes se compactan al leerlas
+    df = compactar_homicidios(pd.read_parquet(ruta))
+    print(f"(+) Copia local cargada: {len(df)} registros, version {version_snapshot(df)}")
+
+    if not actualizar:
+        return df
+
+    try:
+        return refrescar_snapshot(df, ruta)
+    except Exception as error:
+        print(f"(-) No se pudo actualizar la copia local, se usan los datos guardados: {error}")
+        return df
+
+
+# Modo de solo totales: se piden a la api ya agrupados
+# Si no hay conexion se agregan en local desde la copia guardada, leyendo solo las dos columnas necesarias
+def cargar_totales(ruta=RUTA_SNAPSHOT):
+    try:
+        totales = descargar_totales_anuales()
+        print(f"(+) Totales por departamento y año descargados: {len(totales)} filas")
+        return totales
+    except Exception as error:
+        if not os.path.exists(ruta):
+            raise
+        print(f"(-) No se pudieron pedir los totales a la api, se calculan con la copia local: {error}")
+        return totales_anuales(compactar_homicidios(pd.read_parquet(ruta, columns=["departamento", "anio"])))
@@ -0,0 +1,131 @@
+# MODULO DE PAGINACION DEL LADO DEL SERVIDOR PARA LAS TABLAS DE HOMICIDIOS
+# LA TABLA DEL NAVEGADOR USA page_action="custom" Y EN CADA CALLBACK SOLO SE ENVIA UNA PAGINA
+# LOS FILTROS DE LOS DROPDOWN SE RESUELVEN CON UN INDICE CONSTRUIDO UNA SOLA VEZ
+
+import numpy as np
+import pandas as pd
+from metricas_dashboard import etapa
+from serializacion_dashboard import registros
+
+# Operadores que genera el filtro de dash_table.DataTable
+operadores = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "]
+]
+
+
+# Se agrupan las posiciones de las filas por las columnas de los filtros
+# Asi buscar un año (o año, mes, dia) es un acceso a un diccionario y no un recorrido de todo el DataFrame
+def construir_indice(df, columnas):
+    return df.groupby(columnas, sort=False, observed=True).indices
+
+
+def filas_indice(df, indice, llave):
+    posiciones = indice.get(llave)
+    if posiciones is None:
+        return df.iloc[0:0]
+    return df.iloc[posiciones]
+
+
+# Columnas de la tabla, se envian una sola vez en el layout
+def columnas_tabla(df):
+    return [{"name": c, "id": c} for c in df.columns]
+
+
+# Separa una parte del filtro, por ejemplo "{departamento} contains CAUCA"
+# Si el valor esta vacio (el usuario apenas escribio "{departamento} contains ") la parte se ignora
+def separar_filtro(parte_filtro):
+    for tipo_operador in operadores:
+        for operador in tipo_operador:
+            if operador in parte_filtro:
+                parte_nombre, parte_valor = parte_filtro.split(operador, 1)
+                nombre = parte_nombre[parte_nombre.find("{") + 1: parte_nombre.rfind("}")]
+
+                parte_valor = parte_valor.strip()
+                if not parte_valor:
+                    return [None] * 3
+                v0 = parte_valor[0]
+                if v0 == parte_valor[-1] and v0 in ("'", '"', "`"):
+                    valor = parte_valor[1: -1].replace("\\" + v0, v0)
+                else:
+                    try:
+                        valor = float(parte_valor)
+                    except ValueError:
+                        valor = parte_valor
+
+                return nombre, tipo_operador[0].strip(), valor
+
+    return [None] * 3
+
+
+# Comparacion de una columna con el valor del filtro
+# Con un valor numerico el texto se convierte a numero (lo que no es numero no coincide, salvo con "ne");
+# con un valor de texto se compara como texto. Si la comparacion no se puede hacer ninguna fila coincide
+def comparar(serie, operador, valor):
+    if isinstance(valor, float) and serie.dtype.kind != "M":
+        izquierda = pd.to_numeric(serie, errors="coerce")
+    else:
+        izquierda, valor = serie.astype(str), str(valor)
+    try:
+        return getattr(izquierda, operador)(valor)
+    except TypeError:
+        return pd.Series(False, index=serie.index)
+
+
+# En las columnas category la condicion se evalua una vez por categoria
+# y cada fila se compara solo por su codigo entero
+def mascara_filtro(serie, condicion):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        categorias = condicion(pd.Series(serie.cat.categories)).to_numpy()
+        return np.isin(serie.cat.codes.to_numpy(), np.flatnonzero(categorias))
+    return condicion(serie).to_numpy()
+
+
+def filtrar_tabla(df, filter_query):
+    if not filter_query:
+        return df
+
+    for parte in filter_query.split(" && "):
+        columna, operador, valor = separar_filtro(parte)
+        if columna not in df.columns:
+            continue
+
+        if operador in ("eq", "ne", "lt", "le", "gt", "ge"):
+            condicion = lambda s: comparar(s, operador, valor)
+        elif operador == "contains":
+            condicion = lambda s: s.astype(str).str.contains(str(valor), regex=False)
+        elif operador == "datestartswith":
+            condicion = lambda s: s.astype(str).str.startswith(str(valor))
+        else:
+            continue
+        df = df.loc[mascara_filtro(df[columna], condicion)]
+    return df
+
+
+def ordenar_tabla(df, sort_by):
+    if not sort_by:
+        return df
+    return df.sort_values(
+        [c["column_id"] for c in sort_by],
+        ascending=[c["direction"] == "asc" for c in sort_by],
+        inplace=False
+    )
+
+
+# Funcion principal: filtra, ordena y corta solo la pagina pedida por la tabla
+def pagina_tabla(df, page_current, page_size, sort_by=None, filter_query=None):
+    with etapa("filtrar"):
+        df = ordenar_tabla(filtrar_tabla(df, filter_query), sort_by)
+
+    page_size = page_size or 10
+    page_count = max((len(df) - 1) // page_size + 1, 1)
+    page_current = min(page_current or 0, page_count - 1)
+
+    inicio = page_current * page_size
+    return registros(df.iloc[inicio: inicio + page_size]), page_count, page_current
@@ -0,0 +1,117 @@
+# MODULO DE TAREAS EN SEGUNDO PLANO DE LOS DASHBOARDS DE HOMICIDIOS
+# EL PRONOSTICO MENSUAL (RANDOM FOREST) DE 02_00 Y 02_01 CORRE COMO background callback DE DASH:
+# LA PETICION DE FLASK RESPONDE DE INMEDIATO, LA TAREA CORRE EN OTRO PROCESO Y EL NAVEGADOR CONSULTA SU AVANCE
+# LOS RESULTADOS Y EL AVANCE SE GUARDAN CON DiskCache EN datos/tareas
+# SI EL USUARIO CAMBIA LA SELECCION, DASH TERMINA LA TAREA ANTERIOR (oldJob) ANTES DE LANZAR LA NUEVA
+# DOS TAREAS IGUALES AL MISMO TIEMPO NO ENTRENAN DOS VECES: LA SEGUNDA ESPERA EL RESULTADO DE LA PRIMERA
+
+import os
+import time
+import diskcache
+import psutil
+from dash import DiskcacheManager
+from snapshot_homicidios import CARPETA_DATOS
+from datos_homicidios import obtener_datos, version_actual
+from backtesting_homicidios import cargar_backtesting, id_backtesting, modelo_mensual, ultimo_anio_cerrado
+from series_homicidios import obtener_capa, pronostico_anio, columna_serie
+from serializacion_dashboard import registros
+from pronostico_homicidios import ANIO_PRONOSTICO
+
+CARPETA_TAREAS = os.path.join(CARPETA_DATOS, "tareas")
+MINUTOS_RESULTADOS = float(os.environ.get("MINUTOS_RESULTADOS_TAREAS", "60"))
+ESPERA_CANDADO = 0.1
+
+cache_tareas = diskcache.Cache(CARPETA_TAREAS)
+
+# Los resultados de cada callback quedan guardados por sus entradas y por la version de los datos y del backtesting,
+# asi volver a una seleccion ya vista responde sin recalcular y una version nueva nunca reutiliza resultados viejos
+administrador_tareas = DiskcacheManager(
+    cache_tareas,
+    cache_by=[version_actual, lambda: id_backtesting(cargar_backtesting())],
+    expire=int(MINUTOS_RESULTADOS * 60)
+)
+
+
+def proceso_vivo(pid):
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+# Candado entre procesos guardado en la cache con el pid del dueño
+# Si el dueño ya no existe (Dash lo termino porque cambio la seleccion) el candado se libera
+def tomar_candado(llave, al_esperar=None):
+    nombre = ("candado", llave)
+    avisado = False
+    while not cache_tareas.add(nombre, os.getpid()):
+        duenio = cache_tareas.get(nombre)
+        if duenio is not None and not proceso_vivo(duenio):
+            with cache_tareas.transact():
+                if cache_tareas.get(nombre) == duenio:
+                    cache_tareas.delete(nombre)
+            continue
+        if al_esperar is not None and not avisado:
+            al_esperar()
+            avisado = True
+        time.sleep(ESPERA_CANDADO)
+
+
+def soltar_candado(llave):
+    nombre = ("candado", llave)
+    with cache_tareas.transact():
+        if cache_tareas.get(nombre) == os.getpid():
+            cache_tareas.delete(nombre)
+
+
+# Devuelve el resultado guardado de la llave o lo calcula una sola vez entre todos los procesos
+def resultado_compartido(llave, calcular, al_esperar=None):
+    nombre = ("resultado", llave)
+    resultado = cache_tareas.get(nombre)
+    if resultado is not None:
+        return resultado
+
+    tomar_candado(llave, al_esperar)
+    try:
+        resultado = cache_tareas.get(nombre)
+        if resultado is None:
+            resultado = calcular()
+            cache_tareas.set(nombre, resultado, expire=MINUTOS_RESULTADOS * 60)
+        return resultado
+    finally:
+        soltar_candado(llave)
+
+
+# Pronostico mensual para los callback en segundo plano de 02_00 y 02_01
+# avisar(valor, maximo, texto) actualiza la barra de progreso de la pagina
+# Devuelve las filas del pronostico y el modelo usado
+def pronostico_mensual_en_tarea(avisar, mes, departamento):
+    # El registro de modelos se importa aqui para que sklearn solo se cargue en el proceso de la tarea
+    from modelos_homicidios import pronostico_mensual
+
+    datos = obtener_datos()
+    resultados = cargar_backtesting()
+    modelo = modelo_mensual(resultados, mes, departamento)
+    llave = ("pronostico_mensual", mes, departamento, datos["version"], id_backtesting(resultados), modelo)
+
+    def progreso(arboles, total):
+        avisar(arboles, total, f"Entrenando Random Forest: {arboles} de {total} árboles")
+
+    def calcular():
+        avisar(0, 1, f"Calculando el pronóstico con {modelo}...")
+        estacional = None
+        if modelo == "estacional":
+            capa = obtener_capa(datos)
+            estacional = pronostico_anio(capa, ANIO_PRONOSTICO)[mes - 1, :, columna_serie(capa, departamento)]
+        df_forecast = pronostico_mensual(
+            datos["cubo"], mes, departamento, datos["version"],
+            modelo=modelo, ultimo_anio=ultimo_anio_cerrado(resultados), progreso=progreso, estacional=estacional
+        )
+        return registros(df_forecast)
+
+    filas = resultado_compartido(
+        llave,
+        calcular,
+        al_esperar=lambda: avisar(0, 1, "Otra consulta ya está calculando este pronóstico, esperando su resultado...")
+    )
+    return filas, modelo
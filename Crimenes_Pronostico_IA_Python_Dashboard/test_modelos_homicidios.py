@@ -0,0 +1,29 @@
+# PRUEBAS DEL REGISTRO DE MODELOS: AL GUARDAR UNA VERSION NUEVA SOLO QUEDAN SUS ARCHIVOS
+#
+# python -m pytest -q test_modelos_homicidios.py
+
+import os
+import numpy as np
+import modelos_homicidios
+from cubo_homicidios import armar_cubo
+
+
+def cubo_ejemplo():
+    conteos = np.zeros((3, 12, 31, 2), dtype=np.int32)
+    conteos[:, 0, :10, :] = 1
+    return armar_cubo(conteos, [2022, 2023, 2024], ["CAUCA", "VALLE DEL CAUCA"])
+
+
+def test_version_nueva_borra_los_archivos_viejos(tmp_path, monkeypatch):
+    monkeypatch.setattr(modelos_homicidios, "CARPETA_MODELOS", str(tmp_path))
+    monkeypatch.setattr(modelos_homicidios, "modelos_en_memoria", {})
+    monkeypatch.setattr(modelos_homicidios, "candados", {})
+    cubo = cubo_ejemplo()
+
+    for departamento in ("CAUCA", "VALLE DEL CAUCA"):
+        modelos_homicidios.obtener_modelo(cubo, 1, departamento, "20240101-10")
+    modelos_homicidios.obtener_modelo(cubo, 1, "CAUCA", "20240201-12")
+
+    assert sorted(os.listdir(tmp_path)) == ["rf_20240101-10_01_VALLE_DEL_CAUCA.joblib", "rf_20240201-12_01_CAUCA.joblib"]
+    assert list(modelos_homicidios.modelos_en_memoria) == [(1, "CAUCA", "20240201-12")]
+    assert list(modelos_homicidios.candados) == [(1, "CAUCA", "20240201-12")]
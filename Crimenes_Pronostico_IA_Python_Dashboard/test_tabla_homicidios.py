@@ -0,0 +1,49 @@
+# PRUEBAS DE LOS FILTROS DE LAS TABLAS PAGINADAS EN EL SERVIDOR
+# LAS COLUMNAS DE TEXTO LLEGAN COMO category (tipos_csv), TAMBIEN LAS QUE TIENEN NUMEROS COMO codigo_dane
+#
+# python -m pytest -q test_tabla_homicidios.py
+
+import pandas as pd
+from tabla_homicidios import filtrar_tabla, pagina_tabla
+
+
+def tabla_ejemplo():
+    return pd.DataFrame({
+        "departamento": pd.Series(["ANTIOQUIA", "CAUCA", "META", "CAUCA"], dtype="category"),
+        "municipio": pd.Series(["MEDELLIN", "POPAYAN", "VILLAVICENCIO", "2"], dtype="category"),
+        "codigo_dane": pd.Series(["05001000", "19001000", "50001000", "3"], dtype="category"),
+        "cantidad": pd.Series(["1", "2", "1", "4"], dtype="category"),
+        "anio": pd.Series([2022, 2023, 2024, 2024], dtype="int16")
+    })
+
+
+def test_comparaciones_en_columnas_de_texto_no_fallan():
+    df = tabla_ejemplo()
+    assert len(filtrar_tabla(df, "{codigo_dane} > 5")) == 3
+    assert list(filtrar_tabla(df, "{municipio} < 5")["municipio"]) == ["2"]
+    assert list(filtrar_tabla(df, "{cantidad} > 1")["cantidad"]) == ["2", "4"]
+    assert len(filtrar_tabla(df, "{cantidad} = 1")) == 2
+
+
+def test_comparacion_con_texto():
+    df = tabla_ejemplo()
+    assert list(filtrar_tabla(df, "{departamento} >= M")["departamento"]) == ["META"]
+    assert len(filtrar_tabla(df, "{departamento} = CAUCA")) == 2
+    assert len(filtrar_tabla(df, "{anio} > abc")) == 0
+
+
+def test_filtros_numericos_y_contains():
+    df = tabla_ejemplo()
+    assert list(filtrar_tabla(df, "{anio} >= 2024 && {departamento} contains CAU")["municipio"]) == ["2"]
+
+
+def test_filtro_sin_valor_se_ignora():
+    df = tabla_ejemplo()
+    assert len(filtrar_tabla(df, "{departamento} contains ")) == 4
+    assert len(filtrar_tabla(df, "{cantidad} = ")) == 4
+    assert len(filtrar_tabla(df, "{anio} >= 2024 && {municipio} != ")) == 2
+
+
+def test_pagina_con_filtro_relacional():
+    filas, paginas, actual = pagina_tabla(tabla_ejemplo(), 0, 2, filter_query="{codigo_dane} > 5")
+    assert (len(filas), paginas, actual) == (2, 2, 0)
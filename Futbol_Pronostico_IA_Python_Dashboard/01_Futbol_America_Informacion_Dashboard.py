@@ -1,12 +1,18 @@
 # El siguiente codigo muestra una forma sencilla de crear
 # Un dashboard con tablas de informacion del america de cali
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
 
 from flask import Flask, render_template_string
 import pandas as pd
 import requests
+from serializacion_dashboard import optimizar_respuestas
+from metricas_dashboard import instrumentar
 
 app = Flask(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 # URL de Wikipedia del América de Cali
 URL = "https://es.wikipedia.org/wiki/Am%C3%A9rica_de_Cali"
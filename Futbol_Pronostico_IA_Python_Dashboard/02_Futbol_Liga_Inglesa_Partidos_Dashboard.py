@@ -1,12 +1,18 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de la premier liga
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
+import os
 import requests
 import pandas as pd
 from dash import Dash, html, dash_table
+from serializacion_dashboard import optimizar_respuestas, registros
+from metricas_dashboard import instrumentar
+
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
 
 # URL del JSON público de Premier League 2024-25
-url = "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json"
+url = f"{URL_FUTBOL}/2024-25/en.1.json"
 
 # Obtener datos
 try:
@@ -35,13 +41,17 @@ if not df.empty:
 
 # El siguiente codigo es para crear el dashboard Dash
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
     html.H1("Premier League 2024-25 - Tabla de Partidos"),
     dash_table.DataTable(
         id='tabla-partidos',
         columns=[{"name": i, "id": i} for i in df_table.columns],
-        data=df_table.to_dict('records'),
+        data=registros(df_table),
         page_size=20,            # mostrar 20 filas por página
         style_table={'overflowX': 'auto'},
         style_cell={'textAlign': 'center', 'padding': '5px'},
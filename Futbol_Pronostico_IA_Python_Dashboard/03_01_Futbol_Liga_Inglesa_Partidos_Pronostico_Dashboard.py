@@ -1,14 +1,20 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de la premier liga
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
+import os
 import requests
 import pandas as pd
 import numpy as np
 from dash import Dash, html, dcc, Output, Input, dash_table
 from sklearn.neural_network import MLPRegressor
+from serializacion_dashboard import optimizar_respuestas
+from metricas_dashboard import instrumentar, medir_callback, cronometro
+
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
 
 # --- Obtener datos JSON ---
-url = "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json"
+url = f"{URL_FUTBOL}/2024-25/en.1.json"
 response = requests.get(url)
 data = response.json()
 
@@ -28,6 +34,10 @@ equipos = sorted(set(df['Team1']).union(set(df['Team2'])))
 
 # --- Crear Dash ---
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
     html.H1("Premier League 2024-25 - Predicción de Partidos por Equipo"),
@@ -62,10 +72,13 @@ app.layout = html.Div([
      Output('tabla-partidos', 'data')],
     Input('dropdown-equipo', 'value')
 )
+@medir_callback
 def actualizar_dashboard(equipo):
+    marcar = cronometro()
     # Filtrar partidos del equipo
     mask = (df['Team1'] == equipo) | (df['Team2'] == equipo)
     df_equipo = df[mask].copy()
+    marcar("filtrar")
     
     if df_equipo.empty:
         return "No hay datos para este equipo.", []
@@ -90,6 +103,7 @@ def actualizar_dashboard(equipo):
             "GF": gf,
             "GC": gc
         })
+    marcar("agregar")
     
     # --- Predicción de próximo partido ---
     # Features simples: partido número
@@ -105,6 +119,7 @@ def actualizar_dashboard(equipo):
     proximo_index = np.array([[len(df_equipo)]])
     pred_GF = round(model_GF.predict(proximo_index)[0],1)
     pred_GC = round(model_GC.predict(proximo_index)[0],1)
+    marcar("ajustar_modelo")
     
     pred_texto = html.Div([
         html.H3(f"Predicción del próximo partido de {equipo}: {pred_GF} - {pred_GC} (Goles a favor - Goles en contra)")
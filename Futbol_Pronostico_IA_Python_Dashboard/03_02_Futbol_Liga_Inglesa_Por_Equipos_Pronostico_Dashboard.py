@@ -1,6 +1,7 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de la premier liga
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
+import os
 import requests
 import pandas as pd
 import numpy as np
@@ -8,9 +9,14 @@ from dash import Dash, html, dcc, Output, Input, dash_table
 from sklearn.neural_network import MLPRegressor
 import plotly.express as px
 import plotly.graph_objects as go
+from serializacion_dashboard import optimizar_respuestas
+from metricas_dashboard import instrumentar, medir_callback, cronometro
+
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
 
 # Obtener datos JSON 
-url = "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json"
+url = f"{URL_FUTBOL}/2024-25/en.1.json"
 response = requests.get(url)
 data = response.json()
 
@@ -30,6 +36,10 @@ equipos = sorted(set(df['Team1']).union(set(df['Team2'])))
 
 # Crear Dash 
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
     html.H1("Premier League 2024-25 - Predicción de Partidos por Equipo"),
@@ -75,10 +85,13 @@ app.layout = html.Div([
      Output('pie-goles-contra', 'figure')],
     Input('dropdown-equipo', 'value')
 )
+@medir_callback
 def actualizar_dashboard(equipo):
     # Filtrar partidos del equipo seleccionado
+    marcar = cronometro()
     mask = (df['Team1'] == equipo) | (df['Team2'] == equipo)
     df_equipo = df[mask].copy()
+    marcar("filtrar")
     
     if df_equipo.empty:
         return "No hay datos para este equipo.", [], {}, {}, {}
@@ -107,6 +120,7 @@ def actualizar_dashboard(equipo):
         gf_list.append(gf)
         gc_list.append(gc)
         pie_labels.append(rival)
+    marcar("agregar")
 
     # --- Predicción próximo partido ---
     X = np.arange(len(df_equipo)).reshape(-1,1)
@@ -121,6 +135,7 @@ def actualizar_dashboard(equipo):
     proximo_index = np.array([[len(df_equipo)]])
     pred_GF = round(model_GF.predict(proximo_index)[0],1)
     pred_GC = round(model_GC.predict(proximo_index)[0],1)
+    marcar("ajustar_modelo")
     
     pred_texto = html.Div([
         html.H3(f"Predicción del próximo partido de {equipo}: {pred_GF} - {pred_GC} (Goles a favor - Goles en contra)")
@@ -159,6 +174,7 @@ def actualizar_dashboard(equipo):
         hole=0.3
     )
     fig_GC.update_traces(textinfo='label+value')
+    marcar("figuras")
 
     return pred_texto, tabla_data, fig_bar, fig_GF, fig_GC
 
@@ -1,6 +1,6 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de algunas ligas de futbol del mundo
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
 import os
 import requests
 import pandas as pd
@@ -11,6 +11,8 @@ from sklearn.neural_network import MLPRegressor
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from serializacion_dashboard import optimizar_respuestas
+from metricas_dashboard import instrumentar, medir_callback, cronometro
 
 # Se crea la carpeta Archivos
 if not os.path.exists("Archivos"):
@@ -19,13 +21,16 @@ if not os.path.exists("Archivos"):
 # Se guarda en una variable, la fecha y hora actual
 fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
+
 # Ligas disponibles
 LIGAS = {
-    "Premier League (ING)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json",
-    "La Liga (ESP)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/es.1.json",
-    "Serie A (ITA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/it.1.json",
-    "Bundesliga (GER)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/de.1.json",
-    "Ligue 1 (FRA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/fr.1.json"
+    "Premier League (ING)": f"{URL_FUTBOL}/2024-25/en.1.json",
+    "La Liga (ESP)": f"{URL_FUTBOL}/2024-25/es.1.json",
+    "Serie A (ITA)": f"{URL_FUTBOL}/2024-25/it.1.json",
+    "Bundesliga (GER)": f"{URL_FUTBOL}/2024-25/de.1.json",
+    "Ligue 1 (FRA)": f"{URL_FUTBOL}/2024-25/fr.1.json"
 }
 
 # La siguiente funcion se carga la liga escogida
@@ -47,6 +52,10 @@ def cargar_liga(url):
 
 # Con el siguiente codigo, se construye el dashboard
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div(
     style={'backgroundColor': 'black', 'color': 'red', 'padding': '10px', 'fontFamily': 'Arial'},
@@ -107,6 +116,7 @@ app.layout = html.Div(
     Output('dropdown-equipo', 'value'),
     Input('dropdown-liga', 'value')
 )
+@medir_callback
 def actualizar_equipos(liga):
     df = cargar_liga(LIGAS[liga])
     equipos = sorted(set(df['Team1']).union(df['Team2']))
@@ -122,13 +132,17 @@ def actualizar_equipos(liga):
     Input('dropdown-liga', 'value'),
     Input('dropdown-equipo', 'value')
 )
+@medir_callback
 def actualizar_dashboard(liga, equipo):
+    marcar = cronometro()
 
     df = cargar_liga(LIGAS[liga])
+    marcar("descargar")
     df_equipo = df[(df['Team1'] == equipo) | (df['Team2'] == equipo)]
 
     if df_equipo.empty:
         return "No hay datos disponibles.", [], {}, {}, {}
+    marcar("filtrar")
 
     tabla, gf_list, gc_list, rivales = [], [], [], []
 
@@ -149,12 +163,14 @@ def actualizar_dashboard(liga, equipo):
         gf_list.append(gf)
         gc_list.append(gc)
         rivales.append(rival)
+    marcar("agregar")
 
     # Lineas de codigo para crear la prediccion con machine learnig inteligencia artificial
     X = np.arange(len(df_equipo)).reshape(-1, 1)
     model = MLPRegressor(max_iter=1000, random_state=42)
     model.fit(X, gf_list)
     pred = round(model.predict([[len(df_equipo)]])[0], 1)
+    marcar("ajustar_modelo")
 
     pred_text = f"Predicción del próximo partido de {equipo}: {pred} goles"
 
@@ -168,6 +184,7 @@ def actualizar_dashboard(liga, equipo):
     fig_bar = px.bar(x=equipos, y=total_GF, title="Total de Goles por Equipo")
     fig_gf = px.pie(names=rivales, values=gf_list, title="Goles a Favor")
     fig_gc = px.pie(names=rivales, values=gc_list, title="Goles en Contra")
+    marcar("figuras")
 
     return pred_text, tabla, fig_bar, fig_gf, fig_gc
 
@@ -1,6 +1,6 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de ligas europeas
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
 import os
 import requests
 import pandas as pd
@@ -11,19 +11,24 @@ from sklearn.neural_network import MLPRegressor
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from serializacion_dashboard import optimizar_respuestas
+from metricas_dashboard import instrumentar, medir_callback, cronometro
 
 # Asignacion de variables
 if not os.path.exists("Archivos"):
     os.makedirs("Archivos")
 fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
+
 # JSON de liga europea con su respectivo URL API
 LIGAS = {
-    "Premier League (ING)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json",
-    "La Liga (ESP)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/es.1.json",
-    "Serie A (ITA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/it.1.json",
-    "Bundesliga (GER)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/de.1.json",
-    "Ligue 1 (FRA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/fr.1.json"
+    "Premier League (ING)": f"{URL_FUTBOL}/2024-25/en.1.json",
+    "La Liga (ESP)": f"{URL_FUTBOL}/2024-25/es.1.json",
+    "Serie A (ITA)": f"{URL_FUTBOL}/2024-25/it.1.json",
+    "Bundesliga (GER)": f"{URL_FUTBOL}/2024-25/de.1.json",
+    "Ligue 1 (FRA)": f"{URL_FUTBOL}/2024-25/fr.1.json"
 }
 
 # Se consulta la liga que el usuario escogio y se guardan las variables en el data frame
@@ -45,6 +50,10 @@ def cargar_liga(url):
 
 # Codigo para crear el dashboard
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div(
     style={'backgroundColor': 'black', 'color': 'red', 'padding': '10px', 'font-family': 'Arial', 'width': '100%'},
@@ -115,6 +124,7 @@ app.layout = html.Div(
     Output('dropdown-equipo', 'value'),
     Input('dropdown-liga', 'value')
 )
+@medir_callback
 def actualizar_equipos(liga):
     df = cargar_liga(LIGAS[liga])
     equipos = sorted(set(df['Team1']).union(df['Team2']))
@@ -130,13 +140,17 @@ def actualizar_equipos(liga):
     Input('dropdown-liga', 'value'),
     Input('dropdown-equipo', 'value')
 )
+@medir_callback
 def actualizar_dashboard(liga, equipo):
+    marcar = cronometro()
 
     df = cargar_liga(LIGAS[liga])
+    marcar("descargar")
     df_equipo = df[(df['Team1'] == equipo) | (df['Team2'] == equipo)]
 
     if df_equipo.empty:
         return "No hay datos para este equipo.", [], {}, {}, {}
+    marcar("filtrar")
 
     tabla_data, gf_list, gc_list, pie_labels = [], [], [], []
 
@@ -157,6 +171,7 @@ def actualizar_dashboard(liga, equipo):
         gf_list.append(gf)
         gc_list.append(gc)
         pie_labels.append(rival)
+    marcar("agregar")
 
     # Se escogen variables de el dataframe para luego meterlo la red neuronal
     X = np.arange(len(df_equipo)).reshape(-1, 1)
@@ -174,6 +189,7 @@ def actualizar_dashboard(liga, equipo):
 
     pred_GF = round(model_GF.predict(proximo_index)[0], 1)
     pred_GC = round(model_GC.predict(proximo_index)[0], 1)
+    marcar("ajustar_modelo")
 
     pred_texto = f"Predicción del próximo partido de {equipo}: {pred_GF} - {pred_GC}"
 
@@ -205,6 +221,7 @@ def actualizar_dashboard(liga, equipo):
     fig_GC = px.pie(names=pie_labels, values=gc_list, hole=0.3,
                     title=f"Goles en contra por partido de {equipo}")
     fig_GC.update_layout(plot_bgcolor='black', paper_bgcolor='black', font_color='red')
+    marcar("figuras")
 
     return pred_texto, tabla_data, fig_bar, fig_GF, fig_GC
 
@@ -1,6 +1,7 @@
 # En el siguiente codigo se muestra una forma sencilla de crear
 # Un dashboard con los datos de los partidos de ligas europeas
-# pip install flask pandas requests lxml beautifulsoup4
+# pip install flask pandas requests lxml beautifulsoup4 orjson brotli flask-compress
+import os
 import requests    
 import pandas as pd
 import numpy as np
@@ -10,16 +11,21 @@ import plotly.express as px
 import plotly.graph_objects as go
 from sklearn.neural_network import MLPRegressor
 from datetime import datetime
+from serializacion_dashboard import optimizar_respuestas, registros
+from metricas_dashboard import instrumentar, medir_callback, cronometro
 
 # Se guarda informacion en variables estaticas
 fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Base de los JSON de openfootball; con la variable URL_FUTBOL se puede usar otra copia (por ejemplo la del benchmark)
+URL_FUTBOL = os.environ.get("URL_FUTBOL", "https://raw.githubusercontent.com/openfootball/football.json/master")
+
 LIGAS = {
-    "Premier League (ING)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/en.1.json",
-    "La Liga (ESP)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/es.1.json",
-    "Serie A (ITA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/it.1.json",
-    "Bundesliga (GER)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/de.1.json",
-    "Ligue 1 (FRA)": "https://raw.githubusercontent.com/openfootball/football.json/master/2024-25/fr.1.json"
+    "Premier League (ING)": f"{URL_FUTBOL}/2024-25/en.1.json",
+    "La Liga (ESP)": f"{URL_FUTBOL}/2024-25/es.1.json",
+    "Serie A (ITA)": f"{URL_FUTBOL}/2024-25/it.1.json",
+    "Bundesliga (GER)": f"{URL_FUTBOL}/2024-25/de.1.json",
+    "Ligue 1 (FRA)": f"{URL_FUTBOL}/2024-25/fr.1.json"
 }
 
 # Se descargan los datos de la API de resultados
@@ -40,6 +46,10 @@ def cargar_liga(url):
 
 # Codigo de creacion del dashboard
 app = Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div(
     style={'backgroundColor': 'black', 'color': 'red', 'padding': '20px'},
@@ -121,6 +131,7 @@ app.layout = html.Div(
     Output('equipoA', 'value'),
     Input('liga', 'value')
 )
+@medir_callback
 def equiposA(liga):
     df = cargar_liga(LIGAS[liga])
     equipos = sorted(set(df.Team1) | set(df.Team2))
@@ -132,6 +143,7 @@ def equiposA(liga):
     Input('liga', 'value'),
     Input('equipoA', 'value')
 )
+@medir_callback
 def equiposB(liga, A):
     df = cargar_liga(LIGAS[liga])
     equipos = [e for e in sorted(set(df.Team1) | set(df.Team2)) if e != A]
@@ -159,9 +171,12 @@ def equiposB(liga, A):
 )
 
 # Funcion de actualizar la pagina
+@medir_callback
 def actualizar(liga, A, B):
+    marcar = cronometro()
 
     df = cargar_liga(LIGAS[liga])
+    marcar("descargar")
 
     fecha_min = df["Date"].min().strftime("%Y-%m-%d")
     fecha_max = df["Date"].max().strftime("%Y-%m-%d")
@@ -189,6 +204,7 @@ def actualizar(liga, A, B):
 
     dfA, gfA, gcA, rivA, tablaA = datos(A)
     dfB, gfB, gcB, rivB, tablaB = datos(B)
+    marcar("agregar")
 
     X_A = np.arange(len(gfA)).reshape(-1, 1)
     X_B = np.arange(len(gfB)).reshape(-1, 1)
@@ -234,6 +250,7 @@ def actualizar(liga, A, B):
         h2h_text = html.H2(f"H2H IA: {A} {pred_h2h_A} - {pred_h2h_B} {B}")
     else:
         h2h_text = html.H2("H2H IA: No hay partidos anteriores entre estos equipos")
+    marcar("ajustar_modelo")
 
     # Las siguientes funciones relacionadas con las graficas
     def pie(names, values, title):
@@ -269,11 +286,11 @@ def actualizar(liga, A, B):
         )
         return fig
 
-    return (
+    respuesta = (
         pronostico,
         html.Div([prob_text, h2h_text]),  # <- Aquí se muestra H2H debajo de probabilidades
-        tablaA.to_dict("records"),
-        tablaB.to_dict("records"),
+        registros(tablaA),
+        registros(tablaB),
         barras(rivA, gfA, gcA),
         barras(rivB, gfB, gcB),
         pie(rivA, gfA, f"{A} - Goles a Favor"),
@@ -286,6 +303,8 @@ def actualizar(liga, A, B):
         f"Goles por Rival - {B}",
         f"Datos desde {fecha_min} hasta {fecha_max}"
     )
+    marcar("figuras")
+    return respuesta
 
 # Main de ejecucion
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+# BENCHMARK DE LA SERIALIZACION DE LOS DASHBOARDS DE FUTBOL SIN CONEXION A GITHUB
+# SE GENERA UNA TEMPORADA SINTETICA CON EL FORMATO DE openfootball (football.json) PARA CADA LIGA,
+# SE SIRVE DESDE UN SERVIDOR HTTP LOCAL (URL_FUTBOL) Y SE LLAMA EL LAYOUT Y CADA CALLBACK DE LOS DASHBOARDS DE DASH
+# DE CADA RESPUESTA SE COMPARAN LOS BYTES Y LOS MILISEGUNDOS DE CONVERTIRLA A JSON CON EL CAMINO DE PLOTLY
+# Y CON serializacion_dashboard (orjson, gzip y brotli). EL RESULTADO SE GUARDA EN JSON
+#
+# python benchmark_futbol.py --repeticiones 30 --salida benchmark_futbol.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import importlib.util
+import numpy as np
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CARPETA_PROYECTO = os.path.dirname(os.path.abspath(__file__))
+TEMPORADA = "2024-25"
+LIGAS = ["en.1", "es.1", "it.1", "de.1", "fr.1"]
+EQUIPOS_POR_LIGA = 20
+GOLES_POR_EQUIPO = 1.4
+
+# Dashboards de Dash que se miden (01 es Flask y consulta Wikipedia)
+DASHBOARDS = [
+    "02_Futbol_Liga_Inglesa_Partidos_Dashboard.py",
+    "03_01_Futbol_Liga_Inglesa_Partidos_Pronostico_Dashboard.py",
+    "03_02_Futbol_Liga_Inglesa_Por_Equipos_Pronostico_Dashboard.py",
+    "03_03_Futbol_Ligas_Europeas_Por_Equipos_Pronostico_Dashboard.py",
+    "03_04_Futbol_Ligas_Europeas_Por_Equipo_Pronostico_Graficas_Dashboard.py",
+    "03_05_Futbol_Ligas_Europeas_2_Equipos_Pronostico_H2H_IA_Dashboard.py"
+]
+
+
+# Todos contra todos, ida y vuelta, una jornada por semana y goles con distribucion de Poisson
+def generar_liga(liga, generador):
+    equipos = [f"Equipo {i + 1:02d} ({liga})" for i in range(EQUIPOS_POR_LIGA)]
+    fecha = date(2024, 8, 16)
+    partidos = []
+    for jornada in range(2 * (EQUIPOS_POR_LIGA - 1)):
+        # Metodo del circulo: el primer equipo queda fijo y los demas rotan
+        rotados = equipos[:1] + equipos[1:][jornada % (EQUIPOS_POR_LIGA - 1):] + equipos[1:][:jornada % (EQUIPOS_POR_LIGA - 1)]
+        for i in range(EQUIPOS_POR_LIGA // 2):
+            local, visitante = rotados[i], rotados[-1 - i]
+            if jornada >= EQUIPOS_POR_LIGA - 1:
+                local, visitante = visitante, local
+            goles = generador.poisson(GOLES_POR_EQUIPO, 2).tolist()
+            partidos.append({
+                "round": f"Matchday {jornada + 1}",
+                "date": (fecha + timedelta(days=int(generador.integers(3)))).isoformat(),
+                "team1": local,
+                "team2": visitante,
+                "score": {"ft": goles}
+            })
+        fecha += timedelta(days=7)
+    return {"name": f"Liga sintetica {liga} {TEMPORADA}", "matches": partidos}
+
+
+def iniciar_servidor(ligas):
+    archivos = {f"/{TEMPORADA}/{liga}.json": json.dumps(datos).encode("utf-8") for liga, datos in ligas.items()}
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            cuerpo = archivos.get(self.path)
+            self.send_response(200 if cuerpo else 404)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(cuerpo or b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}"
+
+
+# Los nombres de los archivos empiezan con numeros, por eso se importan por ruta
+def importar_dashboard(archivo):
+    nombre = "dashboard_" + archivo.split("_Futbol")[0]
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(CARPETA_PROYECTO, archivo))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# Valores de los dropdown de los dashboards: la primera liga y los dos primeros equipos
+def valores_dropdown(ligas):
+    partidos = ligas[LIGAS[0]]["matches"]
+    equipos = sorted({p["team1"] for p in partidos})
+    liga = "Premier League (ING)"
+    return {
+        "dropdown-liga": liga, "liga": liga,
+        "dropdown-equipo": equipos[0], "equipoA": equipos[0], "equipoB": equipos[1]
+    }
+
+
+def peticiones_callback(dependencias, valores):
+    peticiones = []
+    for dep in dependencias:
+        if dep.get("clientside_function"):
+            continue
+        entradas = [{**i, "value": valores.get(i["id"])} for i in dep["inputs"]]
+        salidas = [{"id": o.split(".")[0], "property": o.split(".")[-1]} for o in dep["output"].strip(".").split("...")]
+        peticiones.append((dep["output"], {
+            "output": dep["output"],
+            "outputs": salidas[0] if len(salidas) == 1 else salidas,
+            "inputs": entradas,
+            "state": [],
+            "changedPropIds": [f"{entradas[0]['id']}.{entradas[0]['property']}"]
+        }))
+    return peticiones
+
+
+def medir_dashboard(archivo, valores, repeticiones):
+    from serializacion_dashboard import capturar_respuestas, comparar_serializacion
+    modulo = importar_dashboard(archivo)
+    cliente = modulo.app.server.test_client()
+
+    resultados = {}
+    with capturar_respuestas() as respuestas:
+        cliente.get("/_dash-layout")
+    resultados["layout"] = comparar_serializacion(respuestas[-1], repeticiones)
+
+    for salida, cuerpo in peticiones_callback(cliente.get("/_dash-dependencies").get_json(), valores):
+        with capturar_respuestas() as respuestas:
+            inicio = time.perf_counter()
+            respuesta = cliente.post("/_dash-update-component", json=cuerpo)
+            duracion = time.perf_counter() - inicio
+        resultados[salida] = {
+            **comparar_serializacion(respuestas[-1], repeticiones),
+            "peticion_ms": round(duracion * 1000, 3),
+            "estado": respuesta.status_code
+        }
+
+    for nombre, r in resultados.items():
+        print(f"(+) {archivo[:5]} {nombre[:60]}: {r['bytes_plotly']} -> {r['bytes_brotli']} bytes, "
+              f"{r['ms_plotly']} -> {r['ms_rapido']} ms")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sin conexion de la serializacion de los dashboards de futbol")
+    parser.add_argument("--repeticiones", type=int, default=30, help="conversiones medidas por respuesta")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_futbol.json")
+    args = parser.parse_args()
+
+    generador = np.random.default_rng(args.semilla)
+    ligas = {liga: generar_liga(liga, generador) for liga in LIGAS}
+    servidor, url = iniciar_servidor(ligas)
+    os.environ["URL_FUTBOL"] = url
+    sys.path.insert(0, CARPETA_PROYECTO)
+
+    directorio = os.getcwd()
+    try:
+        # Algunos dashboards crean la carpeta Archivos donde se ejecutan
+        with tempfile.TemporaryDirectory(prefix="benchmark_futbol_") as carpeta:
+            os.chdir(carpeta)
+            dashboards = {
+                archivo: medir_dashboard(archivo, valores_dropdown(ligas), args.repeticiones)
+                for archivo in DASHBOARDS
+            }
+    finally:
+        os.chdir(directorio)
+        servidor.shutdown()
+
+    resultados = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "maquina": platform.platform(),
+        "dashboards": dashboards
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"(+) Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from sklearn.linear_model import LinearRegression
 import io
 import base64
 from fpdf import FPDF
+from metricas_dashboard import instrumentar
+from serializacion_dashboard import optimizar_respuestas, registros
 
 # Se consulta y se guardan los datos en variable json_data
 API_URL = "https://api-resultadosloterias.com/api/results/2025-01-01"  # Reemplaza con tu URL real
@@ -91,6 +93,10 @@ pdf_href = f"data:application/pdf;base64,{pdf_base64}"
 
 # A continuacion se muestra codigo para crear dashboard
 app = Dash(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
     html.H1('Dashboard de Resultados', style={'color': 'white', 'textAlign': 'center'}),
@@ -109,7 +115,7 @@ app.layout = html.Div([
     
     # Tabla
     dash_table.DataTable(
-        data=df.drop(columns=['timestamp']).to_dict('records'),
+        data=registros(df.drop(columns=['timestamp'])),
         columns=[{"name": i, "id": i} for i in df.columns if i != 'timestamp'],
         page_size=10,
         style_table={'overflowX': 'auto', 'width': '100%'},
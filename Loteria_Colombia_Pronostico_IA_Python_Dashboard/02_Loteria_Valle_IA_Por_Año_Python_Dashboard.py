@@ -3,7 +3,7 @@
 # Luego filtra un año en especifico y crea un dashboar
 # con IA para el pronostico del siguiente numero y dashboar
 # Con los datos recogidos, primero se instalan librerias
-# pip install pandas dash sklearn
+# pip install pandas dash sklearn orjson brotli flask-compress
 import pandas as pd
 import requests
 from datetime import datetime, timedelta
@@ -11,6 +11,8 @@ from dash import Dash, html, dcc
 from dash import dash_table
 import plotly.express as px
 from sklearn.linear_model import LinearRegression
+from metricas_dashboard import instrumentar
+from serializacion_dashboard import optimizar_respuestas, registros
 
 # Se agregan las variables relacionadas a la api
 BASE_URL = "https://api-resultadosloterias.com/api/results/"
@@ -74,6 +76,10 @@ fig.update_layout(
 
 # El siguiente codigo es sore el dashboard
 app = Dash(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
 
@@ -89,7 +95,7 @@ app.layout = html.Div([
 
     # ---------------- TABLA ----------------
     dash_table.DataTable(
-        data=df.drop(columns=['timestamp']).to_dict('records'),
+        data=registros(df.drop(columns=['timestamp'])),
         columns=[{"name": i, "id": i} for i in df.columns if i != 'timestamp'],
         page_size=10,
         style_table={'overflowX': 'auto'},
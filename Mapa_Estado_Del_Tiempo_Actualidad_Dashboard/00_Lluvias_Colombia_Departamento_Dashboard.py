@@ -1,7 +1,7 @@
 # Ejemplo Dashboard con mapa de Colombia y sus Departamentos
 # Un punto amarillo en la comuna que no llueve y
 # un punto azul en la comuna que llueve
-# pip install dash pandas requests pydeck
+# pip install dash pandas requests pydeck orjson brotli flask-compress
 # pip 25.3.1
 # Python 3.13.1
 
@@ -14,6 +14,8 @@ from datetime import datetime
 import dash
 from dash import html, dash_table
 import pydeck as pdk
+from metricas_dashboard import instrumentar
+from serializacion_dashboard import optimizar_respuestas, registros
 
 # Codigo relacionado a la sesion request de la pagina web
 session = requests.Session()
@@ -160,6 +162,10 @@ df_table = df.drop(columns=["color"], errors="ignore")
 mapa_html = crear_mapa_pydeck(df)
 
 app = dash.Dash(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 fecha_hora_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
 app.layout = html.Div(
@@ -175,7 +181,7 @@ app.layout = html.Div(
 
         html.H3("Tabla de lluvia por departamento"),
         dash_table.DataTable(
-            data=df_table.to_dict("records"),
+            data=registros(df_table),
             columns=[{"name": c, "id": c} for c in df_table.columns],
             style_table={"overflowX": "auto"},
             style_cell={
@@ -1,7 +1,7 @@
 # Ejemplo Dashboard con mapa de cali y sus comunas con 
 # Un punto amarillo en la comuna que no llueve y 
 # un punto azul en la comuna que llueve
-# pip install pandas requests dash
+# pip install pandas requests dash orjson brotli flask-compress
 # pip 25.3.1
 # Python 3.13.1
 
@@ -12,6 +12,8 @@ import dash
 from dash import html, dcc, dash_table
 import dash_leaflet as dl
 from datetime import datetime
+from metricas_dashboard import instrumentar
+from serializacion_dashboard import optimizar_respuestas, registros
 
 # En la siguientes lineas se muestra
 # Diccionario con 22 comunas y coordenadas aproximadas
@@ -97,6 +99,10 @@ markers = [
 
 # Se inicializa el dash
 app = dash.Dash(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 # Obtener fecha y hora actual
 fecha_hora_actual = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -111,7 +117,7 @@ app.layout = html.Div(
         dash_table.DataTable(
             id='tabla-lluvia',
             columns=[{"name": i, "id": i} for i in df.columns],
-            data=df.to_dict('records'),
+            data=registros(df),
             style_table={'overflowX': 'auto'},
             style_header={
                 'backgroundColor': 'black',
@@ -1,7 +1,7 @@
 # En el siguiente codigo se muestra como lograr
 # Obtener varios datos de los dispositivos bluetooth cercanos
 # y como mostrar los datos en una pagina web
-# pip install bleak flask
+# pip install bleak flask orjson brotli flask-compress
 
 
 import asyncio
@@ -9,8 +9,14 @@ import threading
 import time
 from bleak import BleakScanner
 from flask import Flask, jsonify, render_template
+from metricas_dashboard import instrumentar, medir_callback, etapa
+from serializacion_dashboard import optimizar_respuestas
 
 app = Flask(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 devices_cache = []
 
@@ -44,16 +50,19 @@ def scanner_loop():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     while True:
-        loop.run_until_complete(Escaneo_Bluetooth())
+        with etapa("escanear"):
+            loop.run_until_complete(Escaneo_Bluetooth())
         time.sleep(10)
 
 # Controladores de la pagina web del software
 @app.route("/")
+@medir_callback
 def index():
     return render_template("index.html")
 
 
 @app.route("/api/devices")
+@medir_callback
 def api_devices():
     return jsonify(devices_cache)
 
@@ -1,4 +1,4 @@
-# pip install bleak flask
+# pip install bleak flask orjson brotli flask-compress
 # Python 3.13
 
 import asyncio
@@ -7,8 +7,14 @@ import time
 import math
 from bleak import BleakScanner
 from flask import Flask, jsonify, render_template, request
+from metricas_dashboard import instrumentar, medir_callback, etapa
+from serializacion_dashboard import optimizar_respuestas
 
 app = Flask(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 devices_cache = []
 
@@ -78,11 +84,13 @@ def scanner_loop():
     asyncio.set_event_loop(loop)
 
     while True:
-        loop.run_until_complete(Escaneo_Bluetooth())
+        with etapa("escanear"):
+            loop.run_until_complete(Escaneo_Bluetooth())
         time.sleep(10)
 
 # Se crea la pagina con flask
 @app.route("/", methods=["GET", "POST"])
+@medir_callback
 def index():
     if request.method == "POST":
         creator_position["lat"] = float(request.form["lat"])
@@ -90,6 +98,7 @@ def index():
     return render_template("index.html", creator=creator_position)
 
 @app.route("/api/devices")
+@medir_callback
 def api_devices():
     return jsonify(devices_cache)
 
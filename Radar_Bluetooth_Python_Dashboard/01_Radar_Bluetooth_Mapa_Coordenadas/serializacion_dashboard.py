@@ -0,0 +1,212 @@
+# MODULO DE SERIALIZACION Y COMPRESION DE LAS RESPUESTAS DE LOS DASHBOARDS
+# DASH CONVIERTE A JSON EL LAYOUT Y LAS RESPUESTAS DE LOS CALLBACK CON plotly.io.json: SI UN SOLO VALOR NO ES JSON
+# NATIVO (UNA FIGURA, UN Patch, UN COMPONENTE, UN Timestamp) PLOTLY RECORRE TODA LA RESPUESTA EN PYTHON ANTES DE USAR orjson
+# AQUI orjson ESCRIBE TODO EN UNA SOLA PASADA: LOS ARREGLOS DE NUMPY VAN DIRECTO Y SOLO LOS VALORES QUE NO CONOCE
+# PASAN POR convertir()
+# LAS RESPUESTAS SE COMPRIMEN CON brotli O gzip SEGUN LO QUE ACEPTE EL NAVEGADOR (flask-compress)
+# NO DEPENDE DE LOS DATOS DE HOMICIDIOS, SE PUEDE USAR EN CUALQUIER APP DE DASH O DE FLASK CON optimizar_respuestas(app)
+# CADA PROYECTO DEL REPOSITORIO SE EJECUTA Y SE DESPLIEGA SOLO, POR ESO CADA CARPETA CON DASHBOARDS TIENE UNA COPIA
+# IGUAL DE ESTE ARCHIVO; SI SE CAMBIA, SE COPIA OTRA VEZ A TODAS
+# SI UNA VERSION DE DASH YA NO TIENE to_json EN SUS MODULOS INTERNOS NO SE CAMBIA NADA Y DASH SIGUE CON SU CAMINO NORMAL
+
+import os
+import json
+import gzip
+import time
+import decimal
+import importlib
+from contextlib import contextmanager
+import brotli
+import orjson
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
+from plotly.utils import PlotlyJSONEncoder
+
+OPCIONES_JSON = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+ALGORITMOS_COMPRESION = ["br", "gzip"]
+MINIMO_BYTES_COMPRESION = int(os.environ.get("MINIMO_BYTES_COMPRESION", "500"))
+NIVEL_BROTLI = 4
+NIVEL_GZIP = 6
+
+# Los mismos escapes que hace plotly, para que el JSON se pueda incrustar en el html sin cerrar un <script>
+escapes = (
+    (b"<", b"\\u003c"),
+    (b">", b"\\u003e"),
+    (b"/", b"\\u002f"),
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029")
+)
+
+# Modulos internos de Dash que guardan su propia referencia a to_json
+NOMBRES_MODULOS_DASH = ("dash._utils", "dash._callback", "dash.dash")
+
+
+def modulos_con_to_json():
+    modulos = []
+    for nombre in NOMBRES_MODULOS_DASH:
+        try:
+            modulo = importlib.import_module(nombre)
+        except ImportError:
+            continue
+        if callable(getattr(modulo, "to_json", None)):
+            modulos.append(modulo)
+    return modulos
+
+
+# JSON con la libreria estandar y el codificador de plotly, para cuando Dash no expone su to_json
+def json_simple(valor):
+    return json.dumps(valor, cls=PlotlyJSONEncoder)
+
+
+modulos_dash = modulos_con_to_json()
+serializador_plotly = modulos_dash[0].to_json if modulos_dash else json_simple
+
+
+# Arreglos que orjson no escribe solo: fechas, texto, objetos o numeros no contiguos en memoria
+def arreglo_json(valores):
+    if valores.dtype.kind == "M":
+        return valores.astype("datetime64[us]").tolist()
+    if valores.dtype.kind in "biuf" and not valores.flags.c_contiguous:
+        return np.ascontiguousarray(valores)
+    return valores.tolist()
+
+
+# orjson solo llama esta funcion con los valores que no sabe escribir; lo que devuelve lo vuelve a intentar
+def convertir(valor):
+    # Componentes de Dash, figuras de plotly y Patch
+    if hasattr(valor, "to_plotly_json"):
+        return valor.to_plotly_json()
+    if valor is pd.NaT or valor is pd.NA:
+        return None
+    if isinstance(valor, pd.Timestamp):
+        return valor.to_pydatetime()
+    if isinstance(valor, (pd.Series, pd.Index)):
+        valores = np.asarray(valor)
+        if valores.dtype.kind in "biuf":
+            return np.ascontiguousarray(valores)
+        return arreglo_json(valores)
+    if isinstance(valor, np.ndarray):
+        return arreglo_json(valor)
+    if isinstance(valor, np.datetime64):
+        return str(valor)
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, decimal.Decimal):
+        return float(valor)
+    raise TypeError(f"No se puede convertir a JSON: {type(valor).__name__}")
+
+
+def json_rapido(valor):
+    try:
+        datos = orjson.dumps(valor, default=convertir, option=OPCIONES_JSON)
+    except TypeError:
+        # Valores raros (enteros de mas de 64 bits, imagenes) siguen por el camino de plotly
+        return serializador_plotly(valor)
+    for caracter, escape in escapes:
+        if caracter in datos:
+            datos = datos.replace(caracter, escape)
+    return datos.decode("utf-8")
+
+
+# Cambia la funcion con la que Dash convierte a JSON el layout y las respuestas de los callback
+# Devuelve la anterior, o None si esta version de Dash no tiene to_json en sus modulos internos
+def usar_serializador(funcion):
+    if not modulos_dash:
+        return None
+    anterior = modulos_dash[0].to_json
+    for modulo in modulos_dash:
+        modulo.to_json = funcion
+    return anterior
+
+
+# Filas de un DataFrame para el data de una dash_table.DataTable
+# Cada columna se convierte de una vez con numpy y solo al final se arma el diccionario de cada fila,
+# en lugar de to_dict("records") que pasa cada celda por pandas
+def valores_columna(serie):
+    valores = serie.to_numpy()
+    if valores.dtype.kind in "Mbiuf":
+        return arreglo_json(valores)
+    return valores.tolist()
+
+
+def registros(df):
+    columnas = [valores_columna(df.iloc[:, i]) for i in range(df.shape[1])]
+    return [dict(zip(df.columns, fila)) for fila in zip(*columnas)]
+
+
+# Las respuestas JSON de Flask (jsonify) tambien se escriben con orjson
+class ProveedorJsonRapido(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return json_rapido(obj)
+
+
+def comprimir_respuestas(servidor):
+    servidor.config.setdefault("COMPRESS_ALGORITHM", ALGORITMOS_COMPRESION)
+    servidor.config.setdefault("COMPRESS_MIN_SIZE", MINIMO_BYTES_COMPRESION)
+    servidor.config.setdefault("COMPRESS_BR_LEVEL", NIVEL_BROTLI)
+    servidor.config.setdefault("COMPRESS_LEVEL", NIVEL_GZIP)
+    Compress(servidor)
+    return servidor
+
+
+# Se conecta a una app de Dash (o a un Flask sin Dash): JSON con orjson y respuestas comprimidas
+# Va despues de instrumentar(app) para que las metricas midan los bytes que salen comprimidos
+def optimizar_respuestas(app):
+    servidor = getattr(app, "server", app)
+    if usar_serializador(json_rapido) is None and hasattr(app, "server"):
+        print("(-) Esta version de Dash no expone to_json; el layout y los callback se convierten como siempre")
+    servidor.json = ProveedorJsonRapido(servidor)
+    comprimir_respuestas(servidor)
+    return app
+
+
+def milisegundos(funcion, valor, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(valor)
+        tiempos.append(time.perf_counter() - inicio)
+    return resultado, round(float(np.median(tiempos)) * 1000, 3)
+
+
+# Para los benchmark: bytes y milisegundos (mediana) de convertir una respuesta con cada camino
+#   plotly: lo que hace Dash sin este modulo; rapido: json_rapido; gzip y brotli: comprimir el JSON rapido
+def comparar_serializacion(valor, repeticiones=20):
+    texto_plotly, ms_plotly = milisegundos(serializador_plotly, valor, repeticiones)
+    texto_rapido, ms_rapido = milisegundos(json_rapido, valor, repeticiones)
+    datos = texto_rapido.encode("utf-8")
+    gz, ms_gzip = milisegundos(lambda d: gzip.compress(d, compresslevel=NIVEL_GZIP), datos, repeticiones)
+    br, ms_brotli = milisegundos(lambda d: brotli.compress(d, quality=NIVEL_BROTLI), datos, repeticiones)
+    return {
+        "bytes_plotly": len(texto_plotly.encode("utf-8")),
+        "bytes_rapido": len(datos),
+        "bytes_gzip": len(gz),
+        "bytes_brotli": len(br),
+        "ms_plotly": ms_plotly,
+        "ms_rapido": ms_rapido,
+        "ms_gzip": ms_gzip,
+        "ms_brotli": ms_brotli,
+        "bytes_ahorrados": len(texto_plotly.encode("utf-8")) - len(br),
+        "ms_ahorrados": round(ms_plotly - ms_rapido, 3),
+        "mismo_json": orjson.loads(texto_plotly) == orjson.loads(datos)
+    }
+
+
+# Para los benchmark: guarda cada objeto que Dash convierte a JSON mientras dura el bloque
+#   with capturar_respuestas() as respuestas: ...
+@contextmanager
+def capturar_respuestas():
+    respuestas = []
+    anterior = modulos_dash[0].to_json if modulos_dash else serializador_plotly
+
+    def capturar(valor):
+        respuestas.append(valor)
+        return anterior(valor)
+
+    usar_serializador(capturar)
+    try:
+        yield respuestas
+    finally:
+        usar_serializador(anterior)
@@ -13,6 +13,8 @@ from threading import Thread
 import pandas as pd
 import io
 import pdfkit 
+from metricas_dashboard import instrumentar, medir_callback, cronometro, etapa
+from serializacion_dashboard import optimizar_respuestas
 
 # Configuracion de caracteristicas del sonido
 SPEED_OF_SOUND = 343.0
@@ -54,15 +56,20 @@ def medir_distancias():
     global distancias_actuales
     while True:
         for dir in direcciones:
-            emitir_sonido(pulso)
-            grabacion = grabar_echo()
-            distancias_actuales[dir] = calcular_distancia(pulso, grabacion)
+            with etapa("medir_distancia"):
+                emitir_sonido(pulso)
+                grabacion = grabar_echo()
+                distancias_actuales[dir] = calcular_distancia(pulso, grabacion)
         time.sleep(10)
 
 Thread(target=medir_distancias, daemon=True).start()
 
 # CREACION DE DASHBOARD
 app = dash.Dash(__name__)
+# Tiempos por ruta y callback y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 app.layout = html.Div([
     html.H1("Radar acústico de habitación", style={'color':'white', 'textAlign':'center'}),
@@ -96,9 +103,12 @@ app.layout = html.Div([
     Output('reloj', 'children'),
     Input('intervalo-actualizacion', 'n_intervals')
 )
+@medir_callback
 def actualizar_dashboard(n):
+    marcar = cronometro()
     hora_actual = time.strftime("%Y-%m-%d %H:%M:%S")
     tabla = [{"direccion": dir, "distancia": round(distancias_actuales[dir], 2)} for dir in direcciones]
+    marcar("agregar")
 
     norte = distancias_actuales["Norte"]
     sur = -distancias_actuales["Sur"]
@@ -118,6 +128,7 @@ def actualizar_dashboard(n):
         yaxis=dict(scaleanchor="x", scaleratio=1),
         showlegend=True
     )
+    marcar("figuras")
 
     return tabla, fig, hora_actual
 
@@ -128,6 +139,7 @@ def actualizar_dashboard(n):
     State('tabla-distancias', 'data'),
     prevent_initial_call=True
 )
+@medir_callback
 def exportar_pdf(n_clicks, tabla_data):
     # Cambia esta ruta a donde está wkhtmltopdf en tu PC
     wkhtmltopdf_path = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
@@ -152,6 +164,7 @@ def exportar_pdf(n_clicks, tabla_data):
     State('tabla-distancias', 'data'),
     prevent_initial_call=True
 )
+@medir_callback
 def exportar_excel(n_clicks, tabla_data):
     df = pd.DataFrame(tabla_data)
     buffer = io.BytesIO()
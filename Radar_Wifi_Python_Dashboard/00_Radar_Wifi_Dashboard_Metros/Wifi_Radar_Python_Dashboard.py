@@ -3,18 +3,27 @@ from network_scanner import scan_network
 from exporter import export_excel, export_pdf
 from datetime import datetime
 import requests
+from metricas_dashboard import instrumentar, medir_callback, etapa
+from serializacion_dashboard import optimizar_respuestas
 app = Flask(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 known_devices = set()
 
 @app.route("/")
+@medir_callback
 def dashboard():
     return render_template("dashboard.html")
 
 @app.route("/api/devices")
+@medir_callback
 def api_devices():
     global known_devices
-    devices = scan_network()
+    with etapa("escanear"):
+        devices = scan_network()
 
     current = set(d["mac"] for d in devices)
     new = list(current - known_devices)
@@ -26,10 +35,12 @@ def api_devices():
     })
 
 @app.route("/download/excel")
+@medir_callback
 def download_excel():
     return send_file(export_excel(), as_attachment=True)
 
 @app.route("/download/pdf")
+@medir_callback
 def download_pdf():
     return send_file(export_pdf(), as_attachment=True)
 
@@ -0,0 +1,235 @@
+# MODULO DE METRICAS DE LOS DASHBOARDS
+# MIDE CUANTO TARDA CADA RUTA DE FLASK Y CADA CALLBACK DE DASH, POR ETAPAS (filtrar, agregar, ajustar_modelo,
+# figuras, serializar), EL TAMAÑO DE LAS RESPUESTAS Y LOS ACIERTOS DE LAS CACHES
+# TODO SE PUBLICA EN /metrics EN EL FORMATO DE TEXTO DE PROMETHEUS
+# NO DEPENDE DE LOS DATOS DE HOMICIDIOS, SE PUEDE USAR EN CUALQUIER APP DE DASH O DE FLASK CON instrumentar(app)
+# CADA PROYECTO DEL REPOSITORIO SE EJECUTA Y SE DESPLIEGA SOLO, POR ESO CADA CARPETA CON DASHBOARDS TIENE UNA COPIA
+# IGUAL DE ESTE ARCHIVO; SI SE CAMBIA, SE COPIA OTRA VEZ A TODAS
+# CON PERFILAR_CALLBACKS=1 (O UNA LISTA DE NOMBRES SEPARADOS POR COMA) SE GUARDA UN cProfile DE CADA LLAMADA
+
+import os
+import time
+import cProfile
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from flask import Response, g, has_request_context, request
+
+# Limites de las cubetas de los histogramas
+LIMITES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LIMITES_BYTES = (1000, 10000, 100000, 1000000, 10000000)
+
+PERFILAR_CALLBACKS = os.environ.get("PERFILAR_CALLBACKS", "")
+CARPETA_PERFILES = os.path.join(
+    os.environ.get("CARPETA_DATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")), "perfiles"
+)
+
+# Las metricas son de cada proceso; con varios workers cada uno publica las suyas
+histogramas = {}
+contadores = {}
+caches_lru = {}
+candado_metricas = threading.Lock()
+# Solo puede haber un cProfile activo a la vez en el proceso
+candado_perfil = threading.Lock()
+
+ayudas = {
+    "dashboard_peticion_segundos": ("histogram", "Duracion de cada peticion HTTP por ruta y callback"),
+    "dashboard_respuesta_bytes": ("histogram", "Tamaño del cuerpo de la respuesta por ruta y callback"),
+    "dashboard_etapa_segundos": ("histogram", "Duracion de cada etapa dentro de un callback"),
+    "dashboard_cache_consultas_total": ("counter", "Consultas a las caches por resultado (acierto o fallo)"),
+    "dashboard_cache_proporcion_aciertos": ("gauge", "Aciertos sobre el total de consultas de cada cache")
+}
+
+
+def observar(metrica, etiquetas, valor, limites=LIMITES_SEGUNDOS):
+    llave = (metrica, tuple(sorted(etiquetas.items())))
+    with candado_metricas:
+        histograma = histogramas.get(llave)
+        if histograma is None:
+            histograma = histogramas[llave] = {"limites": limites, "cubetas": [0] * len(limites), "suma": 0.0, "cantidad": 0}
+        for i, limite in enumerate(limites):
+            if valor <= limite:
+                histograma["cubetas"][i] += 1
+        histograma["suma"] += valor
+        histograma["cantidad"] += 1
+
+
+def contar(metrica, etiquetas, cantidad=1):
+    llave = (metrica, tuple(sorted(etiquetas.items())))
+    with candado_metricas:
+        contadores[llave] = contadores.get(llave, 0) + cantidad
+
+
+# Nombre del callback que atiende la peticion actual; fuera de una peticion (hilos de calentamiento) es segundo_plano
+def callback_actual():
+    if has_request_context():
+        return g.get("callback_metricas", "")
+    return "segundo_plano"
+
+
+# Uso:  with etapa("filtrar"): ...
+@contextmanager
+def etapa(nombre):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar("dashboard_etapa_segundos", {"callback": callback_actual(), "etapa": nombre}, time.perf_counter() - inicio)
+
+
+# Para medir etapas seguidas sin anidar el codigo:  marcar = cronometro() ... marcar("agregar") ... marcar("figuras")
+# Cada marca guarda el tiempo desde la marca anterior
+def cronometro():
+    ultimo = [time.perf_counter()]
+
+    def marcar(nombre):
+        ahora = time.perf_counter()
+        observar("dashboard_etapa_segundos", {"callback": callback_actual(), "etapa": nombre}, ahora - ultimo[0])
+        ultimo[0] = ahora
+
+    return marcar
+
+
+# Caches que se cuentan a mano (por ejemplo un diccionario de modelos)
+def contar_cache(nombre, acierto):
+    contar("dashboard_cache_consultas_total", {"cache": nombre, "resultado": "acierto" if acierto else "fallo"})
+
+
+# Caches de functools.lru_cache: se leen con cache_info() al publicar las metricas
+def registrar_cache(nombre, funcion):
+    caches_lru[nombre] = funcion
+    return funcion
+
+
+def perfilar(nombre):
+    if not PERFILAR_CALLBACKS:
+        return False
+    return PERFILAR_CALLBACKS in ("1", "todos") or nombre in PERFILAR_CALLBACKS.split(",")
+
+
+def guardar_perfil(perfil, nombre):
+    os.makedirs(CARPETA_PERFILES, exist_ok=True)
+    ruta = os.path.join(CARPETA_PERFILES, f"{nombre}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+    perfil.dump_stats(ruta)
+    print(f"(+) Perfil guardado en {ruta}")
+
+
+# Decorador para los callback; va debajo de @callback (en una app de Flask, debajo de @app.route)
+# Mide el tiempo de la funcion y deja su nombre en la peticion para las etapas y para calcular la serializacion
+def medir_callback(funcion):
+    nombre = f"{funcion.__module__.split('.')[-1]}.{funcion.__name__}"
+
+    @wraps(funcion)
+    def medida(*args, **kwargs):
+        if has_request_context():
+            g.callback_metricas = nombre
+
+        perfil = None
+        if perfilar(nombre) and candado_perfil.acquire(blocking=False):
+            perfil = cProfile.Profile()
+
+        inicio = time.perf_counter()
+        try:
+            if perfil is None:
+                return funcion(*args, **kwargs)
+            return perfil.runcall(funcion, *args, **kwargs)
+        finally:
+            duracion = time.perf_counter() - inicio
+            observar("dashboard_etapa_segundos", {"callback": nombre, "etapa": "callback"}, duracion)
+            if has_request_context():
+                g.duracion_callback = duracion
+            if perfil is not None:
+                candado_perfil.release()
+                guardar_perfil(perfil, nombre)
+
+    return medida
+
+
+def escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def formato_etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{k}="{escapar(v)}"' for k, v in etiquetas) + "}"
+
+
+# Texto en el formato de exposicion de Prometheus (version 0.0.4)
+def texto_prometheus():
+    with candado_metricas:
+        copia_histogramas = {llave: dict(h, cubetas=list(h["cubetas"])) for llave, h in histogramas.items()}
+        copia_contadores = dict(contadores)
+
+    for nombre, funcion in caches_lru.items():
+        info = funcion.cache_info()
+        copia_contadores[("dashboard_cache_consultas_total", (("cache", nombre), ("resultado", "acierto")))] = info.hits
+        copia_contadores[("dashboard_cache_consultas_total", (("cache", nombre), ("resultado", "fallo")))] = info.misses
+
+    consultas = {}
+    for (metrica, etiquetas), valor in copia_contadores.items():
+        if metrica == "dashboard_cache_consultas_total":
+            cache, resultado = dict(etiquetas)["cache"], dict(etiquetas)["resultado"]
+            aciertos, total = consultas.get(cache, (0, 0))
+            consultas[cache] = (aciertos + (valor if resultado == "acierto" else 0), total + valor)
+
+    lineas = []
+    for metrica, (tipo, ayuda) in ayudas.items():
+        lineas.append(f"# HELP {metrica} {ayuda}")
+        lineas.append(f"# TYPE {metrica} {tipo}")
+
+        if tipo == "histogram":
+            for (nombre, etiquetas), h in sorted(copia_histogramas.items()):
+                if nombre != metrica:
+                    continue
+                for limite, cantidad in zip(h["limites"], h["cubetas"]):
+                    lineas.append(f"{metrica}_bucket{formato_etiquetas(etiquetas + (('le', limite),))} {cantidad}")
+                lineas.append(f"{metrica}_bucket{formato_etiquetas(etiquetas + (('le', '+Inf'),))} {h['cantidad']}")
+                lineas.append(f"{metrica}_sum{formato_etiquetas(etiquetas)} {h['suma']}")
+                lineas.append(f"{metrica}_count{formato_etiquetas(etiquetas)} {h['cantidad']}")
+        elif tipo == "counter":
+            for (nombre, etiquetas), valor in sorted(copia_contadores.items()):
+                if nombre == metrica:
+                    lineas.append(f"{metrica}{formato_etiquetas(etiquetas)} {valor}")
+        else:
+            for cache, (aciertos, total) in sorted(consultas.items()):
+                lineas.append(f"{metrica}{formato_etiquetas((('cache', cache),))} {aciertos / total if total else 0}")
+
+    return "\n".join(lineas) + "\n"
+
+
+# Se conectan las metricas al servidor Flask de la app: todas las rutas se miden y se agrega /metrics
+# Sirve con una app de Dash (se usa app.server) o directamente con una app de Flask
+def instrumentar(app):
+    servidor = getattr(app, "server", app)
+
+    @servidor.before_request
+    def iniciar_medicion():
+        g.inicio_metricas = time.perf_counter()
+
+    @servidor.after_request
+    def terminar_medicion(respuesta):
+        if "inicio_metricas" not in g:
+            return respuesta
+        duracion = time.perf_counter() - g.inicio_metricas
+        etiquetas = {
+            "ruta": request.url_rule.rule if request.url_rule else "sin_ruta",
+            "callback": g.get("callback_metricas", "")
+        }
+        observar("dashboard_peticion_segundos", etiquetas, duracion)
+        if respuesta.content_length is not None:
+            observar("dashboard_respuesta_bytes", etiquetas, respuesta.content_length, LIMITES_BYTES)
+        # Lo que queda de la peticion despues del callback es Dash convirtiendo la respuesta a JSON
+        if "duracion_callback" in g:
+            observar(
+                "dashboard_etapa_segundos",
+                {"callback": etiquetas["callback"], "etapa": "serializar"},
+                max(duracion - g.duracion_callback, 0)
+            )
+        return respuesta
+
+    @servidor.route("/metrics")
+    def metricas():
+        return Response(texto_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    return app
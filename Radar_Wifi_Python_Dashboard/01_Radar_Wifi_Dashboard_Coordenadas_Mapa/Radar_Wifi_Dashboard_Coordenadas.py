@@ -1,21 +1,30 @@
 from flask import Flask, jsonify, render_template, request
 from network_scanner import scan_network
+from metricas_dashboard import instrumentar, medir_callback, etapa
+from serializacion_dashboard import optimizar_respuestas
 
 app = Flask(__name__)
+# Tiempos por ruta y tamaños de respuesta en /metrics
+instrumentar(app)
+# Respuestas en JSON con orjson y comprimidas con brotli o gzip
+optimizar_respuestas(app)
 
 NETWORK_RANGE = "192.168.1.0/24"  # Cambia según tu red
 
 @app.route("/")
+@medir_callback
 def index():
     return render_template("index.html")
 
 @app.route("/api/scan", methods=["POST"])
+@medir_callback
 def api_scan():
     data = request.json
     lat = float(data["latitude"])
     lon = float(data["longitude"])
 
-    devices = scan_network(NETWORK_RANGE, lat, lon)
+    with etapa("escanear"):
+        devices = scan_network(NETWORK_RANGE, lat, lon)
 
     return jsonify({
         "base": {"lat": lat, "lon": lon},